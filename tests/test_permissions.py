@@ -0,0 +1,92 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from viewflow import permissions
+
+
+@override_settings(VIEWFLOW={"PERMISSION_CACHE": True})
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="employee")
+        self.group = Group.objects.create(name="staff")
+        self.change_group = Permission.objects.get(codename="change_group")
+        self.change_user = Permission.objects.get(codename="change_user")
+
+    def fresh_user(self):
+        # a new request loads a new user instance
+        return User.objects.get(pk=self.user.pk)
+
+    def test_warm_cache_makes_no_queries(self):
+        self.user.user_permissions.add(self.change_group)
+        self.assertTrue(permissions.has_perm(self.fresh_user(), "auth.change_group"))
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(permissions.has_perm(user, "auth.change_group"))
+            self.assertFalse(permissions.has_perm(user, "auth.change_user"))
+            self.assertEqual(
+                permissions.get_all_permissions(user), {"auth.change_group"}
+            )
+
+    def test_user_permissions_invalidated(self):
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_group"))
+        self.user.user_permissions.add(self.change_group)
+        self.assertTrue(permissions.has_perm(self.fresh_user(), "auth.change_group"))
+        self.change_group.user_set.remove(self.user)
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_group"))
+
+    def test_group_membership_invalidated(self):
+        self.group.permissions.add(self.change_user)
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+        self.group.user_set.add(self.user)
+        self.assertTrue(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+        self.user.groups.clear()
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+
+    def test_group_permissions_invalidated(self):
+        self.user.groups.add(self.group)
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+        self.group.permissions.add(self.change_user)
+        self.assertTrue(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+        self.group.delete()
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+
+    def test_object_permissions_invalidated(self):
+        from guardian.shortcuts import assign_perm, remove_perm
+
+        self.assertFalse(
+            permissions.has_perm(self.fresh_user(), "auth.change_group", self.group)
+        )
+        assign_perm("auth.change_group", self.user, self.group)
+        self.assertTrue(
+            permissions.has_perm(self.fresh_user(), "auth.change_group", self.group)
+        )
+        remove_perm("auth.change_group", self.user, self.group)
+        self.assertFalse(
+            permissions.has_perm(self.fresh_user(), "auth.change_group", self.group)
+        )
+
+    def test_superuser_flag_is_part_of_the_key(self):
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+        User.objects.filter(pk=self.user.pk).update(is_superuser=True)
+        self.assertTrue(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+
+    def test_explicit_invalidation(self):
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+        # bulk changes send no signals
+        User.user_permissions.through.objects.bulk_create(
+            [User.user_permissions.through(user=self.user, permission=self.change_user)]
+        )
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+        permissions.invalidate_permissions(users=[self.user.pk])
+        self.assertTrue(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+
+    @override_settings(VIEWFLOW={"PERMISSION_CACHE": False})
+    def test_disabled(self):
+        self.assertFalse(permissions.has_perm(self.fresh_user(), "auth.change_user"))
+        User.user_permissions.through.objects.create(
+            user=self.user, permission=self.change_user
+        )
+        self.assertTrue(permissions.has_perm(self.fresh_user(), "auth.change_user"))
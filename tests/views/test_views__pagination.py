@@ -0,0 +1,230 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth.models import User
+from django.core.paginator import InvalidPage
+from django.db import connection
+from django.db.models.functions import Lower
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import path
+
+from viewflow.templatetags.viewflow import list_total
+from viewflow.views import EstimatedCountPaginator, KeysetPaginator, ListModelView
+
+
+class Test(TestCase):  # noqa: D101
+    users = User.objects.filter(username__startswith="user")
+
+    @classmethod
+    def setUpTestData(cls):
+        moment = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for n in range(7):
+            User.objects.create(
+                username=f"user{n}",
+                # pairs of users joined at the same moment, with microseconds
+                date_joined=moment + timedelta(days=n // 2, microseconds=1),
+                last_login=moment if n % 3 else None,
+            )
+
+    def walk(self, queryset, per_page=3):
+        paginator = KeysetPaginator(queryset, per_page)
+        pages, page = [], paginator.page()
+        while True:
+            pages.append([user.username for user in page])
+            if not page.has_next():
+                break
+            page = paginator.page(page.next_page_number())
+
+        backwards = []
+        while True:
+            backwards.insert(0, [user.username for user in page])
+            if not page.has_previous():
+                break
+            page = paginator.page(page.previous_page_number())
+        self.assertEqual(pages, backwards)
+        return pages
+
+    def expected(self, queryset, per_page=3):
+        usernames = [user.username for user in queryset]
+        return [
+            usernames[index : index + per_page]
+            for index in range(0, len(usernames), per_page)
+        ]
+
+    def test_ties_broken_by_pk(self):
+        queryset = self.users.order_by("-date_joined")
+        self.assertEqual(
+            self.walk(queryset), self.expected(queryset.order_by("-date_joined", "pk"))
+        )
+
+    def test_nullable_column(self):
+        # NULLs are kept last in both directions
+        for ordering in ["last_login", "-last_login"]:
+            self.assertEqual(
+                self.walk(self.users.order_by(ordering)),
+                [
+                    ["user1", "user2", "user4"],
+                    ["user5", "user0", "user3"],
+                    ["user6"],
+                ],
+            )
+
+    def test_no_count_query(self):
+        paginator = KeysetPaginator(self.users.order_by("username"), 3)
+        with self.assertNumQueries(1):
+            page = paginator.page()
+            self.assertEqual(len(page), 3)
+        self.assertIsNone(paginator.count)
+
+    def test_deep_page_without_offset(self):
+        paginator = KeysetPaginator(self.users.order_by("username"), 3)
+        page = paginator.page(paginator.page().next_page_number())
+        with self.assertNumQueries(1) as queries:
+            paginator.page(page.next_page_number())
+        self.assertNotIn("OFFSET", queries.captured_queries[0]["sql"])
+
+    def test_expression_ordering_falls_back_to_offset(self):
+        paginator = KeysetPaginator(self.users.order_by(Lower("username")), 3)
+        self.assertIsNone(paginator.columns)
+        page = paginator.page(3)
+        self.assertEqual([user.username for user in page], ["user6"])
+        self.assertEqual(paginator.count, 7)
+
+    def test_cursor_of_another_ordering(self):
+        paginator = KeysetPaginator(self.users.order_by("username"), 3)
+        cursor = paginator.page().next_page_number()
+
+        # the list was re-sorted, the stale cursor shows the first page
+        paginator = KeysetPaginator(self.users.order_by("-username"), 3)
+        page = paginator.page(cursor)
+        self.assertEqual([user.username for user in page], ["user6", "user5", "user4"])
+        self.assertFalse(page.has_previous())
+
+    def test_invalid_cursor(self):
+        paginator = KeysetPaginator(self.users.order_by("username"), 3)
+        for cursor in ["2", "not a cursor", "W1sxXSwgZmFsc2Vd"]:
+            with self.assertRaises(InvalidPage):
+                paginator.page(cursor)
+
+
+class TestEstimatedCount(TestCase):  # noqa: D101
+    def setUp(self):
+        for n in range(5):
+            User.objects.create(username=f"user{n}")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute(
+                "UPDATE sqlite_stat1 SET stat = '1234567 1' WHERE tbl = 'auth_user'"
+            )
+
+    def test_estimated_count(self):
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 2)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(paginator.count, 1234567)
+        self.assertNotIn("COUNT", " ".join(query["sql"] for query in queries))
+        self.assertTrue(paginator.count_estimated)
+        self.assertEqual(list_total(paginator), "about 1.2M")
+
+        # the pages after the estimate are reachable
+        paginator.count = 2
+        page = paginator.page(2)
+        self.assertTrue(page.has_next())
+        self.assertEqual(page.end_index(), 4)
+        self.assertFalse(paginator.page(3).has_next())
+
+    def test_exact_count_below_threshold(self):
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 2)
+        paginator.estimate_threshold = 2000000
+        self.assertEqual(paginator.count, User.objects.count())
+        self.assertFalse(paginator.count_estimated)
+        self.assertEqual(list_total(paginator), paginator.count)
+
+    def test_filtered_queryset_counted(self):
+        paginator = EstimatedCountPaginator(
+            User.objects.filter(username__startswith="user").order_by("pk"), 2
+        )
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.count_estimated)
+
+    def test_keyset_total(self):
+        class EstimatedKeysetPaginator(KeysetPaginator):
+            count_total = True
+            offset_paginator_class = EstimatedCountPaginator
+
+        paginator = EstimatedKeysetPaginator(User.objects.order_by("username"), 2)
+        self.assertEqual(list_total(paginator), "about 1.2M")
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class TestView(TestCase):  # noqa: D101
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@admin.com", "admin")
+        self.assertTrue(self.client.login(username="admin", password="admin"))
+        for n in range(3):
+            User.objects.create(username=f"user{n}")
+
+    def test_cursor_links(self):
+        response = self.client.get("/user/")
+        self.assertEqual(response.status_code, 200)
+        page = response.context["page_obj"]
+        self.assertEqual([user.username for user in page], ["AnonymousUser", "admin"])
+        self.assertContains(response, f'data-page="{page.next_page_number()}"')
+
+        response = self.client.get(f"/user/?page={page.next_page_number()}")
+        self.assertEqual(
+            [user.username for user in response.context["page_obj"]],
+            ["user0", "user1"],
+        )
+
+        response = self.client.get("/user/?page=invalid")
+        self.assertEqual(response.status_code, 404)
+
+    def test_offset_fallback_last_page(self):
+        response = self.client.get("/lower/?page=last")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [user.username for user in response.context["page_obj"]], ["user2"]
+        )
+
+    def test_estimated_total(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute(
+                "UPDATE sqlite_stat1 SET stat = '1234567 1' WHERE tbl = 'auth_user'"
+            )
+        response = self.client.get("/estimated/")
+        self.assertContains(response, "1-2 of about 1.2M")
+
+
+urlpatterns = [
+    path(
+        "user/",
+        ListModelView.as_view(
+            model=User,
+            columns=("username",),
+            ordering="username",
+            paginate_by=2,
+            paginator_class=KeysetPaginator,
+        ),
+    ),
+    path(
+        "lower/",
+        ListModelView.as_view(
+            model=User,
+            queryset=User.objects.order_by(Lower("username")),
+            columns=("username",),
+            paginate_by=2,
+            paginator_class=KeysetPaginator,
+        ),
+    ),
+    path(
+        "estimated/",
+        ListModelView.as_view(
+            model=User,
+            columns=("username",),
+            ordering="pk",
+            paginate_by=2,
+            paginator_class=EstimatedCountPaginator,
+        ),
+    ),
+]
@@ -0,0 +1,173 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from guardian.shortcuts import assign_perm
+
+from viewflow import this
+from viewflow.workflow import counters, flow
+from viewflow.workflow.flow.viewset import WorkflowAppViewset, FlowViewset
+
+
+@override_settings(VIEWFLOW={"TASK_COUNTERS": True})
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="employee")
+        assign_perm("viewflow.view_process", self.user)
+        assign_perm("auth.change_user", self.user)
+
+    def start(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            process = CountersFlow.start.run()
+        task = process.task_set.get(flow_task=CountersFlow.task)
+        return CountersFlow.task.activation_class(task)
+
+    def fresh_user(self):
+        return User.objects.get(pk=self.user.pk)
+
+    def counts(self):
+        user = self.fresh_user()
+        return (
+            counters.inbox_count([CountersFlow], user),
+            counters.queue_count([CountersFlow], user),
+        )
+
+    def test_counters_follow_task_changes(self):
+        self.assertEqual(self.counts(), (0, 0))
+
+        activation = self.start()
+        self.assertEqual(self.counts(), (0, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            activation.assign(self.user)
+        self.assertEqual(self.counts(), (1, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            activation.unassign()
+        self.assertEqual(self.counts(), (0, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            activation.assign(self.user)
+            activation.cancel()
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_inbox_counter_is_updated_in_place(self):
+        activation = self.start()
+        self.assertEqual(self.counts(), (0, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            activation.assign(self.user)
+        user = self.fresh_user()
+        counters.inbox_count([CountersFlow], user)
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.inbox_count([CountersFlow], user), 1)
+
+    def test_queue_counter_is_updated_in_place(self):
+        self.start()
+        user = self.fresh_user()
+        self.assertEqual(counters.queue_count([CountersFlow], user), 1)
+
+        activation = self.start()
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.queue_count([CountersFlow], user), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            activation.assign(self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(counters.queue_count([CountersFlow], user), 1)
+
+    def test_object_permission_tasks_recounted(self):
+        def queue_count():
+            return counters.queue_count([ObjectCountersFlow], self.fresh_user())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ObjectCountersFlow.start.run()
+        self.assertEqual(queue_count(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ObjectCountersFlow.start.run()
+        self.assertEqual(queue_count(), 2)
+
+    def test_queue_follows_permissions(self):
+        self.start()
+        self.assertEqual(self.counts(), (0, 1))
+        self.user.user_permissions.clear()
+        assign_perm("viewflow.view_process", self.user)
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_reconcile(self):
+        activation = self.start()
+        with self.captureOnCommitCallbacks(execute=True):
+            activation.assign(self.user)
+        self.assertEqual(self.counts(), (1, 0))
+
+        # not seen by the counters
+        task = activation.task
+        type(task)._default_manager.filter(pk=task.pk).update(owner=None)
+        self.assertEqual(self.counts(), (1, 0))
+
+        call_command("workflow_task_counters", stdout=StringIO())
+        self.assertEqual(self.counts(), (0, 0))
+
+    def test_split_branches_counted(self):
+        def counts():
+            user = self.fresh_user()
+            return (
+                counters.inbox_count([SplitCountersFlow], user),
+                counters.queue_count([SplitCountersFlow], user),
+            )
+
+        # cached before the branches are created
+        self.assertEqual(counts(), (0, 0))
+        with self.captureOnCommitCallbacks(execute=True):
+            SplitCountersFlow.start.run()
+        self.assertEqual(counts(), (2, 1))
+
+    def test_menu_counts(self):
+        self.start()
+        viewset = WorkflowAppViewset(flow_viewsets=[FlowViewset(CountersFlow)])
+        request = RequestFactory().get("/")
+        request.user = self.fresh_user()
+
+        context = viewset.get_context_data(request)
+        self.assertEqual(context["user_inbox_count"](), 0)
+        self.assertEqual(context["user_queue_count"](), 1)
+
+        request.user = self.fresh_user()
+        context = viewset.get_context_data(request)
+        with self.assertNumQueries(0):
+            self.assertEqual(context["user_inbox_count"](), 0)
+            self.assertEqual(context["user_queue_count"](), 1)
+
+
+class CountersFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.task)
+    task = flow.View(lambda request: None).Permission("auth.change_user").Next(this.end)
+    end = flow.End()
+
+
+class ObjectCountersFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.task)
+    task = (
+        flow.View(lambda request: None)
+        .Permission(
+            "auth.change_user",
+            obj=lambda process: User.objects.get(username="employee"),
+        )
+        .Next(this.end)
+    )
+    end = flow.End()
+
+
+class SplitCountersFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+    split = flow.Split().Next(this.first).Next(this.second).Next(this.third)
+    first = flow.View(lambda request: None).Assign(username="employee").Next(this.end)
+    second = flow.View(lambda request: None).Assign(username="employee").Next(this.end)
+    third = (
+        flow.View(lambda request: None).Permission("auth.change_user").Next(this.end)
+    )
+    end = flow.End()
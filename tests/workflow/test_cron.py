@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from django.test import SimpleTestCase
+
+from viewflow.workflow.cron import CronSchedule
+
+
+class Test(SimpleTestCase):  # noqa: D101
+    def test_every_minute(self):
+        self.assertEqual(
+            CronSchedule("* * * * *").next_after(datetime(2026, 1, 1, 10, 15, 30)),
+            datetime(2026, 1, 1, 10, 16),
+        )
+
+    def test_ranges_and_steps(self):
+        schedule = CronSchedule("*/20 9-17 * * *")
+        self.assertEqual(schedule.minutes, [0, 20, 40])
+        self.assertEqual(
+            schedule.next_after(datetime(2026, 1, 1, 17, 40)),
+            datetime(2026, 1, 2, 9, 0),
+        )
+
+    def test_weekdays(self):
+        # 2026-01-02 is a Friday
+        self.assertEqual(
+            CronSchedule("0 9 * * 1-5").next_after(datetime(2026, 1, 2, 9, 0)),
+            datetime(2026, 1, 5, 9, 0),
+        )
+        self.assertEqual(
+            CronSchedule("0 0 * * 7").next_after(datetime(2026, 1, 2)),
+            datetime(2026, 1, 4),
+        )
+
+    def test_day_of_month_or_weekday(self):
+        # the 13th, or any Friday
+        schedule = CronSchedule("0 0 13 * 5")
+        self.assertEqual(
+            schedule.next_after(datetime(2026, 1, 3)), datetime(2026, 1, 9)
+        )
+        self.assertEqual(
+            schedule.next_after(datetime(2026, 1, 10)), datetime(2026, 1, 13)
+        )
+
+    def test_leap_day(self):
+        self.assertEqual(
+            CronSchedule("0 0 29 2 *").next_after(datetime(2026, 1, 1)),
+            datetime(2028, 2, 29),
+        )
+
+    def test_invalid(self):
+        for expression in ["* * * *", "60 * * * *", "0 0 30 2 *", "*/0 * * * *"]:
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    CronSchedule(expression)
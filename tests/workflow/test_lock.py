@@ -114,6 +114,110 @@ class Test(TransactionTestCase):
         with self.assertRaises(DatabaseError):
             test_func()
 
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_select_for_update_lock_waits_for_release(self):
+        lock_impl = lock.SelectForUpdateLock(timeout=5)
+        thread1 = threading.Thread(
+            target=self.run_with_lock_and_release,
+            args=[lock_impl], daemon=True)
+        thread2 = threading.Thread(
+            target=self.run_with_lock_and_release,
+            args=[lock_impl], daemon=True)
+
+        thread1.start()
+        thread2.start()
+        self.join_threads(thread1, thread2)
+
+        try:
+            self.exception_queue.get(True, 1)
+            self.fail('Thread was blocked')
+        except queue.Empty:
+            pass
+
+    @skipUnlessDBFeature('has_select_for_update')
+    def test_select_for_update_lock_wait_is_bounded(self):
+        lock_impl = lock.SelectForUpdateLock(timeout=0.5)
+        thread1 = threading.Thread(
+            target=self.run_with_lock, args=[lock_impl], daemon=True
+        )
+        thread2 = threading.Thread(
+            target=self.run_with_lock, args=[lock_impl], daemon=True
+        )
+
+        thread1.start()
+        thread2.start()
+
+        try:
+            self.exception_queue.get(True, 10)
+        except queue.Empty:
+            self.fail('No thread was blocked')
+        finally:
+            self.finished = True
+
+        self.join_threads(thread1, thread2)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+    def test_advisory_locks(self):
+        lock_impl = lock.AdvisoryLock(timeout=0)
+        thread1 = threading.Thread(
+            target=self.run_with_lock, args=[lock_impl], daemon=True
+        )
+        thread2 = threading.Thread(
+            target=self.run_with_lock, args=[lock_impl], daemon=True
+        )
+
+        thread1.start()
+        thread2.start()
+
+        try:
+            self.exception_queue.get(True, 10)
+        except queue.Empty:
+            self.fail('No thread was blocked')
+        finally:
+            self.finished = True
+
+        self.join_threads(thread1, thread2)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+    def test_advisory_locks_released(self):
+        lock_impl = lock.AdvisoryLock(timeout=5)
+        thread1 = threading.Thread(
+            target=self.run_with_lock_and_release,
+            args=[lock_impl], daemon=True)
+        thread2 = threading.Thread(
+            target=self.run_with_lock_and_release,
+            args=[lock_impl], daemon=True)
+
+        thread1.start()
+        thread2.start()
+        self.join_threads(thread1, thread2)
+
+        try:
+            self.exception_queue.get(True, 1)
+            self.fail('Thread was blocked')
+        except queue.Empty:
+            pass
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'PostgreSQL only')
+    def test_advisory_lock_leaves_process_row_unlocked(self):
+        with lock.AdvisoryLock()(Test.TestFlow, self.process.pk):
+            updated = []
+
+            def update_process():
+                try:
+                    updated.append(
+                        Test.TestFlow.process_class.objects.filter(
+                            pk=self.process.pk
+                        ).update(data={'updated': True})
+                    )
+                finally:
+                    connection.close()
+
+            thread = threading.Thread(target=update_process, daemon=True)
+            thread.start()
+            thread.join(10)
+            self.assertEqual(updated, [1])
+
     def test_cache_lock(self):
         lock_impl = lock.CacheLock(attempts=1)
         thread1 = threading.Thread(
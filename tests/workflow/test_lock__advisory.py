@@ -0,0 +1,33 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+
+
+class Test(TestCase):  # noqa: D101
+    def test_key_is_signed_64_bit(self):
+        key = lock.advisory_lock_key(AdvisoryLockFlow, 1)
+
+        self.assertEqual(key, lock.advisory_lock_key(AdvisoryLockFlow, 1))
+        self.assertNotEqual(key, lock.advisory_lock_key(AdvisoryLockFlow, 2))
+        self.assertTrue(-(2**63) <= key < 2**63)
+
+    def test_requires_postgresql(self):
+        if connection.vendor == "postgresql":
+            self.skipTest("PostgreSQL is supported")
+        with self.assertRaises(ImproperlyConfigured):
+            with lock.advisory_lock(AdvisoryLockFlow, 1):
+                pass
+
+    def test_lock_many(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("PostgreSQL only")
+        with lock.advisory_lock.lock_many(AdvisoryLockFlow, [3, 1, 2]) as pks:
+            self.assertEqual(pks, [1, 2, 3])
+
+
+class AdvisoryLockFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.end)
+    end = flow.End()
@@ -0,0 +1,81 @@
+"""Flow lock implementations under concurrent branch completions.
+
+Run against PostgreSQL with
+``VIEWFLOW_BENCHMARK=1 DATABASE_URL=postgres://... ./manage.py test tests.workflow.test_lock__benchmark``
+"""
+
+import os
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, connections
+from django.test import TransactionTestCase
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+from viewflow.workflow.exceptions import FlowLockFailed
+from viewflow.workflow.status import PROCESS
+
+WIDTH = 50
+WORKERS = 8
+
+
+def _fan_out_flow(name, lock_impl):
+    split = flow.Split()
+    attrs = {
+        "__module__": __name__,
+        "lock_impl": lock_impl,
+        "start": flow.StartHandle().Next(this.split),
+        "split": split,
+        "join": flow.Join().Next(this.end),
+        "end": flow.End(),
+        "handler": lambda self, activation: time.sleep(0.005),
+    }
+    for n in range(WIDTH):
+        split.Next(getattr(this, f"branch_{n}"))
+        attrs[f"branch_{n}"] = flow.Handle(this.handler).Next(this.join)
+    return type(name, (flow.Flow,), attrs)
+
+
+SelectForUpdateFlow = _fan_out_flow(
+    "SelectForUpdateFlow", lock.SelectForUpdateLock(attempts=10)
+)
+AdvisoryFlow = _fan_out_flow("AdvisoryFlow", lock.AdvisoryLock(timeout=30))
+
+
+@unittest.skipUnless(
+    "VIEWFLOW_BENCHMARK" in os.environ and connection.vendor == "postgresql",
+    "Benchmarks are enabled by VIEWFLOW_BENCHMARK env variable, on PostgreSQL",
+)
+class Benchmark(TransactionTestCase):
+    def run_branches(self, flow_class):
+        process = flow_class.start.run()
+        tasks = list(process.task_set.filter(flow_task_type="FUNCTION"))
+        failures = []
+        failures_lock = threading.Lock()
+
+        def complete(task):
+            try:
+                task.flow_task.run(task)
+            except FlowLockFailed:
+                with failures_lock:
+                    failures.append(task.pk)
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            list(executor.map(complete, tasks))
+        elapsed = time.perf_counter() - started
+
+        process.refresh_from_db()
+        return elapsed, len(failures), process.status == PROCESS.DONE
+
+    def test_concurrent_branches(self):
+        print()
+        print(f"{'lock':>18} {'time, s':>8} {'failed':>7} {'done':>5}")
+        for flow_class in [SelectForUpdateFlow, AdvisoryFlow]:
+            elapsed, failed, done = self.run_branches(flow_class)
+            print(f"{flow_class.__name__:>18} {elapsed:>8.3f} {failed:>7} {done!s:>5}")
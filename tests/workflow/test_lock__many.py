@@ -0,0 +1,132 @@
+from django.contrib.auth.models import User
+from django.contrib.messages import get_messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+from viewflow.workflow.flow.views.actions import (
+    BulkAssignTasksActionView,
+    _bulk_task_activations,
+)
+from viewflow.workflow.models import Process, Task
+from viewflow.workflow.status import STATUS
+
+
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        self.processes = [
+            ManyFlow.process_class.objects.create(flow_class=ManyFlow) for _ in range(3)
+        ]
+        self.pks = [process.pk for process in self.processes]
+
+    def tearDown(self):
+        for pk in self.pks:
+            cache.delete(lock.cache_lock._key(ManyFlow, pk))
+
+    def test_no_lock(self):
+        with lock.lock_many_scope(lock.no_lock, ManyFlow, reversed(self.pks)) as pks:
+            self.assertEqual(pks, sorted(self.pks))
+
+    def test_select_for_update_single_query(self):
+        lock_impl = lock.SelectForUpdateLock()
+        with CaptureQueriesContext(connection) as queries:
+            with lock.lock_many_scope(
+                lock_impl, ManyFlow, self.pks + [self.pks[-1] + 100]
+            ) as pks:
+                self.assertEqual(pks, self.pks)
+        self.assertEqual(
+            len([query for query in queries if query["sql"].startswith("SELECT")]),
+            1,
+        )
+
+    def test_cache_lock_skips_taken(self):
+        key = lock.cache_lock._key(ManyFlow, self.pks[1])
+        cache.add(key, "other")
+
+        with lock.lock_many_scope(lock.cache_lock, ManyFlow, self.pks) as pks:
+            self.assertEqual(pks, [self.pks[0], self.pks[2]])
+            # nested scopes reuse the taken locks
+            with ManyFlow.lock(self.pks[0]):
+                pass
+
+        self.assertIsNone(cache.get(lock.cache_lock._key(ManyFlow, self.pks[0])))
+        self.assertEqual(cache.get(key), "other")
+
+    def test_fallback_locks_each(self):
+        lock_impl = lock.OptimisticLock()
+        with lock.lock_many_scope(lock_impl, ManyFlow, self.pks) as pks:
+            self.assertEqual(pks, self.pks)
+
+        self.assertEqual(
+            list(
+                Process.objects.filter(pk__in=self.pks).values_list(
+                    "version", flat=True
+                )
+            ),
+            [1, 1, 1],
+        )
+
+    def test_deferred_callbacks(self):
+        called = []
+        with lock.lock_many_scope(lock.no_lock, ManyFlow, self.pks):
+            lock.after_lock_released(lambda: called.append(True))
+            self.assertEqual(called, [])
+        self.assertEqual(called, [True])
+
+    def test_bulk_task_activations(self):
+        user = User.objects.create(username="admin", is_superuser=True)
+        processes = [CacheFlow.start.run() for _ in range(2)]
+        tasks = Task.objects.filter(flow_task=CacheFlow.task).order_by("pk")
+        busy_key = lock.cache_lock._key(CacheFlow, processes[1].pk)
+        cache.add(busy_key, "other")
+        try:
+            skipped = _bulk_task_activations(
+                tasks, lambda activation: activation.assign(user)
+            )
+        finally:
+            cache.delete(busy_key)
+
+        self.assertEqual(skipped, 1)
+        self.assertEqual([task.status for task in tasks], [STATUS.ASSIGNED, STATUS.NEW])
+
+    def test_bulk_assign_message(self):
+        user = User.objects.create(username="admin", is_superuser=True)
+        processes = [CacheFlow.start.run() for _ in range(3)]
+        tasks = Task.objects.filter(flow_task=CacheFlow.task).order_by("pk")
+        request = RequestFactory().post("/", {"pk": [task.pk for task in tasks]})
+        request.user = user
+        request._messages = CookieStorage(request)
+
+        view = BulkAssignTasksActionView()
+        view.setup(request)
+        busy_key = lock.cache_lock._key(CacheFlow, processes[1].pk)
+        cache.add(busy_key, "other")
+        try:
+            view.form_valid(None)
+        finally:
+            cache.delete(busy_key)
+
+        self.assertEqual(
+            [str(message) for message in get_messages(request)],
+            [
+                "2 task(s) assigned.",
+                "1 task(s) skipped, their processes are busy.",
+            ],
+        )
+
+
+class ManyFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.end)
+    end = flow.End()
+
+
+class CacheFlow(flow.Flow):  # noqa: D101
+    lock_impl = lock.cache_lock
+
+    start = flow.StartHandle().Next(this.task)
+    task = flow.View(lambda request: None).Next(this.end)
+    end = flow.End()
@@ -0,0 +1,127 @@
+from contextlib import contextmanager
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+from viewflow.workflow.exceptions import FlowLockFailed
+from viewflow.workflow.metrics import (
+    CacheExporter,
+    Histogram,
+    histogram_quantile,
+    lock_metrics,
+    merge_snapshots,
+)
+
+exported = []
+
+
+def export(snapshot):
+    exported.append(snapshot)
+
+
+class FailingLock(object):
+    """Fail after three tries."""
+
+    @contextmanager
+    def __call__(self, flow_class, process_pk):
+        for _ in range(3):
+            lock.record_lock_attempt()
+        raise FlowLockFailed("Lock failed for {}".format(flow_class))
+        yield
+
+
+@override_settings(
+    VIEWFLOW={"LOCK_METRICS": True, "LOCK_METRICS_EXPORT_INTERVAL": 3600}
+)
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        lock_metrics.reset()
+
+    def tearDown(self):
+        lock_metrics.reset()
+        CacheExporter().clear()
+
+    def test_node_locks_recorded(self):
+        process = MetricsFlow.start.run()
+        task = process.task_set.get(flow_task=MetricsFlow.task)
+        MetricsFlow.task.run(task)
+
+        stats = lock_metrics.snapshot()[MetricsFlow.instance.flow_label]
+        self.assertEqual(stats["start"]["acquired"], 1)
+        self.assertEqual(stats["task"]["acquired"], 1)
+        self.assertEqual(stats["task"]["failed"], 0)
+        self.assertEqual(stats["task"]["hold"]["count"], 1)
+        self.assertGreaterEqual(stats["task"]["attempts"], 1)
+
+    def test_failure_recorded(self):
+        with self.assertRaises(FlowLockFailed):
+            with lock.lock_scope(FailingLock(), MetricsFlow, 1):
+                pass
+
+        stats = lock_metrics.snapshot()[MetricsFlow.instance.flow_label][""]
+        self.assertEqual(stats["failed"], 1)
+        self.assertEqual(stats["acquired"], 0)
+        self.assertEqual(stats["attempts"], 3)
+        self.assertEqual(stats["hold"]["count"], 0)
+
+    @override_settings(VIEWFLOW={"LOCK_METRICS": False})
+    def test_disabled(self):
+        MetricsFlow.start.run()
+        self.assertEqual(lock_metrics.snapshot(), {})
+
+    @override_settings(
+        VIEWFLOW={
+            "LOCK_METRICS": True,
+            "LOCK_METRICS_EXPORT_INTERVAL": 0,
+            "LOCK_METRICS_EXPORTER": "tests.workflow.test_lock__metrics.export",
+        }
+    )
+    def test_exporter_called(self):
+        exported.clear()
+        MetricsFlow.start.run()
+        self.assertTrue(exported)
+        self.assertIn(MetricsFlow.instance.flow_label, exported[-1])
+
+    def test_command_dumps_exported_metrics(self):
+        MetricsFlow.start.run()
+        lock_metrics.export()
+
+        output = StringIO()
+        call_command("workflow_lock_metrics", stdout=output)
+        self.assertIn(MetricsFlow.instance.flow_label, output.getvalue())
+        self.assertIn("start", output.getvalue())
+
+        call_command("workflow_lock_metrics", "--reset", stdout=StringIO())
+        self.assertIsNone(cache.get(CacheExporter.index_key))
+
+    def test_merge_snapshots(self):
+        with lock.lock_scope(lock.no_lock, MetricsFlow, 1):
+            pass
+        snapshot = lock_metrics.snapshot()
+
+        merged = merge_snapshots([snapshot, snapshot])
+        stats = merged[MetricsFlow.instance.flow_label][""]
+        self.assertEqual(stats["acquired"], 2)
+        self.assertEqual(stats["wait"]["count"], 2)
+        self.assertEqual(sum(stats["hold"]["counts"]), 2)
+        self.assertEqual(snapshot[MetricsFlow.instance.flow_label][""]["acquired"], 1)
+
+    def test_histogram_quantile(self):
+        histogram = Histogram(buckets=(1, 2, 3))
+        for value in [0.5, 0.5, 1.5, 2.5, 10]:
+            histogram.observe(value)
+        snapshot = histogram.snapshot()
+
+        self.assertEqual(histogram_quantile(snapshot, 0.4), 1)
+        self.assertEqual(histogram_quantile(snapshot, 0.6), 2)
+        self.assertEqual(histogram_quantile(snapshot, 1), 10)
+
+
+class MetricsFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.task)
+    task = flow.Handle().Next(this.end)
+    end = flow.End()
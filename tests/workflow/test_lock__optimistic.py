@@ -0,0 +1,157 @@
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+from viewflow.workflow.exceptions import FlowLockConflict, FlowLockFailed
+from viewflow.workflow.models import Process
+from viewflow.workflow.status import PROCESS, STATUS
+
+
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        OptimisticFlow.conflicts = 0
+        OptimisticFlow.calls = []
+
+    def test_version_incremented(self):
+        process = OptimisticFlow.start.run()
+        self.assertEqual(Process.objects.get(pk=process.pk).version, 1)
+
+        task = process.task_set.get(flow_task=OptimisticFlow.task)
+        OptimisticFlow.task.run(task)
+
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+        self.assertEqual(process.version, 2)
+
+    def test_conflict_retried(self):
+        process = OptimisticFlow.start.run()
+        task = process.task_set.get(flow_task=OptimisticFlow.task)
+
+        OptimisticFlow.conflicts = 2
+        OptimisticFlow.task.run(task)
+
+        self.assertEqual(len(OptimisticFlow.calls), 3)
+        process.refresh_from_db()
+        task.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+        self.assertEqual(task.status, STATUS.DONE)
+        # the conflicting updates are rolled back with their attempts
+        self.assertEqual(process.version, 2)
+
+    def test_conflict_drops_deferred_callbacks(self):
+        process = OptimisticFlow.start.run()
+        task = process.task_set.get(flow_task=OptimisticFlow.task)
+        released = []
+
+        def handler(activation):
+            lock.after_lock_released(lambda: released.append(True))
+            OptimisticFlow.handler(OptimisticFlow.instance, activation)
+
+        OptimisticFlow.conflicts = 1
+        with lock.lock_scope(lock.no_lock, OptimisticFlow, process.pk):
+            lock.run_locked(
+                OptimisticFlow,
+                process.pk,
+                lambda: handler(OptimisticFlow.task.activation_class(task)),
+            )
+        self.assertEqual(released, [True])
+
+    def test_retries_exhausted(self):
+        process = OptimisticFlow.start.run()
+        task = process.task_set.get(flow_task=OptimisticFlow.task)
+
+        OptimisticFlow.conflicts = 10
+        with self.assertRaises(FlowLockConflict):
+            OptimisticFlow.task.run(task)
+
+        self.assertEqual(len(OptimisticFlow.calls), 3)
+        task.refresh_from_db()
+        self.assertEqual(task.status, STATUS.NEW)
+
+    def test_nested_scope(self):
+        process = OptimisticFlow.start.run()
+
+        with OptimisticFlow.lock(process.pk):
+            with OptimisticFlow.lock(process.pk):
+                pass
+
+        self.assertEqual(Process.objects.get(pk=process.pk).version, 2)
+
+
+class OptimisticFlow(flow.Flow):  # noqa: D101
+    lock_impl = lock.OptimisticLock(retries=2)
+
+    start = flow.StartHandle().Next(this.task)
+    task = flow.Handle(this.handler).Next(this.end)
+    end = flow.End()
+
+    def handler(self, activation):
+        OptimisticFlow.calls.append(activation.task.pk)
+        if OptimisticFlow.conflicts:
+            OptimisticFlow.conflicts -= 1
+            # an activation of the same process committed in between
+            Process.objects.filter(pk=activation.process.pk).update(
+                version=F("version") + 1
+            )
+
+
+WIDTH = 20
+
+
+def _join_flow():
+    split = flow.Split()
+    attrs = {
+        "__module__": __name__,
+        "lock_impl": lock.OptimisticLock(retries=WIDTH),
+        "start": flow.StartHandle().Next(this.split),
+        "split": split,
+        "join": flow.Join().Next(this.end),
+        "end": flow.End(),
+    }
+    for n in range(WIDTH):
+        split.Next(getattr(this, f"branch_{n}"))
+        attrs[f"branch_{n}"] = flow.Handle().Next(this.join)
+    return type("OptimisticJoinFlow", (flow.Flow,), attrs)
+
+
+OptimisticJoinFlow = _join_flow()
+
+
+@unittest.skipUnless(
+    "DATABASE_URL" in os.environ,
+    "Lock tests requires external db connection specified at DATABASE_URL env variable",
+)
+class StressTest(TransactionTestCase):
+    def test_concurrent_join_arrivals(self):
+        process = OptimisticJoinFlow.start.run()
+        tasks = list(process.task_set.filter(flow_task_type="FUNCTION"))
+        failures = []
+        barrier = threading.Barrier(len(tasks), timeout=10)
+
+        def complete(task):
+            try:
+                barrier.wait()
+                task.flow_task.run(task)
+            except FlowLockFailed as exc:
+                failures.append(exc)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            list(executor.map(complete, tasks))
+
+        self.assertEqual(failures, [])
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+        self.assertEqual(
+            process.task_set.filter(flow_task=OptimisticJoinFlow.join).count(), 1
+        )
+        # the start and one committed scope per branch
+        self.assertEqual(process.version, WIDTH + 1)
@@ -0,0 +1,108 @@
+import threading
+import unittest
+from unittest import mock
+
+import django
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+from viewflow.workflow.checks import check_sqlite_lock_uses_wal
+from viewflow.workflow.exceptions import FlowLockFailed
+from viewflow.workflow.status import PROCESS
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite only")
+class Test(TestCase):  # noqa: D101
+    def test_join_flow(self):
+        process = SQLiteJoinFlow.start.run()
+        for task in process.task_set.filter(flow_task_type="FUNCTION"):
+            task.flow_task.run(task)
+
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+        self.assertEqual(
+            process.task_set.filter(flow_task=SQLiteJoinFlow.join).count(), 1
+        )
+
+    def test_nested_scope_takes_write_lock(self):
+        process = SQLiteJoinFlow.start.run()
+
+        with CaptureQueriesContext(connection) as queries:
+            with SQLiteJoinFlow.lock(process.pk):
+                pass
+
+        self.assertTrue(any(query["sql"].startswith("UPDATE") for query in queries))
+
+    def test_wal_check(self):
+        with mock.patch(
+            "viewflow.workflow.checks._sqlite_journal_mode", return_value="delete"
+        ):
+            warnings = check_sqlite_lock_uses_wal(None, databases=["default"])
+            self.assertEqual([warning.id for warning in warnings], ["viewflow.W002"])
+            self.assertEqual(check_sqlite_lock_uses_wal(None), [])
+
+        with mock.patch(
+            "viewflow.workflow.checks._sqlite_journal_mode", return_value="wal"
+        ):
+            self.assertEqual(
+                check_sqlite_lock_uses_wal(None, databases=["default"]), []
+            )
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite only")
+class TransactionTest(TransactionTestCase):  # noqa: D101
+    @unittest.skipUnless(django.VERSION >= (5, 1), "Django 5.1+ only")
+    def test_begin_immediate(self):
+        process = SQLiteJoinFlow.process_class.objects.create(flow_class=SQLiteJoinFlow)
+        with CaptureQueriesContext(connection) as queries:
+            with SQLiteJoinFlow.lock(process.pk):
+                pass
+
+        self.assertIn("BEGIN IMMEDIATE", [query["sql"] for query in queries])
+        self.assertIsNone(connection.transaction_mode)
+
+    def test_write_lock_without_transaction_mode(self):
+        process = SQLiteJoinFlow.process_class.objects.create(flow_class=SQLiteJoinFlow)
+        # Django before 5.1 always starts a deferred transaction
+        with mock.patch.object(lock, "_has_transaction_mode", return_value=False):
+            with CaptureQueriesContext(connection) as queries:
+                with SQLiteJoinFlow.lock(process.pk):
+                    pass
+
+        statements = [query["sql"] for query in queries]
+        self.assertNotIn("BEGIN IMMEDIATE", statements)
+        self.assertTrue(any(sql.startswith("UPDATE") for sql in statements))
+
+    def test_taken_lock_fails(self):
+        process = SQLiteJoinFlow.process_class.objects.create(flow_class=SQLiteJoinFlow)
+        result = []
+
+        def acquire():
+            try:
+                with lock.SQLiteImmediateLock(timeout=0.1)(SQLiteJoinFlow, process.pk):
+                    result.append(True)
+            except FlowLockFailed:
+                result.append(False)
+            finally:
+                connection.close()
+
+        with SQLiteJoinFlow.lock(process.pk):
+            thread = threading.Thread(target=acquire, daemon=True)
+            thread.start()
+            thread.join(10)
+
+        self.assertEqual(result, [False])
+
+
+class SQLiteJoinFlow(flow.Flow):  # noqa: D101
+    lock_impl = lock.sqlite_immediate_lock
+
+    start = flow.StartHandle().Next(this.split)
+    split = flow.Split().Next(this.a).Next(this.b)
+    a = flow.Handle().Next(this.join)
+    b = flow.Handle().Next(this.join)
+    join = flow.Join().Next(this.end)
+    end = flow.End()
@@ -0,0 +1,88 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.test import SimpleTestCase, override_settings
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+from viewflow.workflow.exceptions import FlowLockFailed
+
+
+class CountingLock(object):
+    """Record the number of threads inside the lock at once."""
+
+    def __init__(self):
+        self.inside = 0
+        self.max_inside = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def __call__(self, flow_class, process_pk):
+        with self._lock:
+            self.calls += 1
+            self.inside += 1
+            self.max_inside = max(self.max_inside, self.inside)
+        try:
+            time.sleep(0.01)
+            yield
+        finally:
+            with self._lock:
+                self.inside -= 1
+
+
+@override_settings(VIEWFLOW={"LOCK_STRIPES": 16, "LOCK_STRIPE_TIMEOUT": 10})
+class Test(SimpleTestCase):  # noqa: D101
+    def run_threads(self, lock_impl, process_pks):
+        failures = []
+
+        def acquire(process_pk):
+            try:
+                with lock.lock_scope(lock_impl, StripedFlow, process_pk):
+                    pass
+            except FlowLockFailed:
+                failures.append(process_pk)
+
+        threads = [
+            threading.Thread(target=acquire, args=[process_pk], daemon=True)
+            for process_pk in process_pks
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        return failures
+
+    def test_same_process_queued_locally(self):
+        lock_impl = CountingLock()
+        self.assertEqual(self.run_threads(lock_impl, [1] * 8), [])
+        self.assertEqual(lock_impl.calls, 8)
+        self.assertEqual(lock_impl.max_inside, 1)
+
+    @override_settings(VIEWFLOW={"LOCK_STRIPES": 0})
+    def test_disabled(self):
+        lock_impl = CountingLock()
+        self.assertEqual(self.run_threads(lock_impl, [1] * 8), [])
+        self.assertGreater(lock_impl.max_inside, 1)
+
+    def test_stripe_wait_is_bounded(self):
+        with override_settings(
+            VIEWFLOW={"LOCK_STRIPES": 16, "LOCK_STRIPE_TIMEOUT": 0.05}
+        ):
+            with lock.lock_scope(CountingLock(), StripedFlow, 1):
+                failures = self.run_threads(CountingLock(), [1])
+        self.assertEqual(failures, [1])
+
+    @override_settings(VIEWFLOW={"LOCK_STRIPES": 1})
+    def test_nested_scopes(self):
+        # every process shares the single stripe, held by the outer scope
+        with lock.lock_scope(CountingLock(), StripedFlow, 1):
+            with lock.lock_scope(CountingLock(), StripedFlow, 2):
+                with lock.lock_scope(CountingLock(), StripedFlow, 1):
+                    pass
+
+
+class StripedFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.end)
+    end = flow.End()
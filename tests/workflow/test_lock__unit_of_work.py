@@ -0,0 +1,135 @@
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+from viewflow.workflow.models import Process, Task
+from viewflow.workflow.status import PROCESS, STATUS
+
+
+def _updates(queries, table):
+    return [
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith('UPDATE "{}"'.format(table))
+    ]
+
+
+class Test(TestCase):  # noqa: D101
+    def test_sync_chain_updates_changed_fields_only(self):
+        with CaptureQueriesContext(connection) as baseline:
+            ChainFlow.start.run()
+        with CaptureQueriesContext(connection) as queries:
+            process = UnitOfWorkFlow.start.run()
+
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+        self.assertEqual(process.data, {"first": True, "second": True})
+        self.assertEqual(
+            set(process.task_set.values_list("status", flat=True)), {STATUS.DONE}
+        )
+
+        # the process data saved by both functions is written once
+        self.assertEqual(len(_updates(baseline, Process._meta.db_table)), 3)
+        self.assertEqual(len(_updates(queries, Process._meta.db_table)), 2)
+        self.assertLess(len(queries), len(baseline))
+
+        task_updates = _updates(queries, Task._meta.db_table)
+        self.assertEqual(len(task_updates), 4)
+        for sql in task_updates:
+            self.assertNotIn('"flow_task"', sql)
+            self.assertNotIn('"token"', sql)
+
+    def test_saves_flushed_once(self):
+        process = UnitOfWorkFlow.start.run()
+
+        with CaptureQueriesContext(connection) as queries:
+            with UnitOfWorkFlow.lock(process.pk):
+                task = Task.objects.get(process=process, flow_task=UnitOfWorkFlow.end)
+                task.data["first"] = 1
+                task.save()
+                task.data["second"] = 2
+                task.save()
+                self.assertEqual(_updates(queries, Task._meta.db_table), [])
+
+        task_updates = _updates(queries, Task._meta.db_table)
+        self.assertEqual(len(task_updates), 1)
+        self.assertIn('SET "data"', task_updates[0])
+
+        task.refresh_from_db()
+        self.assertEqual(task.data, {"first": 1, "second": 2})
+
+    def test_queries_see_pending_saves(self):
+        process = UnitOfWorkFlow.start.run()
+
+        with UnitOfWorkFlow.lock(process.pk):
+            task = Task.objects.get(process=process, flow_task=UnitOfWorkFlow.end)
+            task.status = STATUS.ERROR
+            task.save()
+            self.assertTrue(
+                Task.objects.filter(pk=task.pk, status=STATUS.ERROR).exists()
+            )
+
+    def test_rolled_back_savepoint_is_not_flushed(self):
+        process = UnitOfWorkFlow.start.run()
+
+        with UnitOfWorkFlow.lock(process.pk):
+            task = Task.objects.get(process=process, flow_task=UnitOfWorkFlow.end)
+            task.data["kept"] = True
+            task.save()
+            try:
+                with transaction.atomic(savepoint=True):
+                    task.data["rolled_back"] = True
+                    task.save()
+                    raise ValueError()
+            except ValueError:
+                pass
+
+        task = Task.objects.get(pk=task.pk)
+        self.assertEqual(task.data, {"kept": True})
+
+    def test_activations_share_process(self):
+        process = UnitOfWorkFlow.start.run()
+
+        with UnitOfWorkFlow.lock(process.pk):
+            first, second = [
+                task.flow_task.activation_class(task)
+                for task in Task.objects.filter(process=process)[:2]
+            ]
+            self.assertIs(first.process, second.process)
+
+        first, second = [
+            task.flow_task.activation_class(task)
+            for task in Task.objects.filter(process=process)[:2]
+        ]
+        self.assertIsNot(first.process, second.process)
+
+    def test_disabled_by_default(self):
+        process = UnitOfWorkFlow.start.run()
+
+        with NoUnitOfWorkFlow.lock(process.pk):
+            self.assertIsNone(lock.current_unit_of_work())
+
+
+class UnitOfWorkFlow(flow.Flow):  # noqa: D101
+    unit_of_work = True
+
+    start = flow.StartHandle().Next(this.first)
+    first = flow.Function(this.func).Next(this.check)
+    check = flow.If(lambda activation: True).Then(this.second).Else(this.end)
+    second = flow.Function(this.func).Next(this.end)
+    end = flow.End()
+
+    def func(self, activation):
+        activation.process.data[activation.flow_task.name] = True
+        activation.process.save()
+
+
+class ChainFlow(UnitOfWorkFlow):  # noqa: D101
+    unit_of_work = False
+
+
+class NoUnitOfWorkFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.end)
+    end = flow.End()
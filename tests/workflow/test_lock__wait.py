@@ -0,0 +1,76 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+
+from viewflow import this
+from viewflow.workflow import flow, lock
+from viewflow.workflow.exceptions import FlowLockFailed
+
+
+class Test(TestCase):  # noqa: D101
+    def tearDown(self):
+        cache.delete(
+            "django-viewflow-lock-{}/1".format(WaitLockFlow.instance.flow_label)
+        )
+
+    def _acquire_in_thread(self, lock_impl):
+        result = {}
+
+        def acquire():
+            started = time.monotonic()
+            try:
+                with lock_impl(WaitLockFlow, 1):
+                    result["acquired"] = True
+            except FlowLockFailed:
+                result["acquired"] = False
+            finally:
+                result["waited"] = time.monotonic() - started
+                connection.close()
+
+        thread = threading.Thread(target=acquire, daemon=True)
+        thread.start()
+        return thread, result
+
+    def test_cache_lock_waits_for_release(self):
+        # a poll interval longer than the wait: only the release wakes it up
+        lock_impl = lock.CacheLock(timeout=10, poll_interval=10)
+
+        with lock_impl(WaitLockFlow, 1):
+            thread, result = self._acquire_in_thread(lock_impl)
+            time.sleep(0.2)
+            self.assertEqual(result, {})
+
+        thread.join(10)
+        self.assertTrue(result["acquired"])
+        self.assertLess(result["waited"], 5)
+
+    def test_cache_lock_wait_is_bounded(self):
+        lock_impl = lock.CacheLock(timeout=0.3, poll_interval=0.05)
+
+        with lock_impl(WaitLockFlow, 1):
+            thread, result = self._acquire_in_thread(lock_impl)
+            thread.join(10)
+
+        self.assertFalse(result["acquired"])
+        self.assertGreaterEqual(result["waited"], 0.3)
+        self.assertLess(result["waited"], 5)
+
+    def test_select_for_update_lock_timeout(self):
+        lock_impl = lock.SelectForUpdateLock(timeout=1)
+
+        with lock_impl(WaitLockFlow, 1):
+            self.assertTrue(connection.in_atomic_block)
+
+    def test_database_lock_timeout_unsupported(self):
+        if connection.vendor in ("postgresql", "mysql"):
+            self.skipTest("Lock timeout is supported")
+        with lock.database_lock_timeout("default", 1) as blocking:
+            self.assertFalse(blocking)
+
+
+class WaitLockFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.end)
+    end = flow.End()
@@ -0,0 +1,130 @@
+from django.db import models
+from django.test import TestCase
+
+from viewflow.workflow import flow
+from viewflow.workflow.models import Process, Task
+
+
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        self.processes = [
+            CoerceProcess.objects.create(flow_class=CoerceFlow, comment=str(n))
+            for n in range(3)
+        ] + [
+            Process.objects.create(flow_class=ProxyCoerceFlow),
+            Process.objects.create(flow_class=OtherCoerceFlow),
+        ]
+        self.tasks = [
+            CoerceTask.objects.create(
+                process=process, flow_task=CoerceFlow.start, due=str(n)
+            )
+            for n, process in enumerate(self.processes[:3])
+        ] + [
+            Task.objects.create(
+                process=self.processes[3], flow_task=ProxyCoerceFlow.start
+            ),
+            OtherCoerceTask.objects.create(
+                process=self.processes[4], flow_task=OtherCoerceFlow.start
+            ),
+        ]
+
+    def test_tasks_fetched_per_class(self):
+        queryset = (
+            Task.objects.coerce_for([CoerceFlow, ProxyCoerceFlow, OtherCoerceFlow])
+            .select_related(None)
+            .order_by("pk")
+        )
+        with self.assertNumQueries(3):
+            tasks = list(queryset)
+
+        self.assertEqual(
+            [type(task) for task in tasks],
+            [CoerceTask] * 3 + [ProxyCoerceTask, OtherCoerceTask],
+        )
+        self.assertEqual([task.due for task in tasks[:3]], ["0", "1", "2"])
+        self.assertEqual(tasks, self.tasks)
+
+    def test_base_relations_kept(self):
+        queryset = (
+            Task.objects.coerce_for([CoerceFlow, ProxyCoerceFlow, OtherCoerceFlow])
+            .select_related(None)
+            .select_related("process")
+            .order_by("pk")
+        )
+        with self.assertNumQueries(3):
+            tasks = list(queryset)
+        with self.assertNumQueries(0):
+            # the process loaded with the base task is kept
+            self.assertEqual(
+                [task.process.pk for task in tasks],
+                [process.pk for process in self.processes],
+            )
+
+    def test_processes_fetched_per_class(self):
+        queryset = (
+            Process.objects.coerce_for([CoerceFlow, ProxyCoerceFlow])
+            .select_related(None)
+            .order_by("pk")
+        )
+        with self.assertNumQueries(2):
+            processes = list(queryset)
+
+        self.assertEqual(
+            [type(process) for process in processes],
+            [CoerceProcess] * 3 + [ProxyCoerceProcess],
+        )
+        self.assertEqual(
+            [process.comment for process in processes[:3]], ["0", "1", "2"]
+        )
+
+    def test_missing_subclass_rows(self):
+        Task.objects.filter(pk=self.tasks[0].pk).update(flow_task=OtherCoerceFlow.start)
+        tasks = list(
+            Task.objects.coerce_for([CoerceFlow, OtherCoerceFlow])
+            .select_related(None)
+            .order_by("pk")
+        )
+        self.assertEqual(tasks[0], None)
+        self.assertEqual(tasks[1:], self.tasks[1:3] + self.tasks[4:])
+
+
+class CoerceProcess(Process):
+    comment = models.CharField(max_length=50)
+
+
+class ProxyCoerceProcess(Process):
+    class Meta:
+        proxy = True
+
+
+class CoerceTask(Task):
+    due = models.CharField(max_length=50)
+
+
+class ProxyCoerceTask(Task):
+    class Meta:
+        proxy = True
+
+
+class OtherCoerceTask(Task):
+    pass
+
+
+class CoerceFlow(flow.Flow):
+    process_class = CoerceProcess
+    task_class = CoerceTask
+
+    start = flow.Start(lambda request: None)
+
+
+class ProxyCoerceFlow(flow.Flow):
+    process_class = ProxyCoerceProcess
+    task_class = ProxyCoerceTask
+
+    start = flow.Start(lambda request: None)
+
+
+class OtherCoerceFlow(flow.Flow):
+    task_class = OtherCoerceTask
+
+    start = flow.Start(lambda request: None)
@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from viewflow import this
+from viewflow.workflow import flow
+from viewflow.workflow.models import Process, Task
+from viewflow.workflow.status import STATUS
+
+
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        self.user = User.objects.create(username="employee")
+        self.other_user = User.objects.create(username="other")
+        # permissions are loaded once per user instance
+        self.user.get_all_permissions()
+
+        self.parent = self.create_process()
+        parent_task = self.create_task(self.parent, status=STATUS.STARTED)
+        self.process = self.create_process(parent_task=parent_task)
+        self.sibling = self.create_process(parent_task=parent_task)
+        self.subprocess = self.create_process(
+            parent_task=self.create_task(self.process, status=STATUS.STARTED)
+        )
+
+    def create_process(self, **kwargs):
+        return Process.objects.create(flow_class=NextTaskFlow, **kwargs)
+
+    def create_task(self, process, **kwargs):
+        kwargs.setdefault("flow_task_type", "HUMAN")
+        return Task.objects.create(
+            process=process, flow_task=NextTaskFlow.task, **kwargs
+        )
+
+    def next_user_task(self):
+        with self.assertNumQueries(1):
+            return Task.objects.next_user_task(self.process, self.user)
+
+    def test_no_task(self):
+        self.create_task(self.process, status=STATUS.ASSIGNED, owner=self.other_user)
+        self.assertIsNone(self.next_user_task())
+
+    def test_task_precedence(self):
+        error = self.create_task(self.process, status=STATUS.ERROR)
+        self.assertEqual(self.next_user_task(), error)
+
+        # a celery job, as in viewflow.contrib.celery
+        job = self.create_task(self.process, flow_task_type="JOB")
+        self.assertEqual(self.next_user_task(), job)
+
+        queued = self.create_task(self.process)
+        self.assertEqual(self.next_user_task(), queued)
+
+        assigned = self.create_task(
+            self.process, status=STATUS.ASSIGNED, owner=self.user
+        )
+        self.assertEqual(self.next_user_task(), assigned)
+
+    def test_queue_permission(self):
+        self.create_task(self.process, owner_permission="auth.change_user")
+        self.assertIsNone(self.next_user_task())
+
+        self.user.is_superuser = True
+        self.assertIsNotNone(self.next_user_task())
+
+    def test_process_family_precedence(self):
+        sibling_task = self.create_task(self.sibling, status=STATUS.ERROR)
+        self.assertEqual(self.next_user_task(), sibling_task)
+
+        parent_task = self.create_task(self.parent, status=STATUS.ERROR)
+        self.assertEqual(self.next_user_task(), parent_task)
+
+        subprocess_task = self.create_task(self.subprocess, status=STATUS.ERROR)
+        self.assertEqual(self.next_user_task(), subprocess_task)
+
+        # a failed task of the process wins over an assigned task elsewhere
+        self.create_task(self.subprocess, status=STATUS.ASSIGNED, owner=self.user)
+        task = self.create_task(self.process, status=STATUS.ERROR)
+        self.assertEqual(self.next_user_task(), task)
+
+    def test_get_next_process_task(self):
+        from viewflow.workflow.utils import get_next_process_task
+
+        self.create_task(self.parent, status=STATUS.ASSIGNED, owner=self.user)
+        task = self.create_task(self.process)
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                get_next_process_task(Task.objects, self.process, self.user), task
+            )
+
+
+class NextTaskFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.task)
+    task = flow.View(lambda request: None).Next(this.end)
+    end = flow.End()
@@ -18,7 +18,9 @@ class Test(TestCase):  # noqa: D101
         self.assertEqual(
             str(queryset.query).strip(),
             'SELECT "viewflow_process"."id", "viewflow_process"."flow_class", "viewflow_process"."status",'
-            ' "viewflow_process"."created", "viewflow_process"."finished", "viewflow_process"."data",'
+            ' "viewflow_process"."created", "viewflow_process"."finished",'
+            ' "viewflow_process"."active_tasks", "viewflow_process"."version",'
+            ' "viewflow_process"."data",'
             ' "viewflow_process"."parent_task_id", "viewflow_process"."seed_content_type_id",'
             ' "viewflow_process"."seed_object_id", "viewflow_process"."artifact_content_type_id",'
             ' "viewflow_process"."artifact_object_id" FROM "viewflow_process"'
@@ -36,6 +38,8 @@ class Test(TestCase):  # noqa: D101
             '       "viewflow_process"."status",\n'
             '       "viewflow_process"."created",\n'
             '       "viewflow_process"."finished",\n'
+            '       "viewflow_process"."active_tasks",\n'
+            '       "viewflow_process"."version",\n'
             '       "viewflow_process"."data",\n'
             '       "viewflow_process"."parent_task_id",\n'
             '       "viewflow_process"."seed_content_type_id",\n'
@@ -98,7 +102,9 @@ class Test(TestCase):  # noqa: D101
             'SELECT "viewflow_task"."id", "viewflow_task"."flow_task", "viewflow_task"."flow_task_type",'
             ' "viewflow_task"."status", "viewflow_task"."created", "viewflow_task"."assigned",'
             ' "viewflow_task"."started", "viewflow_task"."finished",'
-            ' "viewflow_task"."scheduled", "viewflow_task"."token",'
+            ' "viewflow_task"."scheduled", "viewflow_task"."locked_until", "viewflow_task"."next_check",'
+            ' "viewflow_task"."token", "viewflow_task"."token_key",'
+            ' "viewflow_task"."pending_branches", "viewflow_task"."signal_name",'
             ' "viewflow_task"."external_task_id", "viewflow_task"."owner_id",'
             ' "viewflow_task"."owner_permission", "viewflow_task"."owner_permission_content_type_id",'
             ' "viewflow_task"."owner_permission_obj_pk", "viewflow_task"."process_id",'
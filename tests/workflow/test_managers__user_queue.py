@@ -0,0 +1,75 @@
+from django.contrib.auth.models import Group, User
+from django.test import TestCase
+from guardian.shortcuts import assign_perm
+
+from viewflow import this
+from viewflow.workflow import flow
+from viewflow.workflow.models import Task
+
+
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        self.user = User.objects.create(username="user")
+        self.target, self.other_target = (
+            User.objects.create(username="target"),
+            User.objects.create(username="other_target"),
+        )
+        process = QueueFlow.start.run()
+        self.task = process.task_set.get(flow_task=QueueFlow.task)
+        self.task.owner_permission = "auth.change_user"
+        self.task.owner_permission_obj = self.target
+        self.task.save()
+
+    def user_queue(self):
+        # a fresh user instance, without cached permissions
+        return Task.objects.user_queue(User.objects.get(pk=self.user.pk))
+
+    def test_no_object_permission(self):
+        assign_perm("auth.change_user", self.user, self.other_target)
+        assign_perm("auth.delete_user", self.user, self.target)
+        self.assertNotIn(self.task, self.user_queue())
+
+    def test_user_object_permission(self):
+        assign_perm("auth.change_user", self.user, self.target)
+        self.assertIn(self.task, self.user_queue())
+
+    def test_group_object_permission(self):
+        group = Group.objects.create(name="managers")
+        self.user.groups.add(group)
+        assign_perm("auth.change_user", group, self.target)
+        self.assertIn(self.task, self.user_queue())
+
+    def test_global_permission(self):
+        assign_perm("auth.change_user", self.user)
+        self.assertIn(self.task, self.user_queue())
+
+    def test_proxy_object_permission(self):
+        # the task keeps the proxy content type, guardian the concrete one
+        self.task.owner_permission_obj = QueueUser.objects.get(pk=self.target.pk)
+        self.task.save()
+        assign_perm("auth.change_user", self.user, self.other_target)
+        self.assertNotIn(self.task, self.user_queue())
+
+        assign_perm("auth.change_user", self.user, self.task.owner_permission_obj)
+        self.assertIn(self.task, self.user_queue())
+
+    def test_object_permissions_filtered_in_sql(self):
+        for n in range(5):
+            target = User.objects.create(username=f"target_{n}")
+            assign_perm("auth.change_user", self.user, target)
+
+        query = str(self.user_queue().query)
+        self.assertEqual(query.count("EXISTS"), 2)
+        # no per-object permission list is sent back to the database
+        self.assertNotIn("auth.change_user_", query)
+
+
+class QueueUser(User):  # noqa: D101
+    class Meta:
+        proxy = True
+
+
+class QueueFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.task)
+    task = flow.View(lambda request: None).Next(this.end)
+    end = flow.End()
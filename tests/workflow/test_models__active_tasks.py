@@ -0,0 +1,156 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, models
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from viewflow import this
+from viewflow.workflow import flow
+from viewflow.workflow.models import AbstractTask, Process
+from viewflow.workflow.status import PROCESS
+
+
+def _active_tasks(process):
+    return Process.objects.values_list("active_tasks", flat=True).get(pk=process.pk)
+
+
+class Test(TestCase):  # noqa: D101
+    def test_counter_follows_tasks(self):
+        process = ActiveTasksFlow.start.run()
+        # first, second
+        self.assertEqual(_active_tasks(process), 2)
+
+        ActiveTasksFlow.first.run(process.task_set.get(flow_task=ActiveTasksFlow.first))
+        # second, join
+        self.assertEqual(_active_tasks(process), 2)
+
+        ActiveTasksFlow.second.run(
+            process.task_set.get(flow_task=ActiveTasksFlow.second)
+        )
+        self.assertEqual(_active_tasks(process), 0)
+
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+
+    def test_counter_follows_cancel(self):
+        process = ApproveFlow.start.run()
+        self.assertEqual(_active_tasks(process), 1)
+
+        ApproveFlow.instance.cancel(process)
+        self.assertEqual(_active_tasks(process), 0)
+
+    def test_end_reads_counter(self):
+        with CaptureQueriesContext(connection) as queries:
+            process = LinearFlow.start.run()
+
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+        self.assertEqual(_active_tasks(process), 0)
+        self.assertFalse(
+            [
+                query
+                for query in queries.captured_queries
+                if query["sql"].startswith("SELECT COUNT(*)")
+            ]
+        )
+
+    def test_counter_written_once_per_lock_scope(self):
+        def counter_updates(queries):
+            return [
+                query["sql"]
+                for query in queries.captured_queries
+                if query["sql"].startswith("UPDATE")
+                and '"active_tasks" = ' in query["sql"]
+            ]
+
+        # the tasks of a synchronous chain are created and finished in one
+        # lock scope, and never counted
+        with CaptureQueriesContext(connection) as queries:
+            LinearFlow.start.run()
+        self.assertEqual(counter_updates(queries), [])
+
+        with CaptureQueriesContext(connection) as queries:
+            process = ActiveTasksFlow.start.run()
+        self.assertEqual(len(counter_updates(queries)), 1)
+        self.assertEqual(_active_tasks(process), 2)
+
+    def test_end_counts_tasks_without_counter(self):
+        process = ActiveTasksFlow.start.run()
+        Process.objects.filter(pk=process.pk).update(active_tasks=None)
+
+        for node in [ActiveTasksFlow.first, ActiveTasksFlow.second]:
+            node.run(process.task_set.get(flow_task=node))
+
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+        self.assertIsNone(process.active_tasks)
+
+    def test_recompute_command(self):
+        process = ActiveTasksFlow.start.run()
+        Process.objects.filter(pk=process.pk).update(active_tasks=None)
+        done = LinearFlow.start.run()
+        Process.objects.filter(pk=done.pk).update(active_tasks=10)
+
+        call_command("workflow_active_tasks", "--missing", stdout=StringIO())
+        self.assertEqual(_active_tasks(process), 2)
+        self.assertEqual(_active_tasks(done), 10)
+
+        call_command("workflow_active_tasks", stdout=StringIO())
+        self.assertEqual(_active_tasks(done), 0)
+
+    def test_recompute_task_models(self):
+        process = ActiveTasksFlow.start.run()
+        other = CustomTaskFlow.start.run()
+        Process.objects.update(active_tasks=None)
+
+        call_command("workflow_active_tasks", stdout=StringIO())
+        self.assertEqual(_active_tasks(process), 2)
+        self.assertEqual(_active_tasks(other), 1)
+
+
+class ActiveTasksFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+
+    split = flow.Split().Next(this.first).Next(this.second)
+
+    first = flow.Handle(this.handler).Next(this.join)
+    second = flow.Handle(this.handler).Next(this.join)
+
+    join = flow.Join().Next(this.end)
+
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
+
+
+class CustomTask(AbstractTask):
+    process = models.ForeignKey(Process, on_delete=models.CASCADE)
+    data = models.JSONField(default=dict, blank=True)
+
+
+class CustomTaskFlow(flow.Flow):  # noqa: D101
+    task_class = CustomTask
+
+    start = flow.StartHandle().Next(this.approve)
+    approve = flow.Handle().Next(this.end)
+    end = flow.End()
+
+
+class LinearFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.first)
+    first = flow.Function(this.func).Next(this.end)
+    end = flow.End()
+
+    def func(self, activation):
+        pass
+
+
+class ApproveFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.approve)
+    approve = flow.Handle(this.handler).Next(this.end)
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
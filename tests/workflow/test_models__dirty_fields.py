@@ -0,0 +1,134 @@
+from unittest import mock
+
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from viewflow import this
+from viewflow.workflow import flow, models
+from viewflow.workflow.models import Process, Task
+from viewflow.workflow.status import STATUS
+from viewflow.workflow.token import Token
+
+
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        self.process = DirtyFieldsFlow.start.run()
+        self.task = Task.objects.get(
+            process=self.process, flow_task=DirtyFieldsFlow.approve
+        )
+
+    def _save(self, instance):
+        with CaptureQueriesContext(connection) as queries:
+            instance.save()
+        return [query["sql"] for query in queries.captured_queries]
+
+    def test_save_changed_fields_only(self):
+        self.task.status = STATUS.ERROR
+
+        self.assertEqual(self.task.get_dirty_fields(), ["status"])
+        [sql] = self._save(self.task)
+        self.assertTrue(sql.startswith('UPDATE "viewflow_task" SET "status" = '))
+        self.assertEqual(self.task.get_dirty_fields(), [])
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, STATUS.ERROR)
+
+    def test_save_unchanged_sends_post_save(self):
+        saved = []
+
+        def receiver(sender, instance, update_fields, **kwargs):
+            saved.append(update_fields)
+
+        post_save.connect(receiver, sender=Task)
+        try:
+            [sql] = self._save(self.task)
+        finally:
+            post_save.disconnect(receiver, sender=Task)
+
+        self.assertTrue(sql.startswith('UPDATE "viewflow_task" SET "flow_task" = '))
+        self.assertEqual(saved, [None])
+
+    def test_nested_data_changed_in_place(self):
+        self.task.data = {"items": []}
+        self._save(self.task)
+        self.task.data["items"].append(1)
+
+        self.assertEqual(self.task.get_dirty_fields(), ["data"])
+
+    def test_data_changed_in_place(self):
+        self.task.data["comment"] = "ok"
+
+        self.assertEqual(self.task.get_dirty_fields(), ["data"])
+        self._save(self.task)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).data, {"comment": "ok"})
+
+    def test_data_serialized_on_first_access(self):
+        with mock.patch.object(models, "_json_state") as json_state:
+            task = Task.objects.get(pk=self.task.pk)
+            task.status = STATUS.ERROR
+            self.assertEqual(task.get_dirty_fields(), ["status"])
+        json_state.assert_not_called()
+
+        task.data["comment"] = "ok"
+        self.assertEqual(task.get_dirty_fields(), ["status", "data"])
+
+    def test_data_assigned_before_access(self):
+        task = Task.objects.get(pk=self.task.pk)
+        task.data = {"comment": "ok"}
+
+        self.assertEqual(task.get_dirty_fields(), ["data"])
+        self._save(task)
+        self.assertEqual(task.get_dirty_fields(), [])
+        task.data["comment"] = "changed"
+        self.assertEqual(task.get_dirty_fields(), ["data"])
+
+        task.refresh_from_db()
+        self.assertEqual(task.get_dirty_fields(), [])
+        self.assertEqual(task.data, {"comment": "ok"})
+
+    def test_token_key_saved_with_token(self):
+        self.task.token = Token("start/1_2")
+
+        self.assertEqual(self.task.get_dirty_fields(), ["token", "token_key"])
+        self._save(self.task)
+        self.assertEqual(Task.objects.get(pk=self.task.pk).token_key, "1112")
+
+    def test_new_instance_saved_in_full(self):
+        task = Task(process=self.process, flow_task=DirtyFieldsFlow.approve)
+        self.assertIsNone(task.get_dirty_fields())
+        task.save()
+
+        task.status = STATUS.ERROR
+        self.assertEqual(task.get_dirty_fields(), ["status"])
+
+    def test_explicit_update_fields(self):
+        self.task.status = STATUS.ERROR
+        self.task.data["comment"] = "ok"
+        self.task.save(update_fields=["data"])
+
+        self.assertEqual(self.task.get_dirty_fields(), ["status"])
+        self.assertEqual(Task.objects.get(pk=self.task.pk).status, STATUS.NEW)
+
+    def test_refresh_from_db_resets_changes(self):
+        Task.objects.filter(pk=self.task.pk).update(status=STATUS.ERROR)
+        self.task.refresh_from_db(fields=["status"])
+
+        self.assertEqual(self.task.get_dirty_fields(), [])
+
+    def test_process_save_changed_fields_only(self):
+        process = Process.objects.get(pk=self.process.pk)
+        process.data = {"approved": True}
+
+        [sql] = self._save(process)
+        self.assertTrue(sql.startswith('UPDATE "viewflow_process" SET "data" = '))
+
+
+class DirtyFieldsFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.approve)
+    approve = flow.Handle(this.handler).Next(this.end)
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
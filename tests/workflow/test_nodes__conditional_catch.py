@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from viewflow import this
+from viewflow.workflow import flow, timers
+from viewflow.workflow.models import Process, Task
+from viewflow.workflow.status import PROCESS, STATUS
+
+
+class Test(TestCase):  # noqa: D101
+    def setUp(self):
+        ConditionFlow.checks = 0
+
+    def _catch_task(self, process, node):
+        return Task.objects.get(process=process, flow_task=node)
+
+    def _set_ready(self, process):
+        Process.objects.filter(pk=process.pk).update(data={"ready": True})
+
+    def test_checked_on_every_sweep(self):
+        process = ConditionFlow.start.run()
+
+        timers.fire_due_conditions(flows=[ConditionFlow])
+        timers.fire_due_conditions(flows=[ConditionFlow])
+        # wait twice, wait_polled once
+        self.assertEqual(ConditionFlow.checks, 3)
+        self.assertIsNone(self._catch_task(process, ConditionFlow.wait).next_check)
+
+    def test_poll_interval(self):
+        process = ConditionFlow.start.run()
+
+        timers.fire_due_conditions(flows=[ConditionFlow])
+        self.assertEqual(ConditionFlow.checks, 2)
+        task = self._catch_task(process, ConditionFlow.wait_polled)
+        self.assertGreater(task.next_check, timezone.now() + timedelta(minutes=9))
+
+        self._set_ready(process)
+        timers.fire_due_conditions(flows=[ConditionFlow])
+        # the polled condition is not due yet
+        self.assertEqual(ConditionFlow.checks, 3)
+        self.assertEqual(
+            self._catch_task(process, ConditionFlow.wait_polled).status, STATUS.NEW
+        )
+
+        Task.objects.filter(pk=task.pk).update(next_check=timezone.now())
+        self.assertEqual(timers.fire_due_conditions(flows=[ConditionFlow]), 1)
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+
+    def test_backoff(self):
+        process = ConditionFlow.start.run()
+        task = self._catch_task(process, ConditionFlow.wait_polled)
+        node = ConditionFlow.wait_polled
+
+        self.assertEqual(node.next_check_interval(task), timedelta(minutes=10))
+        task.created = timezone.now() - timedelta(hours=1)
+        self.assertGreaterEqual(node.next_check_interval(task), timedelta(hours=1))
+        task.created = timezone.now() - timedelta(days=1)
+        self.assertEqual(node.next_check_interval(task), timedelta(hours=6))
+
+    def test_flows_filtered_in_query(self):
+        ConditionFlow.start.run()
+
+        self.assertEqual(timers.fire_due_conditions(flows=[OtherConditionFlow]), 0)
+        self.assertEqual(ConditionFlow.checks, 0)
+
+    def test_next_due_moment(self):
+        process = ConditionFlow.start.run()
+        timers.fire_due_conditions(flows=[ConditionFlow])
+
+        task = self._catch_task(process, ConditionFlow.wait_polled)
+        self.assertEqual(timers.next_due_moment(flows=[]), task.next_check)
+
+    def test_invalid_backoff(self):
+        with self.assertRaises(ValueError):
+            flow.ConditionalCatch(this.is_ready, backoff=2)
+
+
+class ConditionFlow(flow.Flow):  # noqa: D101
+    checks = 0
+
+    start = flow.StartHandle().Next(this.split)
+    split = flow.Split().Next(this.wait).Next(this.wait_polled)
+
+    wait = flow.ConditionalCatch(this.is_ready).Next(this.end)
+    wait_polled = flow.ConditionalCatch(
+        this.is_ready,
+        poll_interval=timedelta(minutes=10),
+        backoff=2,
+        max_poll_interval=timedelta(hours=6),
+    ).Next(this.end)
+
+    end = flow.End()
+
+    def is_ready(self, activation):
+        ConditionFlow.checks += 1
+        return activation.process.data.get("ready", False)
+
+
+class OtherConditionFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.wait)
+    wait = flow.ConditionalCatch(lambda activation: True).Next(this.end)
+    end = flow.End()
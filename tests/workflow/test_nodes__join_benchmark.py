@@ -0,0 +1,83 @@
+"""Scan vs counter Join benchmark.
+
+Run with ``VIEWFLOW_BENCHMARK=1 ./manage.py test tests.workflow.test_nodes__join_benchmark``
+"""
+
+import os
+import time
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+
+from viewflow import this
+from viewflow.workflow import flow
+from viewflow.workflow.status import STATUS
+
+WIDTHS = (10, 100, 1000)
+
+
+def _fan_out_flow(name, width, **join_kwargs):
+    split = flow.Split()
+    attrs = {
+        "__module__": __name__,
+        "start": flow.StartHandle().Next(this.split),
+        "split": split,
+        "join": flow.Join(**join_kwargs).Next(this.end),
+        "end": flow.End(),
+        "handler": lambda self, activation: None,
+    }
+    for n in range(width):
+        split.Next(getattr(this, f"branch_{n}"))
+        attrs[f"branch_{n}"] = flow.Handle(this.handler).Next(this.join)
+    return type(name, (flow.Flow,), attrs)
+
+
+for _width in WIDTHS:
+    globals()[f"ScanJoin{_width}Flow"] = _fan_out_flow(f"ScanJoin{_width}Flow", _width)
+    globals()[f"CounterJoin{_width}Flow"] = _fan_out_flow(
+        f"CounterJoin{_width}Flow", _width, count_arrivals=True
+    )
+
+
+@unittest.skipUnless(
+    "VIEWFLOW_BENCHMARK" in os.environ,
+    "Benchmarks are enabled by VIEWFLOW_BENCHMARK env variable",
+)
+class Benchmark(TestCase):
+    def run_branches(self, flow_class):
+        process = flow_class.start.run()
+        tasks = list(process.task_set.filter(flow_task_type="FUNCTION"))
+
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count_queries):
+            for task in tasks:
+                task.flow_task.run(task)
+        elapsed = time.perf_counter() - started
+
+        join_task = process.task_set.get(flow_task=flow_class.join)
+        self.assertEqual(join_task.status, STATUS.DONE)
+        return elapsed, len(queries)
+
+    def test_join_width(self):
+        print()
+        print(
+            f"{'width':>6} {'scan, s':>10} {'queries':>8} {'counter, s':>11} {'queries':>8}"
+        )
+        for width in WIDTHS:
+            scan_time, scan_queries = self.run_branches(
+                globals()[f"ScanJoin{width}Flow"]
+            )
+            counter_time, counter_queries = self.run_branches(
+                globals()[f"CounterJoin{width}Flow"]
+            )
+            print(
+                f"{width:>6} {scan_time:>10.3f} {scan_queries:>8}"
+                f" {counter_time:>11.3f} {counter_queries:>8}"
+            )
@@ -0,0 +1,203 @@
+from django.test import TestCase
+
+from viewflow import this
+from viewflow.workflow import flow
+from viewflow.workflow.exceptions import FlowRuntimeError
+from viewflow.workflow.status import STATUS
+from viewflow.workflow.token import Token
+
+
+class Test(TestCase):  # noqa: D101
+    def test_join_counts_down_split_branches(self):
+        process = TestCounterWorkflow.start.run()
+        split = process.task_set.get(flow_task=TestCounterWorkflow.split)
+        self.assertEqual(split.pending_branches, 3)
+
+        for n, node in enumerate(
+            [TestCounterWorkflow.a, TestCounterWorkflow.b, TestCounterWorkflow.c], 1
+        ):
+            join_task = process.task_set.filter(flow_task=TestCounterWorkflow.join)
+            self.assertFalse(join_task.filter(status=STATUS.DONE).exists())
+            node.run(process.task_set.get(flow_task=node))
+            split.refresh_from_db()
+            self.assertEqual(split.pending_branches, 3 - n)
+
+        join_task = process.task_set.get(flow_task=TestCounterWorkflow.join)
+        self.assertEqual(join_task.status, STATUS.DONE)
+        self.assertEqual(join_task.previous.count(), 3)
+
+        process.refresh_from_db()
+        self.assertEqual(process.status, STATUS.DONE)
+
+    def test_sync_join_counts_down_split_branches(self):
+        process = TestSyncCounterWorkflow.start.run()
+        process.refresh_from_db()
+        self.assertEqual(process.status, STATUS.DONE)
+
+        split = process.task_set.get(flow_task=TestSyncCounterWorkflow.split)
+        self.assertEqual(split.pending_branches, 0)
+
+    def test_continue_on_condition_with_counter(self):
+        process = TestPartialCounterWorkflow.start.run()
+        a = process.task_set.get(flow_task=TestPartialCounterWorkflow.a)
+        b = process.task_set.get(flow_task=TestPartialCounterWorkflow.b)
+        c = process.task_set.get(flow_task=TestPartialCounterWorkflow.c)
+
+        TestPartialCounterWorkflow.a.run(a)
+        TestPartialCounterWorkflow.b.run(b)
+
+        join_task = process.task_set.get(flow_task=TestPartialCounterWorkflow.join)
+        self.assertEqual(join_task.status, STATUS.DONE)
+
+        c.refresh_from_db()
+        self.assertEqual(c.status, STATUS.CANCELED)
+
+    def test_split_without_counter_falls_back_to_scan(self):
+        process = TestCounterWorkflow.start.run()
+        process.task_set.filter(flow_task=TestCounterWorkflow.split).update(
+            pending_branches=None
+        )
+
+        for node in [TestCounterWorkflow.a, TestCounterWorkflow.b]:
+            node.run(process.task_set.get(flow_task=node))
+        join_task = process.task_set.get(flow_task=TestCounterWorkflow.join)
+        self.assertEqual(join_task.status, STATUS.STARTED)
+
+        TestCounterWorkflow.c.run(process.task_set.get(flow_task=TestCounterWorkflow.c))
+        join_task.refresh_from_db()
+        self.assertEqual(join_task.status, STATUS.DONE)
+
+    def test_direct_split_to_join_edge(self):
+        process = TestDirectCounterWorkflow.start.run()
+        split = process.task_set.get(flow_task=TestDirectCounterWorkflow.split)
+        self.assertEqual(split.pending_branches, 1)
+        join_task = process.task_set.get(flow_task=TestDirectCounterWorkflow.join)
+        self.assertEqual(join_task.status, STATUS.STARTED)
+
+        TestDirectCounterWorkflow.a.run(
+            process.task_set.get(flow_task=TestDirectCounterWorkflow.a)
+        )
+        split.refresh_from_db()
+        self.assertEqual(split.pending_branches, 0)
+        join_task.refresh_from_db()
+        self.assertEqual(join_task.status, STATUS.DONE)
+
+    def test_repeated_split_and_join(self):
+        process = TestRepeatCounterWorkflow.start.run()
+        for _ in range(2):
+            for node in [TestRepeatCounterWorkflow.a, TestRepeatCounterWorkflow.b]:
+                node.run(process.task_set.get(flow_task=node, status=STATUS.NEW))
+
+        joins = process.task_set.filter(flow_task=TestRepeatCounterWorkflow.join)
+        self.assertEqual(
+            [task.status for task in joins.order_by("pk")], [STATUS.DONE] * 2
+        )
+        splits = process.task_set.filter(flow_task=TestRepeatCounterWorkflow.split)
+        self.assertEqual(
+            [task.pending_branches for task in splits.order_by("pk")], [0, 0]
+        )
+        process.refresh_from_db()
+        self.assertEqual(process.status, STATUS.DONE)
+
+    def test_multiple_tokens_came_to_join(self):
+        process = TestCounterWorkflow.start.run()
+        TestCounterWorkflow.a.run(process.task_set.get(flow_task=TestCounterWorkflow.a))
+
+        b = process.task_set.get(flow_task=TestCounterWorkflow.b)
+        b.token = Token("start/999999_1")
+        b.save()
+
+        with self.assertRaisesRegex(FlowRuntimeError, "Multiple tokens"):
+            TestCounterWorkflow.b.run(b)
+
+
+class TestCounterWorkflow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+
+    split = flow.Split().Next(this.a).Next(this.b).Next(this.c)
+
+    a = flow.Handle(this.handler).Next(this.join)
+    b = flow.Handle(this.handler).Next(this.join)
+    c = flow.Handle(this.handler).Next(this.join)
+
+    join = flow.Join(count_arrivals=True).Next(this.end)
+
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
+
+
+class TestSyncCounterWorkflow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+
+    split = flow.Split().Next(this.a).Next(this.b).Next(this.c)
+
+    a = flow.Function(this.func).Next(this.join)
+    b = flow.Function(this.func).Next(this.join)
+    c = flow.Function(this.func).Next(this.join)
+
+    join = flow.Join(count_arrivals=True).Next(this.end)
+
+    end = flow.End()
+
+    def func(self, activation):
+        pass
+
+
+class TestDirectCounterWorkflow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+
+    split = flow.Split().Next(this.a).Next(this.join)
+
+    a = flow.Handle(this.handler).Next(this.join)
+
+    join = flow.Join(count_arrivals=True).Next(this.end)
+
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
+
+
+class TestRepeatCounterWorkflow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+
+    split = flow.Split().Next(this.a).Next(this.b)
+
+    a = flow.Handle(this.handler).Next(this.join)
+    b = flow.Handle(this.handler).Next(this.join)
+
+    join = flow.Join(count_arrivals=True).Next(this.repeat)
+
+    repeat = flow.If(this.is_first_run).Then(this.split).Else(this.end)
+
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
+
+    def is_first_run(self, activation):
+        return activation.process.task_set.filter(flow_task=self.join).count() < 2
+
+
+class TestPartialCounterWorkflow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+
+    split = flow.Split().Next(this.a).Next(this.b).Next(this.c)
+
+    a = flow.Handle(this.handler).Next(this.join)
+    b = flow.Handle(this.handler).Next(this.join)
+    c = flow.Handle(this.handler).Next(this.join)
+
+    join = flow.Join(continue_on_condition=this.two_done, count_arrivals=True).Next(
+        this.end
+    )
+
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
+
+    def two_done(self, activation, active_tasks):
+        return activation.task.previous.filter(status=STATUS.DONE).count() >= 2
@@ -0,0 +1,67 @@
+from django.test import TestCase
+
+from viewflow import this
+from viewflow.workflow import flow
+from viewflow.workflow.models import Task
+from viewflow.workflow.status import STATUS
+
+
+class Test(TestCase):  # noqa: D101
+    def test_token_key_saved(self):
+        process = NestedSplitFlow.start.run()
+        for task in process.task_set.all():
+            self.assertEqual(task.token_key, task.token.key)
+
+    def test_outer_join_waits_for_nested_branches(self):
+        process = NestedSplitFlow.start.run()
+        NestedSplitFlow.first.run(process.task_set.get(flow_task=NestedSplitFlow.first))
+
+        join_task = process.task_set.get(flow_task=NestedSplitFlow.join)
+        self.assertEqual(join_task.status, STATUS.STARTED)
+
+        NestedSplitFlow.inner_first.run(
+            process.task_set.get(flow_task=NestedSplitFlow.inner_first)
+        )
+        join_task.refresh_from_db()
+        self.assertEqual(join_task.status, STATUS.STARTED)
+
+        NestedSplitFlow.inner_second.run(
+            process.task_set.get(flow_task=NestedSplitFlow.inner_second)
+        )
+        join_task.refresh_from_db()
+        self.assertEqual(join_task.status, STATUS.DONE)
+
+        process.refresh_from_db()
+        self.assertEqual(process.status, STATUS.DONE)
+
+    def test_tasks_without_token_key_are_found(self):
+        process = NestedSplitFlow.start.run()
+        Task.objects.filter(process=process).update(token_key=None)
+
+        NestedSplitFlow.first.run(process.task_set.get(flow_task=NestedSplitFlow.first))
+        NestedSplitFlow.inner_first.run(
+            process.task_set.get(flow_task=NestedSplitFlow.inner_first)
+        )
+
+        join_task = process.task_set.get(flow_task=NestedSplitFlow.join)
+        self.assertEqual(join_task.status, STATUS.STARTED)
+
+
+class NestedSplitFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+
+    split = flow.Split().Next(this.first).Next(this.inner_split)
+
+    first = flow.Handle(this.handler).Next(this.join)
+
+    inner_split = flow.Split().Next(this.inner_first).Next(this.inner_second)
+    inner_first = flow.Handle(this.handler).Next(this.inner_join)
+    inner_second = flow.Handle(this.handler).Next(this.inner_join)
+    inner_join = flow.Join().Next(this.join)
+
+    join = flow.Join().Next(this.end)
+
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
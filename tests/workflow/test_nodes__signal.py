@@ -0,0 +1,140 @@
+from django.db import models
+from django.test import TestCase
+
+from viewflow import this
+from viewflow.workflow import flow
+from viewflow.workflow.models import AbstractTask, Process, Task
+from viewflow.workflow.nodes import broadcast_signal, events
+from viewflow.workflow.status import PROCESS, STATUS
+
+
+class RecordingExecutor:
+    """Run the mapped batch in place, recording the per process groups."""
+
+    def __init__(self):
+        self.groups = []
+
+    def map(self, fn, *iterables):
+        groups = list(zip(*iterables))
+        self.groups.extend(groups)
+        return (events._deliver_signal(*group) for group in groups)
+
+
+class Test(TestCase):  # noqa: D101
+    def test_catch_task_subscribed(self):
+        process = CatchFlow.start.run()
+
+        task = Task.objects.get(process=process, flow_task=CatchFlow.wait)
+        self.assertEqual(task.signal_name, "shipped")
+        self.assertEqual(task.status, STATUS.NEW)
+
+    def test_throw_delivers_to_other_flows(self):
+        processes = [CatchFlow.start.run() for _ in range(3)]
+        other = OtherCatchFlow.start.run()
+
+        ThrowFlow.start.run()
+
+        for process in processes:
+            process.refresh_from_db()
+            self.assertEqual(process.status, PROCESS.DONE)
+        self.assertEqual(
+            Task.objects.get(process=other, flow_task=OtherCatchFlow.wait).status,
+            STATUS.NEW,
+        )
+
+    def test_broadcast_single_query(self):
+        CatchFlow.start.run()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                broadcast_signal("delivered", flows=[CatchFlow, OtherCatchFlow]), 0
+            )
+        with self.assertNumQueries(0):
+            # none of the flows catches the signal
+            self.assertEqual(broadcast_signal("unknown", flows=[CatchFlow]), 0)
+        with self.assertNumQueries(len(events._task_tables())):
+            # one query per task table, no flow discovery
+            self.assertEqual(broadcast_signal("unknown"), 0)
+        self.assertIn(CatchTask, events._task_tables())
+        self.assertNotIn(ChildCatchTask, events._task_tables())
+
+    def test_broadcast_custom_task_model(self):
+        process = CustomTaskCatchFlow.start.run()
+        task = CatchTask.objects.get(
+            process=process, flow_task=CustomTaskCatchFlow.wait
+        )
+        self.assertEqual(task.signal_name, "shipped")
+
+        self.assertEqual(broadcast_signal("shipped"), 1)
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+
+    def test_broadcast_task_subclass(self):
+        process = ChildTaskCatchFlow.start.run()
+        self.assertEqual(broadcast_signal("shipped"), 1)
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+        self.assertTrue(ChildCatchTask.objects.filter(process=process).exists())
+
+    def test_broadcast_flows(self):
+        process = CatchFlow.start.run()
+
+        self.assertEqual(broadcast_signal("shipped", flows=[OtherCatchFlow]), 0)
+        self.assertEqual(broadcast_signal("shipped", flows=[CatchFlow]), 1)
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+
+    def test_broadcast_batches(self):
+        processes = [CatchFlow.start.run() for _ in range(3)]
+        executor = RecordingExecutor()
+
+        self.assertEqual(
+            broadcast_signal("shipped", batch_size=2, executor=executor), 3
+        )
+        self.assertEqual(len(executor.groups), 3)
+        for process in processes:
+            process.refresh_from_db()
+            self.assertEqual(process.status, PROCESS.DONE)
+
+
+class CatchFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.wait)
+    wait = flow.SignalCatch("shipped").Next(this.end)
+    end = flow.End()
+
+
+class CatchTask(AbstractTask):
+    process = models.ForeignKey(Process, on_delete=models.CASCADE)
+    data = models.JSONField(default=dict, blank=True)
+
+
+class CustomTaskCatchFlow(flow.Flow):  # noqa: D101
+    task_class = CatchTask
+
+    start = flow.StartHandle().Next(this.wait)
+    wait = flow.SignalCatch("shipped").Next(this.end)
+    end = flow.End()
+
+
+class ChildCatchTask(Task):
+    pass
+
+
+class ChildTaskCatchFlow(flow.Flow):  # noqa: D101
+    task_class = ChildCatchTask
+
+    start = flow.StartHandle().Next(this.wait)
+    wait = flow.SignalCatch("shipped").Next(this.end)
+    end = flow.End()
+
+
+class OtherCatchFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.wait)
+    wait = flow.SignalCatch("delivered").Next(this.end)
+    end = flow.End()
+
+
+class ThrowFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.fire)
+    fire = flow.SignalThrow("shipped").Next(this.end)
+    end = flow.End()
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from viewflow import this
+from viewflow.workflow import flow
+from viewflow.workflow.models import Task
+from viewflow.workflow.status import STATUS
+
+
+class Test(TestCase):  # noqa: D101
+    def test_split_branches_created_in_batch(self):
+        task_table = Task._meta.db_table
+        with CaptureQueriesContext(connection) as queries:
+            process = TestWorkflow.start.run()
+
+        split_task = process.task_set.get(flow_task=TestWorkflow.split)
+        branches = process.task_set.filter(
+            flow_task__in=[
+                TestWorkflow.first,
+                TestWorkflow.second,
+                TestWorkflow.third,
+                TestWorkflow.approve,
+            ]
+        )
+        self.assertEqual(branches.count(), 4)
+        for task in branches:
+            self.assertEqual(list(task.previous.all()), [split_task])
+            self.assertTrue(task.token.is_split_token())
+            self.assertTrue(task.flow_task_type)
+        self.assertEqual(
+            len(set(task.token.token for task in branches)), 4, "tokens are unique"
+        )
+
+        if connection.features.can_return_rows_from_bulk_insert:
+            task_inserts = [
+                query
+                for query in queries.captured_queries
+                if query["sql"].startswith(f'INSERT INTO "{task_table}"')
+            ]
+            # start, split, all branches at once, boundary timer
+            self.assertEqual(len(task_inserts), 4)
+
+    def test_split_bulk_create_keeps_create_hooks(self):
+        process = TestWorkflow.start.run()
+
+        approve = process.task_set.get(flow_task=TestWorkflow.approve)
+        self.assertEqual(approve.status, STATUS.NEW)
+        self.assertEqual(approve.data, {"_on_create": True})
+
+        boundary = process.task_set.get(flow_task=TestWorkflow.approve__timeout)
+        self.assertEqual(boundary.status, STATUS.SCHEDULED)
+        self.assertEqual(list(boundary.previous.all()), [approve])
+
+    def test_split_bulk_created_branches_join(self):
+        process = TestWorkflow.start.run()
+        for node in [TestWorkflow.first, TestWorkflow.second, TestWorkflow.third]:
+            node.run(process.task_set.get(flow_task=node))
+
+        join_task = process.task_set.get(flow_task=TestWorkflow.join)
+        self.assertEqual(join_task.status, STATUS.STARTED)
+        self.assertEqual(join_task.previous.count(), 3)
+
+
+class TestWorkflow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.split)
+
+    split = (
+        flow.Split()
+        .Next(this.first)
+        .Next(this.second)
+        .Next(this.third)
+        .Next(this.approve)
+    )
+
+    first = flow.Handle(this.handler).Next(this.join)
+    second = flow.Handle(this.handler).Next(this.join)
+    third = flow.Handle(this.handler).Next(this.join)
+
+    approve = (
+        flow.View(lambda request: None)
+        .onCreate(this.on_approve_created)
+        .OnTimeout(timedelta(days=1), this.end)
+        .Next(this.join)
+    )
+
+    join = flow.Join().Next(this.end)
+
+    end = flow.End()
+
+    def handler(self, activation):
+        pass
+
+    def on_approve_created(self, activation):
+        activation.task.data["_on_create"] = True
+        activation.task.save()
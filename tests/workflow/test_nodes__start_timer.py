@@ -0,0 +1,92 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from viewflow import this
+from viewflow.workflow import flow, timers
+from viewflow.workflow.models import Process, StartTimerSchedule
+
+
+class Test(TestCase):  # noqa: D101
+    def test_register(self):
+        self.assertEqual(timers.register_start_timers([StartTimerFlow]), 1)
+        self.assertEqual(timers.register_start_timers([StartTimerFlow]), 0)
+
+        schedule = StartTimerSchedule.objects.get()
+        self.assertIs(schedule.flow_task, StartTimerFlow.start)
+        self.assertLessEqual(schedule.next_run, timezone.now())
+
+    def test_register_after_last_run(self):
+        StartTimerFlow.start.run()
+        timers.register_start_timers([StartTimerFlow])
+
+        schedule = StartTimerSchedule.objects.get()
+        self.assertEqual(
+            schedule.next_run, StartTimerFlow.start.last_run() + timedelta(hours=1)
+        )
+
+    def test_register_cron(self):
+        timers.register_start_timers([CronFlow])
+
+        next_run = StartTimerSchedule.objects.get().next_run
+        self.assertGreater(next_run, timezone.now())
+        self.assertEqual(timezone.localtime(next_run).minute, 30)
+
+    def test_fire_once(self):
+        self.assertEqual(timers.fire_due_start_timers(flows=[StartTimerFlow]), 1)
+        self.assertEqual(timers.fire_due_start_timers(flows=[StartTimerFlow]), 0)
+        self.assertEqual(Process.objects.filter(flow_class=StartTimerFlow).count(), 1)
+
+        schedule = StartTimerSchedule.objects.get()
+        self.assertIsNone(schedule.locked_until)
+        self.assertEqual(schedule.next_run, schedule.last_run + timedelta(hours=1))
+
+    def test_claimed_schedule_is_not_claimed_again(self):
+        timers.register_start_timers([StartTimerFlow])
+
+        [schedule_pk] = timers.claim_due_start_timers([StartTimerFlow])
+        self.assertEqual(timers.claim_due_start_timers([StartTimerFlow]), [])
+        self.assertEqual(timers.fire_due_start_timers(flows=[StartTimerFlow]), 0)
+
+        StartTimerSchedule.objects.filter(pk=schedule_pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(timers.claim_due_start_timers([StartTimerFlow]), [schedule_pk])
+
+    def test_failed_start_stays_claimed(self):
+        timers.register_start_timers([StartTimerFlow])
+
+        with mock.patch.object(
+            StartTimerFlow.start, "run", side_effect=ValueError
+        ), self.assertLogs("viewflow.workflow.timers", "ERROR"):
+            self.assertEqual(timers.fire_due_start_timers(flows=[StartTimerFlow]), 0)
+
+        schedule = StartTimerSchedule.objects.get()
+        self.assertIsNone(schedule.last_run)
+        self.assertGreater(schedule.locked_until, timezone.now())
+
+    def test_sweep_single_query(self):
+        timers.register_start_timers([StartTimerFlow, CronFlow])
+        StartTimerSchedule.objects.update(next_run=timezone.now() + timedelta(hours=1))
+
+        with mock.patch.object(timers, "_start_timers_registered", True):
+            with self.assertNumQueries(1):
+                self.assertEqual(timers.fire_due_start_timers(), 0)
+
+    def test_interval_or_cron_required(self):
+        with self.assertRaises(ValueError):
+            flow.StartTimer()
+        with self.assertRaises(ValueError):
+            flow.StartTimer(interval=timedelta(hours=1), cron="* * * * *")
+
+
+class StartTimerFlow(flow.Flow):  # noqa: D101
+    start = flow.StartTimer(interval=timedelta(hours=1)).Next(this.end)
+    end = flow.End()
+
+
+class CronFlow(flow.Flow):  # noqa: D101
+    start = flow.StartTimer(cron="30 * * * *").Next(this.end)
+    end = flow.End()
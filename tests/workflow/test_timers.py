@@ -0,0 +1,225 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+
+from viewflow import this
+from viewflow.workflow import flow, timers
+from viewflow.workflow.exceptions import FlowLockFailed
+from viewflow.workflow.models import StartTimerSchedule, Task
+from viewflow.workflow.status import PROCESS, STATUS
+
+
+class Test(TestCase):  # noqa: D101
+    def _timer_task(self, process):
+        return Task.objects.get(process=process, flow_task=TimerFlow.wait)
+
+    def test_fire_due_timers(self):
+        processes = [TimerFlow.start.run() for _ in range(3)]
+
+        self.assertEqual(timers.fire_due_timers(batch_size=2), 3)
+
+        for process in processes:
+            process.refresh_from_db()
+            self.assertEqual(process.status, PROCESS.DONE)
+            self.assertEqual(self._timer_task(process).status, STATUS.DONE)
+
+    def test_claimed_timer_is_not_claimed_again(self):
+        process = TimerFlow.start.run()
+        task = self._timer_task(process)
+
+        self.assertEqual(timers.claim_due_timers(), [task.pk])
+        task = self._timer_task(process)
+        self.assertEqual(task.status, STATUS.SCHEDULED)
+        self.assertIsNotNone(task.locked_until)
+        self.assertEqual(timers.claim_due_timers(), [])
+
+        self.assertTrue(timers.fire_claimed_timer(task.pk))
+        process.refresh_from_db()
+        self.assertEqual(process.status, PROCESS.DONE)
+
+    def test_stale_claim_is_claimed_again(self):
+        process = TimerFlow.start.run()
+        task = self._timer_task(process)
+        timers.claim_due_timers()
+
+        Task.objects.filter(pk=task.pk).update(
+            locked_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(timers.claim_due_timers(), [task.pk])
+
+    def test_future_timer_is_not_claimed(self):
+        process = TimerFlow.start.run()
+        Task.objects.filter(pk=self._timer_task(process).pk).update(
+            scheduled=timezone.now() + timedelta(hours=1)
+        )
+
+        self.assertEqual(timers.claim_due_timers(), [])
+        self.assertEqual(timers.fire_due_timers(), 0)
+
+    def test_claim_given_back_on_lock_failure(self):
+        process = TimerFlow.start.run()
+        [task_pk] = timers.claim_due_timers()
+
+        with mock.patch.object(Task, "activation", side_effect=FlowLockFailed):
+            self.assertFalse(timers.fire_claimed_timer(task_pk))
+
+        task = self._timer_task(process)
+        self.assertEqual(task.status, STATUS.SCHEDULED)
+        self.assertIsNone(task.locked_until)
+        self.assertEqual(timers.claim_due_timers(), [task_pk])
+
+    def test_claimed_timer_can_be_canceled(self):
+        process = TimerFlow.start.run()
+        [task_pk] = timers.claim_due_timers()
+
+        activation = TimerFlow.wait.activation_class(self._timer_task(process))
+        self.assertTrue(activation.cancel.can_proceed())
+        activation.cancel()
+        self.assertFalse(timers.fire_claimed_timer(task_pk))
+
+    def test_claimed_boundary_disarmed_by_finished_host(self):
+        process = BoundaryTimerFlow.start.run()
+        [task_pk] = timers.claim_due_timers()
+
+        # the host task is completed after the claim, before the timer fires
+        task = process.task_set.get(flow_task=BoundaryTimerFlow.approve)
+        activation = BoundaryTimerFlow.approve.activation_class(task)
+        activation.assign(User.objects.create(username="employee"))
+        activation.start(None)
+        activation.execute()
+
+        self.assertFalse(timers.fire_claimed_timer(task_pk))
+        boundary = Task.objects.get(pk=task_pk)
+        self.assertEqual(boundary.status, STATUS.CANCELED)
+        self.assertFalse(
+            process.task_set.filter(flow_task=BoundaryTimerFlow.timed_out).exists()
+        )
+
+    def test_locked_timer_is_not_retried_in_same_run(self):
+        process = TimerFlow.start.run()
+
+        with mock.patch.object(Task, "activation", side_effect=FlowLockFailed):
+            self.assertEqual(timers.fire_due_timers(batch_size=1), 0)
+
+        self.assertEqual(self._timer_task(process).status, STATUS.SCHEDULED)
+
+    def test_next_due_moment(self):
+        self.assertIsNone(timers.next_due_moment(flows=[]))
+
+        process = TimerFlow.start.run()
+        scheduled = timezone.now() + timedelta(hours=1)
+        Task.objects.filter(pk=self._timer_task(process).pk).update(scheduled=scheduled)
+        self.assertEqual(timers.next_due_moment(flows=[]), scheduled)
+
+    def test_next_due_moment_of_start_timer(self):
+        timers.register_start_timers([StartTimerFlow])
+        self.assertLessEqual(
+            timers.next_due_moment(flows=[StartTimerFlow]), timezone.now()
+        )
+
+        timers.fire_due_start_timers(flows=[StartTimerFlow])
+        schedule = StartTimerSchedule.objects.get()
+        self.assertEqual(schedule.next_run, schedule.last_run + timedelta(hours=1))
+        self.assertEqual(
+            timers.next_due_moment(flows=[StartTimerFlow]), schedule.next_run
+        )
+
+    def test_scheduled_timer_notifies(self):
+        seen = cache.get(timers.WAKEUP_CACHE_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            TimerFlow.start.run()
+        self.assertNotEqual(cache.get(timers.WAKEUP_CACHE_KEY), seen)
+
+    def test_notification_wakes_dispatcher(self):
+        def notify():
+            time.sleep(0.1)
+            timers.notify_timers_changed()
+
+        thread = threading.Thread(target=notify)
+        started = time.monotonic()
+        thread.start()
+        self.assertTrue(timers.wait_timers_changed(10, cache_poll_interval=0.01))
+        thread.join()
+        self.assertLess(time.monotonic() - started, 5)
+
+        self.assertFalse(timers.wait_timers_changed(0.05, cache_poll_interval=0.01))
+
+    def test_run_timers_loop(self):
+        processes = [TimerFlow.start.run() for _ in range(2)]
+        stop = threading.Event()
+        runs = []
+
+        def callback(*counts):
+            runs.append(counts)
+            stop.set()
+
+        timers.run_timers_loop(flows=[], stop=stop, callback=callback)
+
+        self.assertEqual(runs, [(2, 0, 0)])
+        for process in processes:
+            process.refresh_from_db()
+            self.assertEqual(process.status, PROCESS.DONE)
+
+    def test_run_timers_loop_failed_run(self):
+        processes = [TimerFlow.start.run() for _ in range(2)]
+        stop = threading.Event()
+        runs = []
+
+        def callback(*counts):
+            runs.append(counts)
+            stop.set()
+
+        fire_due_timers = timers.fire_due_timers
+        errors = [DatabaseError("connection lost")]
+
+        def fail_once(**kwargs):
+            if errors:
+                raise errors.pop()
+            return fire_due_timers(**kwargs)
+
+        with mock.patch.object(
+            timers, "fire_due_timers", side_effect=fail_once
+        ), mock.patch.object(
+            timers, "close_old_connections"
+        ) as close_old_connections, self.assertLogs(
+            timers.logger, "ERROR"
+        ) as logs:
+            timers.run_timers_loop(
+                max_sleep=0.01, flows=[], stop=stop, callback=callback
+            )
+
+        self.assertEqual(runs, [(2, 0, 0)])
+        self.assertEqual(close_old_connections.call_count, 2)
+        self.assertIn("connection lost", logs.output[0])
+        for process in processes:
+            process.refresh_from_db()
+            self.assertEqual(process.status, PROCESS.DONE)
+
+
+class BoundaryTimerFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.approve)
+    approve = (
+        flow.View(lambda request: None)
+        .OnTimeout(timedelta(seconds=0), this.timed_out)
+        .Next(this.end)
+    )
+    end = flow.End()
+    timed_out = flow.End()
+
+
+class TimerFlow(flow.Flow):  # noqa: D101
+    start = flow.StartHandle().Next(this.wait)
+    wait = flow.Timer(timedelta(seconds=0)).Next(this.end)
+    end = flow.End()
+
+
+class StartTimerFlow(flow.Flow):  # noqa: D101
+    start = flow.StartTimer(interval=timedelta(hours=1)).Next(this.end)
+    end = flow.End()
@@ -32,3 +32,23 @@ class Test(TestCase):
 
         self.assertEqual(set([token.get_common_split_prefix('start/1_2/3_4', 0) for token in tokens]),
                          set(['start/1_2/3_4/5_']))
+
+    def test_token_key(self):
+        self.assertEqual(Token('start').key, '')
+        self.assertEqual(Token('start/2_1').key, '1211')
+        self.assertEqual(Token('start/2_1/300_12').key, '1211312c1c')
+        self.assertEqual(Token('start/2_1/300_12').depth, 2)
+        self.assertEqual(Token('start/2_1/300_12').get_split_path(), [(2, 1), (300, 12)])
+        self.assertIsNone(Token('start/1').key)
+
+    def test_split_key_range(self):
+        start, stop = Token.get_split_key_range('start/1_2/255_')
+        inside = ['start/1_2/255_1', 'start/1_2/255_300', 'start/1_2/255_1/7_1']
+        outside = ['start/1_2', 'start/1_2/254_1', 'start/1_2/256_1', 'start/1_3/255_1', 'start/1_2/2550_1']
+
+        for token in inside:
+            self.assertTrue(start <= Token(token).key < stop, token)
+        for token in outside:
+            self.assertFalse(start <= Token(token).key < stop, token)
+
+        self.assertIsNone(Token.get_split_key_range('start/1/255_'))
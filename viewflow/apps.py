@@ -37,3 +37,8 @@ class ViewflowConfig(AppConfig):
             turbo_middleware = "viewflow.middleware.HotwireTurboMiddleware"
             if turbo_middleware not in django_settings.MIDDLEWARE:
                 django_settings.MIDDLEWARE += (turbo_middleware,)
+
+        if apps.is_installed("django.contrib.auth"):
+            from .permissions import connect_signals
+
+            connect_signals()
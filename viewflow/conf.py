@@ -29,6 +29,15 @@ from viewflow.forms import renderers
 DEFAULTS = {
     "AUTOREGISTER": "viewflow" in django_settings.INSTALLED_APPS,
     "WIDGET_RENDERERS": renderers.WIDGET_RENDERERS,
+    "LOCK_METRICS": False,
+    "LOCK_METRICS_EXPORTER": "viewflow.workflow.metrics.cache_exporter",
+    "LOCK_METRICS_EXPORT_INTERVAL": 60,
+    "LOCK_STRIPES": 0,
+    "LOCK_STRIPE_TIMEOUT": 60,
+    "PERMISSION_CACHE": False,
+    "PERMISSION_CACHE_TIMEOUT": 300,
+    "TASK_COUNTERS": False,
+    "TASK_COUNTERS_TIMEOUT": 24 * 60 * 60,
 }
 
 
@@ -0,0 +1,63 @@
+import operator
+from functools import reduce
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from viewflow.workflow.models import AbstractProcess, AbstractTask
+
+
+def recount_active_tasks(only_missing=False):
+    """Recompute ``active_tasks`` counters from the task tables."""
+    updated = 0
+    for process_class in apps.get_models():
+        if not issubclass(process_class, AbstractProcess):
+            continue
+        if process_class._meta.get_field("active_tasks").model is not process_class:
+            continue  # the counter lives in a parent table
+
+        # tasks of every task model referencing the process are counted
+        counts = []
+        for relation in process_class._meta.related_objects:
+            task_class = relation.related_model
+            if not issubclass(task_class, AbstractTask):
+                continue
+            if relation.field.name != "process":
+                continue
+
+            counted_active_tasks = (
+                task_class._default_manager.filter(
+                    process=OuterRef("pk"), finished__isnull=True
+                )
+                .order_by()
+                .values("process")
+                .annotate(count=Count("pk"))
+                .values("count")
+            )
+            counts.append(Coalesce(Subquery(counted_active_tasks), Value(0)))
+        if not counts:
+            continue
+
+        processes = process_class._default_manager.all()
+        if only_missing:
+            processes = processes.filter(active_tasks__isnull=True)
+        updated += processes.update(active_tasks=reduce(operator.add, counts))
+    return updated
+
+
+class Command(BaseCommand):
+    help = "Recompute the active tasks counters of workflow processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            dest="only_missing",
+            help="Only compute counters of processes started before they existed",
+        )
+
+    def handle(self, **options):
+        updated = recount_active_tasks(only_missing=options["only_missing"])
+        self.stdout.write(f"{updated} process(es) updated")
@@ -0,0 +1,94 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from viewflow import conf
+from viewflow.workflow.metrics import histogram_quantile
+
+
+def _ms(seconds):
+    return "{:.1f}".format(seconds * 1000)
+
+
+class Command(BaseCommand):
+    help = "Dump flow lock metrics exported by the workflow processes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            dest="as_json",
+            help="Dump the raw merged snapshot as JSON",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            dest="reset",
+            help="Clear the exported metrics after the dump",
+        )
+
+    def handle(self, **options):
+        exporter = conf.settings.LOCK_METRICS_EXPORTER
+        if isinstance(exporter, str):
+            exporter = import_string(exporter)
+        if not hasattr(exporter, "collect"):
+            raise CommandError(
+                "LOCK_METRICS_EXPORTER {!r} does not keep metrics to dump".format(
+                    exporter
+                )
+            )
+
+        snapshot = exporter.collect()
+        if options["as_json"]:
+            self.stdout.write(json.dumps(snapshot, indent=2, sort_keys=True))
+        else:
+            self.write_table(snapshot)
+
+        if options["reset"]:
+            exporter.clear()
+
+    def write_table(self, snapshot):
+        rows = [
+            [
+                "flow",
+                "node",
+                "acquired",
+                "failed",
+                "attempts",
+                "wait avg ms",
+                "wait p95 ms",
+                "wait max ms",
+                "hold avg ms",
+                "hold max ms",
+            ]
+        ]
+        for flow_label, nodes in sorted(snapshot.items()):
+            for node_name, stats in sorted(nodes.items()):
+                wait, hold = stats["wait"], stats["hold"]
+                rows.append(
+                    [
+                        flow_label,
+                        node_name or "-",
+                        str(stats["acquired"]),
+                        str(stats["failed"]),
+                        str(stats["attempts"]),
+                        _ms(wait["sum"] / wait["count"] if wait["count"] else 0),
+                        _ms(histogram_quantile(wait, 0.95)),
+                        _ms(wait["max"]),
+                        _ms(hold["sum"] / hold["count"] if hold["count"] else 0),
+                        _ms(hold["max"]),
+                    ]
+                )
+        if len(rows) == 1:
+            self.stdout.write("No lock metrics exported")
+            return
+
+        widths = [max(len(row[column]) for row in rows) for column in range(10)]
+        for row in rows:
+            self.stdout.write(
+                "  ".join(
+                    value.ljust(width) if column < 2 else value.rjust(width)
+                    for column, (value, width) in enumerate(zip(row, widths))
+                ).rstrip()
+            )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from viewflow.workflow.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild the cached inbox and queue counters of workflow users"
+
+    def handle(self, **options):
+        written = reconcile_counters()
+        self.stdout.write(f"{written} inbox counter(s) written")
@@ -4,17 +4,65 @@ from viewflow.workflow.timers import (
     fire_due_conditions,
     fire_due_start_timers,
     fire_due_timers,
+    run_timers_loop,
 )
 
 
 class Command(BaseCommand):
     help = "Fire due database-backed workflow timers and scheduled process starts"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            dest="batch_size",
+            help="Number of due timers claimed at once",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            dest="workers",
+            help="Size of the thread pool firing claimed timers",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            dest="loop",
+            help="Keep running, sleeping until the next timer is due",
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=60,
+            dest="max_sleep",
+            help="Longest sleep between runs in --loop mode, in seconds",
+        )
+
     def handle(self, **options):
-        fired = fire_due_timers()
+        if options["loop"]:
+            try:
+                run_timers_loop(
+                    max_sleep=options["max_sleep"],
+                    batch_size=options["batch_size"],
+                    workers=options["workers"],
+                    callback=self.report,
+                )
+            except KeyboardInterrupt:
+                pass
+            return
+
+        fired = fire_due_timers(
+            batch_size=options["batch_size"], workers=options["workers"]
+        )
         started = fire_due_start_timers()
         conditions = fire_due_conditions()
-        self.stdout.write(
-            f"{fired} timer(s) fired, {started} process(es) started, "
-            f"{conditions} condition(s) fired"
-        )
+        self.report(fired, started, conditions, verbose=True)
+
+    def report(self, fired, started, conditions, verbose=False):
+        if verbose or fired or started or conditions:
+            self.stdout.write(
+                f"{fired} timer(s) fired, {started} process(es) started, "
+                f"{conditions} condition(s) fired"
+            )
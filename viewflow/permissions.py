@@ -0,0 +1,198 @@
+# Copyright (c) 2017-2024, Mikhail Podgurskiy
+# All Rights Reserved.
+
+# This work is dual-licensed under AGPL defined in file 'LICENSE' with
+# LICENSE_EXCEPTION and the Commercial license defined in file 'COMM_LICENSE',
+# which is part of this source code package.
+
+"""
+User permissions cached across requests.
+
+Enabled by the ``VIEWFLOW = {"PERMISSION_CACHE": True}`` setting. The result
+of ``user.get_all_permissions()`` and of object permission checks is kept
+in the default cache, under keys versioned per user and per group of the
+user. Versions are replaced on changes of the user and group permissions,
+the group membership (``m2m_changed``), and django-guardian object
+permissions, so outdated entries are never read again.
+
+Permissions granted by other authentication backends are not tracked,
+their changes are picked up within ``PERMISSION_CACHE_TIMEOUT`` seconds.
+Within a request, permissions are memoized on the user instance, like
+Django does.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings as django_settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+KEY_PREFIX = "viewflow-perms"
+GLOBAL_VERSION_KEY = f"{KEY_PREFIX}:version"
+
+
+def _enabled():
+    from viewflow import conf
+
+    return conf.settings.PERMISSION_CACHE
+
+
+def _version_key(kind, pk):
+    return f"{KEY_PREFIX}:{kind}:{pk}"
+
+
+def _versions(keys):
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # random versions never match entries of an evicted version
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_permissions_key(user):
+    """Cache key of the user permissions, changed when they change."""
+    key = getattr(user, "_viewflow_perms_key", None)
+    if key is not None:
+        return key
+
+    from viewflow import conf
+
+    global_version, user_version = _versions(
+        [GLOBAL_VERSION_KEY, _version_key("user", user.pk)]
+    )
+    groups_key = f"{KEY_PREFIX}:groups:{user.pk}:{global_version}:{user_version}"
+    group_pks = cache.get(groups_key)
+    if group_pks is None:
+        group_pks = sorted(user.groups.values_list("pk", flat=True))
+        cache.set(groups_key, group_pks, conf.settings.PERMISSION_CACHE_TIMEOUT)
+    group_versions = _versions([_version_key("group", pk) for pk in group_pks])
+
+    digest = hashlib.md5(
+        ":".join(
+            [
+                global_version,
+                user_version,
+                *group_versions,
+                str(user.is_active),
+                str(user.is_superuser),
+            ]
+        ).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    user._viewflow_perms_key = key = f"{KEY_PREFIX}:{user.pk}:{digest}"
+    return key
+
+
+def _cached(user, name, compute):
+    from viewflow import conf
+
+    key = "{}:{}".format(
+        get_permissions_key(user),
+        hashlib.md5(name.encode(), usedforsecurity=False).hexdigest(),
+    )
+    memo = user.__dict__.setdefault("_viewflow_perms", {})
+    if key not in memo:
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, conf.settings.PERMISSION_CACHE_TIMEOUT)
+        memo[key] = value
+    return memo[key]
+
+
+def get_all_permissions(user):
+    """Cached ``user.get_all_permissions()``."""
+    if not _enabled() or user.pk is None or not user.is_active:
+        return user.get_all_permissions()
+    return _cached(user, "all", user.get_all_permissions)
+
+
+def has_perm(user, perm, obj=None):
+    """Cached ``user.has_perm(perm, obj)``."""
+    if not _enabled() or user.pk is None or not user.is_active:
+        return user.has_perm(perm, obj=obj)
+    if user.is_superuser:
+        return True
+    if obj is None:
+        return perm in get_all_permissions(user)
+
+    from django.contrib.contenttypes.models import ContentType
+
+    content_type = ContentType.objects.get_for_model(obj, for_concrete_model=False)
+    return _cached(
+        user,
+        f"{perm}:{content_type.pk}:{obj.pk}",
+        lambda: user.has_perm(perm, obj=obj),
+    )
+
+
+def _replace_versions(keys):
+    cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+
+def invalidate_permissions(users=(), groups=()):
+    """Drop the cached permissions of the users and of the group members,
+    given by pks. With no arguments, the permissions of all users."""
+    keys = [_version_key("user", pk) for pk in users]
+    keys += [_version_key("group", pk) for pk in groups]
+    if not keys:
+        keys = [GLOBAL_VERSION_KEY]
+
+    _replace_versions(keys)
+    # permissions could be cached again from the data being changed
+    # by a concurrent request, before the transaction commits
+    transaction.on_commit(lambda: _replace_versions(keys))
+
+
+def _permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    from django.contrib.auth.models import Group
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    kind = "groups" if sender is Group.permissions.through else "users"
+    if not reverse:
+        invalidate_permissions(**{kind: [instance.pk]})
+    elif pk_set:
+        invalidate_permissions(**{kind: pk_set})
+    else:
+        invalidate_permissions()
+
+
+def _group_deleted(sender, **kwargs):
+    invalidate_permissions()
+
+
+def _user_object_permission_changed(sender, instance, **kwargs):
+    invalidate_permissions(users=[instance.user_id])
+
+
+def _group_object_permission_changed(sender, instance, **kwargs):
+    invalidate_permissions(groups=[instance.group_id])
+
+
+def connect_signals():
+    from django.contrib.auth.models import Group, Permission
+
+    user_model = get_user_model()
+    for sender in [
+        user_model.groups.through,
+        user_model.user_permissions.through,
+        Group.permissions.through,
+    ]:
+        m2m_changed.connect(_permissions_changed, sender=sender)
+    for sender in [Group, Permission]:
+        post_delete.connect(_group_deleted, sender=sender)
+
+    if "guardian" in django_settings.INSTALLED_APPS:
+        from guardian.models import GroupObjectPermission, UserObjectPermission
+
+        for signal in [post_save, post_delete]:
+            signal.connect(_user_object_permission_changed, sender=UserObjectPermission)
+            signal.connect(
+                _group_object_permission_changed, sender=GroupObjectPermission
+            )
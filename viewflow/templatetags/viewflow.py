@@ -12,6 +12,7 @@ from django.db.models import Model
 from django.urls import NoReverseMatch
 from django.utils.encoding import force_str
 from django.utils.html import conditional_escape
+from django.utils.translation import gettext as _
 
 from viewflow.contrib import auth
 from viewflow.forms import FormLayout
@@ -294,6 +295,20 @@ def list_page_data(page, list_view):
     return list_view.get_page_data(page)
 
 
+@register.filter
+def list_total(paginator):
+    """Total number of list objects, abbreviated if it is an estimate."""
+    count = paginator.count
+    if not getattr(paginator, "count_estimated", False):
+        return count
+    for divider, suffix in [(10**9, "B"), (10**6, "M"), (10**3, "K")]:
+        value = round(count / divider, 1)
+        if value >= 1:
+            count = f"{value:g}{suffix}"
+            break
+    return _("about %(count)s") % {"count": count}
+
+
 @register.filter
 def list_order(request_kwargs, list_view):
     return request_kwargs.get(list_view.ordering_kwarg, "")
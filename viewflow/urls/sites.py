@@ -8,6 +8,7 @@
 from django.urls import NoReverseMatch
 from django.utils.functional import cached_property
 
+from viewflow import permissions
 from viewflow.utils import Icon, camel_case_to_title, strip_suffixes
 
 from .base import IndexViewMixin, Viewset
@@ -83,7 +84,7 @@ class Application(IndexViewMixin, Viewset):
         if self.permission is not None:
             if callable(self.permission):
                 return self.permission(user)
-            return user.is_authenticated and user.has_perm(self.permission)
+            return user.is_authenticated and permissions.has_perm(user, self.permission)
         return True
 
     def menu_items(self):
@@ -140,7 +141,7 @@ class Site(IndexViewMixin, Viewset):
 
     def has_view_permission(self, user, obj=None):
         if self.permission is not None:
-            return user.has_perm(self.permission)
+            return permissions.has_perm(user, self.permission)
         return True
 
     def register(self, app_class):
@@ -26,6 +26,8 @@ from django.db import models
 from django.utils.html import conditional_escape
 from django.utils.safestring import mark_safe
 
+from viewflow import permissions
+
 __all__ = ("has_object_perm", "viewprop", "DEFAULT", "first_not_default")
 
 
@@ -95,9 +97,9 @@ def has_object_perm(user, short_perm_name, model, obj=None):
     has the permission for that specific object instance.
     """
     perm_name = f"{model._meta.app_label}.{auth.get_permission_codename(short_perm_name, model._meta)}"
-    has_perm = user.has_perm(perm_name)
+    has_perm = permissions.has_perm(user, perm_name)
     if not has_perm and obj is not None:
-        has_perm = user.has_perm(perm_name, obj=obj)
+        has_perm = permissions.has_perm(user, perm_name, obj=obj)
     return has_perm
 
 
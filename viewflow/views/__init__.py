@@ -4,10 +4,10 @@ from .create import CreateModelView
 from .delete import DeleteModelView
 from .detail import DetailModelView
 from .list import ListModelView, FilterableViewMixin, OrderableListViewMixin
+from .pagination import EstimatedCountPaginator, KeysetPaginator
 from .search import SearchableViewMixin
 from .update import UpdateModelView
 
-
 __all__ = (
     "Action",
     "BaseBulkActionView",
@@ -16,8 +16,10 @@ __all__ = (
     "DeleteBulkActionView",
     "DeleteModelView",
     "DetailModelView",
+    "EstimatedCountPaginator",
     "FilterableViewMixin",
     "FormLayoutMixin",
+    "KeysetPaginator",
     "ListModelView",
     "OrderableListViewMixin",
     "SearchableViewMixin",
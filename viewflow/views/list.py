@@ -10,8 +10,10 @@ import decimal
 
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import FieldDoesNotExist, PermissionDenied
+from django.core.paginator import InvalidPage
 from django.db import models
 from django.forms.utils import pretty_name
+from django.http import Http404
 from django.utils import formats, timezone
 from django.utils.decorators import method_decorator
 from django.utils.encoding import force_str
@@ -21,6 +23,7 @@ from django.views import generic
 
 from viewflow.utils import Icon, has_object_perm, viewprop
 from .filters import FilterableViewMixin
+from .pagination import KeysetPaginator
 from .search import SearchableViewMixin
 
 
@@ -430,6 +433,25 @@ class BaseListModelView(generic.ListView):
                 for column_def in self.list_columns.values()
             ]
 
+    def paginate_queryset(self, queryset, page_size):
+        if not issubclass(self.paginator_class, KeysetPaginator):
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        cursor = self.kwargs.get(self.page_kwarg) or self.request.GET.get(
+            self.page_kwarg
+        )
+        try:
+            page = paginator.page(cursor)
+        except InvalidPage as e:
+            raise Http404(str(e))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
     def get_page_actions(self, *actions):
         if self.viewset is not None and hasattr(self.viewset, "get_list_page_actions"):
             actions = self.viewset.get_list_page_actions(self.request) + actions
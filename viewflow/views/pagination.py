@@ -0,0 +1,426 @@
+# Copyright (c) 2017-2024, Mikhail Podgurskiy
+# All Rights Reserved.
+
+# This work is dual-licensed under AGPL defined in file 'LICENSE' with
+# LICENSE_EXCEPTION and the Commercial license defined in file 'COMM_LICENSE',
+# which is part of this source code package.
+
+import base64
+import binascii
+import datetime
+import json
+import operator
+from functools import reduce
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import (
+    EmptyPage,
+    InvalidPage,
+    Page,
+    PageNotAnInteger,
+    Paginator,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, connections, transaction
+from django.db.models import F, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.expressions import OrderBy
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder rounds to milliseconds, keyset values are exact
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def estimate_count(queryset):
+    """
+    Row count of a queryset from the database planner statistics, or None.
+
+    PostgreSQL reads ``pg_class.reltuples`` for unfiltered querysets and
+    the ``EXPLAIN`` row estimate otherwise. SQLite reads ``sqlite_stat1``,
+    collected by ``ANALYZE``, for unfiltered querysets only.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+
+    query = queryset.query
+    connection = connections[queryset.db]
+    unfiltered = not (
+        query.where
+        or query.distinct
+        or query.is_sliced
+        or query.combinator
+        or query.group_by is not None
+    )
+
+    if connection.vendor == "postgresql":
+        if unfiltered:
+            sql = "SELECT reltuples FROM pg_class WHERE oid = %s::regclass"
+            params = [connection.ops.quote_name(queryset.model._meta.db_table)]
+        else:
+            query = query.chain()
+            query.clear_ordering(force=True)
+            sql, params = query.get_compiler(queryset.db).as_sql()
+            sql = f"EXPLAIN (FORMAT JSON) {sql}"
+    elif connection.vendor == "sqlite" and unfiltered:
+        sql = "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1"
+        params = [queryset.model._meta.db_table]
+    else:
+        return None
+
+    try:
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+    except DatabaseError:
+        # no statistics table, or the planner refused the query
+        return None
+    if row is None or row[0] is None:
+        return None
+
+    if connection.vendor == "sqlite":
+        # "<rows> <rows per distinct index prefix>..."
+        estimate = int(row[0].split()[0])
+    elif unfiltered:
+        # -1 for a table never vacuumed or analyzed
+        estimate = int(row[0])
+    else:
+        plan = json.loads(row[0]) if isinstance(row[0], str) else row[0]
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPage(Page):
+    """A page of a list counted by an estimate, aware of the following rows."""
+
+    def __init__(self, object_list, number, paginator, has_next):  # noqa D102
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self) - 1
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator counting large querysets from the planner statistics.
+
+    The exact ``COUNT(*)`` is made only when no estimate is available or
+    the estimate is below ``estimate_threshold``. With an estimated count,
+    pages are fetched with one extra row to tell if there is a next page,
+    so rows beyond the estimate are reachable, and ``orphans`` are not
+    merged into the last page.
+    """
+
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        """Total number of objects, estimated for the large querysets."""
+        estimate = estimate_count(self.object_list)
+        self._count_estimated = (
+            estimate is not None and estimate >= self.estimate_threshold
+        )
+        if self._count_estimated:
+            return estimate
+        return super().count
+
+    @property
+    def count_estimated(self):
+        self.count
+        return self._count_estimated
+
+    def validate_number(self, number):
+        if not self.count_estimated:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        if not self.count_estimated:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return EstimatedCountPage(
+            rows[: self.per_page], number, self, len(rows) > self.per_page
+        )
+
+
+class KeysetColumn(object):
+    """A column of the keyset, a field path with the sort direction."""
+
+    def __init__(self, model, path, descending):  # noqa D102
+        self.path = path
+        self.descending = descending
+        self.nullable = False
+
+        names = path.split(LOOKUP_SEP)
+        for index, name in enumerate(names):
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+            if not field.concrete:
+                raise FieldDoesNotExist(f"{path} is not a concrete field path")
+            self.nullable = self.nullable or field.null
+            if index < len(names) - 1:
+                if not field.is_relation:
+                    raise FieldDoesNotExist(f"{name} of {path} is not a relation")
+                model = field.related_model
+            elif field.is_relation and name not in ("pk", field.attname):
+                # ordered by the related model ordering
+                raise FieldDoesNotExist(f"{path} is ordered by a relation")
+        self.field = field
+
+    def get_value(self, obj):
+        *relations, name = self.path.split(LOOKUP_SEP)
+        for relation in relations:
+            obj = getattr(obj, relation)
+            if obj is None:
+                return None
+        return getattr(obj, "pk" if name == "pk" else self.field.attname)
+
+    def order_by(self, reverse):
+        kwargs = {}
+        if self.nullable:
+            # NULLs follow the values, in both directions
+            kwargs = {"nulls_first": True} if reverse else {"nulls_last": True}
+        if self.descending != reverse:
+            return F(self.path).desc(**kwargs)
+        return F(self.path).asc(**kwargs)
+
+    def after(self, value, reverse):
+        """Rows following the value, or None if there are none."""
+        if value is None:
+            return Q(**{f"{self.path}__isnull": False}) if reverse else None
+        lookup = "lt" if self.descending != reverse else "gt"
+        condition = Q(**{f"{self.path}__{lookup}": value})
+        if self.nullable and not reverse:
+            condition |= Q(**{f"{self.path}__isnull": True})
+        return condition
+
+    def equal(self, value):
+        if value is None:
+            return Q(**{f"{self.path}__isnull": True})
+        return Q(**{self.path: value})
+
+
+class KeysetPage(object):
+    """A page of a keyset paginated list, linked by cursors."""
+
+    number = None
+    start_index = None
+    end_index = None
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return "<Page after cursor>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_number(self):
+        return self.next_cursor
+
+    def previous_page_number(self):
+        return self.previous_cursor
+
+
+class KeysetPaginator(object):
+    """
+    Paginate a queryset by the values of the ordering columns of the last
+    row shown, instead of an OFFSET.
+
+    The queryset ordering, followed by the primary key, makes the keyset.
+    Pages are addressed by opaque cursors, passed in place of the page
+    number. Deep pages cost the same as the first one, and no ``COUNT(*)``
+    is made unless ``count_total`` is set.
+
+    Querysets ordered by anything but plain field paths, like expressions
+    or relations ordered by the related model ordering, are paginated
+    with an OFFSET and page numbers, by ``offset_paginator_class``. The
+    total is counted by it as well, set ``EstimatedCountPaginator`` there
+    to show an estimated total on the large lists.
+    """
+
+    count_total = False
+    offset_paginator_class = Paginator
+
+    def __init__(
+        self, object_list, per_page, orphans=0, allow_empty_first_page=True
+    ):  # noqa D102
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.orphans = orphans
+        self.allow_empty_first_page = allow_empty_first_page
+        self.columns = self._get_columns(object_list)
+
+    def _get_columns(self, queryset):
+        model = queryset.model
+        ordering = list(queryset.query.order_by)
+        if not ordering and queryset.query.default_ordering:
+            ordering = list(model._meta.ordering)
+
+        columns = []
+        for term in ordering:
+            if isinstance(term, str) and term != "?" and "." not in term:
+                path, descending = term.lstrip("-"), term.startswith("-")
+            elif isinstance(term, OrderBy) and isinstance(term.expression, F):
+                path, descending = term.expression.name, term.descending
+            elif isinstance(term, F):
+                path, descending = term.name, False
+            else:
+                return None
+            try:
+                columns.append(KeysetColumn(model, path, descending))
+            except FieldDoesNotExist:
+                return None
+
+        if not any(
+            column.field == model._meta.pk and LOOKUP_SEP not in column.path
+            for column in columns
+        ):
+            columns.append(KeysetColumn(model, "pk", False))
+        return columns
+
+    @cached_property
+    def offset_paginator(self):
+        return self.offset_paginator_class(
+            self.object_list,
+            self.per_page,
+            orphans=self.orphans,
+            allow_empty_first_page=self.allow_empty_first_page,
+        )
+
+    @cached_property
+    def count(self):
+        """Total number of objects, None unless ``count_total`` is set."""
+        if self.columns is None or self.count_total:
+            return self.offset_paginator.count
+        return None
+
+    @property
+    def count_estimated(self):
+        return self.count is not None and getattr(
+            self.offset_paginator, "count_estimated", False
+        )
+
+    @property
+    def keyset(self):
+        return [
+            f"-{column.path}" if column.descending else column.path
+            for column in self.columns
+        ]
+
+    def encode_cursor(self, obj, reverse):
+        values = [column.get_value(obj) for column in self.columns]
+        data = json.dumps([self.keyset, values, reverse], cls=_CursorEncoder)
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """
+        Values and direction of the cursor, or None if the cursor was made
+        for another ordering, i.e. the list was sorted by another column.
+        """
+        try:
+            data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            keyset, values, reverse = json.loads(data)
+            if keyset != self.keyset:
+                return None
+            if len(values) != len(self.columns):
+                raise ValueError(cursor)
+            values = [
+                None if value is None else column.field.to_python(value)
+                for column, value in zip(self.columns, values)
+            ]
+        except (binascii.Error, TypeError, ValueError, ValidationError):
+            raise InvalidPage(_("Invalid page cursor"))
+        return values, bool(reverse)
+
+    def page(self, cursor=None):
+        """
+        Page of the rows following the cursor, the first page for None.
+
+        Without a keyset, the cursor is a page number, or ``"last"``.
+        """
+        if self.columns is None:
+            if cursor == "last":
+                cursor = self.offset_paginator.num_pages
+            return self.offset_paginator.page(cursor or 1)
+
+        # the first page, also for a page number from an offset paginated url
+        decoded = None
+        if cursor not in (None, "", "1"):
+            decoded = self.decode_cursor(cursor)
+        has_cursor = decoded is not None
+        queryset, reverse = self.object_list, False
+        if has_cursor:
+            values, reverse = decoded
+            conditions, equal = [], Q()
+            for column, value in zip(self.columns, values):
+                after = column.after(value, reverse)
+                if after is not None:
+                    conditions.append(equal & after)
+                equal &= column.equal(value)
+            queryset = queryset.filter(
+                reduce(operator.or_, conditions) if conditions else Q(pk__in=[])
+            )
+
+        queryset = queryset.order_by(
+            *[column.order_by(reverse) for column in self.columns]
+        )
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+
+        if not rows and has_cursor:
+            raise InvalidPage(_("That page contains no results"))
+
+        if reverse:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, has_cursor
+        return KeysetPage(
+            rows,
+            self,
+            self.encode_cursor(rows[-1], False) if has_next else None,
+            self.encode_cursor(rows[0], True) if has_previous else None,
+        )
@@ -1,12 +1,14 @@
 import json
 import traceback
+from collections import defaultdict
 from contextlib import ContextDecorator
-from typing import Any, List, Optional, Set
+from typing import Any, Iterable, List, Optional, Set, Tuple
 
-from django.db import connection, transaction
+from django.db import connection, connections, router, transaction
 from django.utils.timezone import now
 
 from viewflow import fsm
+from . import lock
 from .context import context
 from .signals import task_finished, task_failed
 from .status import STATUS, PROCESS
@@ -107,7 +109,16 @@ class Activation:
             task (Any): The task instance associated with the activation.
         """
         self.task = task
-        self.process = task.process.coerced
+        unit_of_work = lock.current_unit_of_work()
+        if unit_of_work is None:
+            self.process = task.process.coerced
+        else:
+            # activations within a lock scope share one process instance
+            unit_of_work.register(task)
+            process = unit_of_work.get(self.flow_class.process_class, task.process_id)
+            if process is None:
+                process = unit_of_work.register(task.process.coerced)
+            self.process = process
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, Activation):
@@ -186,6 +197,35 @@ class Activation:
 
         return ExceptionGuard()
 
+    @classmethod
+    def build(
+        cls,
+        flow_task: Any,
+        prev_activation: "Activation",
+        token: Any,
+        data: Optional[Any] = None,
+        seed: Optional[Any] = None,
+    ) -> "Activation":
+        """
+        Instantiate an activation for a new, not yet saved, flow task.
+
+        Node specific task fields are assigned here, so the task could be
+        persisted either one by one with :meth:`create` or in a batch by
+        :func:`bulk_create`.
+        """
+        flow_class = flow_task.flow_class
+        task = flow_class.task_class(
+            process=prev_activation.process,
+            flow_task=flow_task,
+            token=token,
+        )
+        task.data = data if data is not None else {}
+        task.seed = seed
+        return cls(task)
+
+    def post_create(self) -> None:
+        """Hook called as soon as the task built by :meth:`build` is saved."""
+
     @classmethod
     def create(
         cls,
@@ -207,17 +247,21 @@ class Activation:
         Returns:
             Activation: The newly created activation instance.
         """
-        flow_class = flow_task.flow_class
-        task = flow_class.task_class(
-            process=prev_activation.process,
-            flow_task=flow_task,
-            token=token,
-        )
-        task.data = data if data is not None else {}
-        task.seed = seed
-        task.save()
-        task.previous.add(prev_activation.task)
-        return cls(task)
+        activation = cls.build(flow_task, prev_activation, token, data=data, seed=seed)
+        activation.task.save()
+        activation.task.previous.add(prev_activation.task)
+        activation.post_create()
+        return activation
+
+    @classmethod
+    def can_bulk_create(cls) -> bool:
+        """
+        Whether tasks of this activation could be inserted by :func:`bulk_create`.
+
+        True unless a subclass overrides :meth:`create` with its own
+        persistence logic (e.g. a Join looking up an existing task).
+        """
+        return getattr(cls.create, "__func__", None) is Activation.create.__func__
 
     @status.transition(source=STATUS.NEW)
     def activate(self) -> None:
@@ -341,3 +385,90 @@ class Activation:
     def get_available_transitions(self, user) -> List[fsm.Transition]:
         """Get the available transitions for the current status and user."""
         return self.__class__.status.get_available_transitions(self, self.status, user)
+
+
+def _can_bulk_insert(task_class: Any) -> bool:
+    """``bulk_create`` needs returned pks and can't insert multi-table children."""
+    if task_class._meta.concrete_model._meta.parents:
+        return False
+    db = router.db_for_write(task_class)
+    return connections[db].features.can_return_rows_from_bulk_insert
+
+
+def bulk_create(
+    prev_activation: Activation,
+    branches: Iterable[Tuple[Any, Any, Optional[Any], Optional[Any]]],
+) -> List[Activation]:
+    """
+    Create next tasks for a batch of ``(flow_task, token, data, seed)``
+    branches outgoing from ``prev_activation``.
+
+    Tasks of nodes with the default :meth:`Activation.create` are inserted
+    with a single ``bulk_create`` per task model, and their ``previous``
+    links with one more insert. Nodes with custom persistence (``Join``)
+    and multi-table inherited task models fall back to the one by one
+    ``Node._create``.
+
+    ``post_create`` hooks and boundary events are processed for each
+    bulk-inserted task, but ``Task.save()`` overrides and ``post_save``
+    signals are not called. The process ``active_tasks`` counter is
+    incremented once per batch, and the inbox and queue counters are
+    updated for each task.
+
+    Returns the activations in the branches order.
+    """
+    from . import counters  # avoid app not loaded error
+    from .models import update_active_tasks
+
+    branches = list(branches)
+    activations: List[Optional[Activation]] = [None] * len(branches)
+    batches = defaultdict(list)
+
+    for n, (flow_task, token, data, seed) in enumerate(branches):
+        task_class = flow_task.flow_class.task_class
+        if flow_task.activation_class.can_bulk_create() and _can_bulk_insert(
+            task_class
+        ):
+            activation = flow_task.activation_class.build(
+                flow_task, prev_activation, token, data=data, seed=seed
+            )
+            batches[task_class].append((n, activation))
+
+    for task_class, batch in batches.items():
+        tasks = [activation.task for _, activation in batch]
+        for task in tasks:
+            if task.flow_task and not task.flow_task_type:
+                task.flow_task_type = task.flow_task.task_type
+        task_class._default_manager.bulk_create(tasks)
+        for task in tasks:
+            counters.task_saved(task, True, None)
+            task._track_fields()
+        update_active_tasks(
+            task_class._meta.get_field("process").related_model,
+            prev_activation.process.pk,
+            sum(1 for task in tasks if task.finished is None),
+        )
+
+        previous = task_class._meta.get_field("previous")
+        through = previous.remote_field.through
+        from_attname = through._meta.get_field(previous.m2m_field_name()).attname
+        to_attname = through._meta.get_field(previous.m2m_reverse_field_name()).attname
+        through._default_manager.bulk_create(
+            [
+                through(**{from_attname: task.pk, to_attname: prev_activation.task.pk})
+                for task in tasks
+            ]
+        )
+
+        for n, activation in batch:
+            activation.post_create()
+            activation.flow_task._created(activation)
+            activations[n] = activation
+
+    for n, (flow_task, token, data, seed) in enumerate(branches):
+        if activations[n] is None:
+            activations[n] = flow_task._create(
+                prev_activation, token, data=data, seed=seed
+            )
+
+    return activations
@@ -284,9 +284,13 @@ class Node(Viewset):
         activation = self.activation_class.create(
             self, prev_activation, token, data=data, seed=seed
         )
+        self._created(activation)
+        return activation
+
+    def _created(self, activation: "Activation") -> None:
+        """Arm boundary events of a just created task."""
         for boundary_event in self._boundary_events:
             boundary_event._arm(activation)
-        return activation
 
     def Annotation(
         self,
@@ -370,6 +374,7 @@ class Flow(Viewset, metaclass=FlowMetaClass):
     process_class: Optional[type] = None
     task_class: Optional[type] = None
     lock_impl: Any = lock.no_lock
+    unit_of_work: bool = False
 
     process_title: str = ""
     process_description: str = ""
@@ -498,11 +503,33 @@ class Flow(Viewset, metaclass=FlowMetaClass):
         return {"flow": self}
 
     @classmethod
-    def lock(cls, process_pk: int) -> Any:
+    def lock(cls, process_pk: int, node: Optional[Node] = None) -> Any:
         """
         Acquire a lock for the specified process.
+
+        The ``node`` taking the lock is used to break down the lock metrics.
+        """
+        return lock.lock_scope(
+            cls.lock_impl,
+            cls,
+            process_pk,
+            unit_of_work=cls.unit_of_work,
+            node=node,
+        )
+
+    @classmethod
+    def lock_many(cls, process_pks: List[int]) -> Any:
+        """
+        Lock a batch of processes at once, skipping the ones already locked.
+
+        Yields the sorted list of locked process pks::
+
+            with MyFlow.lock_many(process_pks) as locked_pks:
+                ...
         """
-        return lock.lock_scope(cls.lock_impl, cls, process_pk)
+        return lock.lock_many_scope(
+            cls.lock_impl, cls, process_pks, unit_of_work=cls.unit_of_work
+        )
 
     @property
     def app_label(self) -> str:
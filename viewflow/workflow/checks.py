@@ -1,6 +1,7 @@
 """System checks warning about unsafe workflow configuration."""
 
-from django.core.checks import Warning, register
+from django.core.checks import Tags, Warning, register
+from django.db import connections, router
 
 
 def _all_flow_subclasses(cls):
@@ -46,11 +47,59 @@ def check_join_nodes_require_a_real_lock(app_configs, **kwargs):
                     "concurrent branch completions.",
                     hint=(
                         "Set lock_impl to a real lock, e.g. "
-                        "viewflow.workflow.lock.select_for_update_lock or "
-                        "cache_lock, on the flow class."
+                        "viewflow.workflow.lock.select_for_update_lock, "
+                        "advisory_lock or cache_lock, on the flow class. "
+                        "On SQLite, use sqlite_immediate_lock."
                     ),
                     obj=flow_class,
                     id="viewflow.W001",
                 )
             )
     return errors
+
+
+def _sqlite_journal_mode(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        return cursor.fetchone()[0].lower()
+
+
+@register(Tags.database)
+def check_sqlite_lock_uses_wal(app_configs, databases=None, **kwargs):
+    """SQLiteImmediateLock serializes writers only. In the default rollback
+    journal mode, the writer also blocks every reader at commit, so task
+    lists wait for running activations. WAL lets readers proceed.
+    """
+    from .base import Flow
+    from .lock import SQLiteImmediateLock
+
+    errors = []
+    checked = set()
+    for flow_class in _all_flow_subclasses(Flow):
+        lock_impl = flow_class.lock_impl
+        if not isinstance(lock_impl, SQLiteImmediateLock):
+            continue
+        using = lock_impl.using or router.db_for_write(flow_class.process_class)
+        if using in checked or using not in (databases or []):
+            continue
+        checked.add(using)
+        connection = connections[using]
+        if connection.vendor != "sqlite":
+            continue
+        journal_mode = _sqlite_journal_mode(connection)
+        # in-memory databases can't be shared between processes anyway
+        if journal_mode not in ("wal", "memory"):
+            errors.append(
+                Warning(
+                    f"Database {using!r} used by SQLiteImmediateLock is in "
+                    f"the {journal_mode!r} journal mode, readers are blocked "
+                    "while a flow activation commits.",
+                    hint=(
+                        "Enable WAL with "
+                        "OPTIONS={'init_command': 'PRAGMA journal_mode=WAL;'} "
+                        "in the database settings."
+                    ),
+                    id="viewflow.W002",
+                )
+            )
+    return errors
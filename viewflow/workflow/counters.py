@@ -0,0 +1,362 @@
+"""
+Per-user inbox and queue task counters, for menu badges.
+
+Enabled by the ``VIEWFLOW = {"TASK_COUNTERS": True}`` setting. The number
+of tasks in the inbox and the queue of a user is kept in the default
+cache per flow, so the workflow menu shows them without running the
+``COUNT(*)`` queries on every page.
+
+Inbox counters are incremented and decremented when a task is assigned,
+unassigned, finished or cancelled. Queue counters are kept per audience
+of the flow tasks: the tasks open to everybody, and the tasks of each
+permission of the flow nodes, ``.Permission("app.codename")``. A task
+entering or leaving the queue updates the counter of its audience, and
+the queue of a user sums the counters of the permissions the user has.
+The tasks of other audiences -- with an owner, an object permission or
+a permission computed by a callable -- start a new queue generation of
+the flow instead, and are recounted once per generation and user
+permissions.
+
+A counter missing in the cache is counted from the database on read.
+Tasks created by ``Task.save()`` or by the split ``bulk_create`` are
+counted. Counters drift on concurrent first reads and on task writes
+bypassing both, like ``QuerySet.update()``; run ``./manage.py workflow_task_counters``
+periodically to rebuild them.
+"""
+
+import uuid
+from functools import lru_cache, partial
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+from viewflow import permissions
+
+from .managers import _available_flows
+from .status import STATUS
+
+KEY_PREFIX = "viewflow-counters"
+VERSION_KEY = f"{KEY_PREFIX}:version"
+
+# task fields deciding who sees a task in the queue, by attribute name
+QUEUE_AUDIENCE_FIELDS = {
+    "owner": "owner_id",
+    "owner_permission": "owner_permission",
+    "owner_permission_content_type": "owner_permission_content_type_id",
+    "owner_permission_obj_pk": "owner_permission_obj_pk",
+}
+
+
+def _settings():
+    from viewflow import conf
+
+    return conf.settings
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _inbox_key(version, flow_class, user_pk):
+    return f"{KEY_PREFIX}:{version}:inbox:{flow_class.instance.flow_label}:{user_pk}"
+
+
+def _generation_key(flow_class):
+    return f"{KEY_PREFIX}:generation:{flow_class.instance.flow_label}"
+
+
+def _queue_key(version, flow_class, generation, user):
+    return "{}:{}:queue:{}:{}:{}".format(
+        KEY_PREFIX,
+        version,
+        flow_class.instance.flow_label,
+        generation,
+        permissions.get_permissions_key(user),
+    )
+
+
+def _count_inbox(flow_class, user):
+    return (
+        flow_class.task_class._default_manager.filter(
+            process__flow_class=flow_class, owner=user, status=STATUS.ASSIGNED
+        )
+        .order_by()
+        .count()
+    )
+
+
+def _audience_key(version, flow_class, audience):
+    return (
+        f"{KEY_PREFIX}:{version}:audience:{flow_class.instance.flow_label}:{audience}"
+    )
+
+
+@lru_cache(maxsize=None)
+def _flow_permissions(flow_class):
+    """Permissions of the flow nodes, each one a queue audience."""
+    return frozenset(
+        node._owner_permission
+        for node in flow_class.instance.nodes()
+        if isinstance(getattr(node, "_owner_permission", None), str)
+    )
+
+
+def _audience(flow_class, owner_pk, owner_permission, owner_permission_obj_pk):
+    """Queue audience of a task, "" when open to everybody, and None when
+    the task is counted per user."""
+    if owner_pk is not None or owner_permission_obj_pk is not None:
+        return None
+    if owner_permission is None:
+        return ""
+    if owner_permission in _flow_permissions(flow_class):
+        return owner_permission
+    return None
+
+
+def _queued_tasks(flow_class):
+    return flow_class.task_class._default_manager.filter(
+        process__flow_class=flow_class, flow_task_type="HUMAN", status=STATUS.NEW
+    ).order_by()
+
+
+def _count_audience(flow_class, audience):
+    tasks = _queued_tasks(flow_class).filter(
+        owner__isnull=True, owner_permission_obj_pk__isnull=True
+    )
+    if audience:
+        return tasks.filter(owner_permission=audience).count()
+    return tasks.filter(owner_permission__isnull=True).count()
+
+
+def _count_queue(flow_class, user, per_user=False):
+    """Number of tasks in the user queue, only of the ones counted per
+    user with ``per_user``."""
+    tasks = _queued_tasks(flow_class).user_queue(user)
+    if per_user:
+        tasks = tasks.exclude(
+            Q(owner__isnull=True, owner_permission_obj_pk__isnull=True)
+            & (
+                Q(owner_permission__isnull=True)
+                | Q(owner_permission__in=_flow_permissions(flow_class))
+            )
+        )
+    return tasks.count()
+
+
+def _sum_counters(keys, count):
+    cached = cache.get_many(list(keys.values()))
+    total = 0
+    for flow_class, key in keys.items():
+        value = cached.get(key)
+        if value is None:
+            value = count(flow_class)
+            cache.add(key, value, _settings().TASK_COUNTERS_TIMEOUT)
+        total += max(value, 0)
+    return total
+
+
+def inbox_count(flow_classes, user):
+    """Number of tasks assigned to the user, as in ``TaskQuerySet.inbox``."""
+    flow_classes = _available_flows(flow_classes, user)
+    if not _settings().TASK_COUNTERS or user.pk is None:
+        return sum(_count_inbox(flow_class, user) for flow_class in flow_classes)
+
+    version = _version()
+    return _sum_counters(
+        {
+            flow_class: _inbox_key(version, flow_class, user.pk)
+            for flow_class in flow_classes
+        },
+        lambda flow_class: _count_inbox(flow_class, user),
+    )
+
+
+def queue_count(flow_classes, user):
+    """Number of tasks the user can assign, as in ``TaskQuerySet.queue``."""
+    flow_classes = _available_flows(flow_classes, user)
+    if not _settings().TASK_COUNTERS or user.pk is None:
+        return sum(_count_queue(flow_class, user) for flow_class in flow_classes)
+
+    version = _version()
+    generation_keys = {
+        flow_class: _generation_key(flow_class) for flow_class in flow_classes
+    }
+    generations = cache.get_many(list(generation_keys.values()))
+    user_keys = {
+        flow_class: _queue_key(version, flow_class, generations.get(key, ""), user)
+        for flow_class, key in generation_keys.items()
+    }
+
+    # the tasks counted per user, and the audiences the user belongs to
+    cached = cache.get_many(list(user_keys.values()))
+    total, audience_keys = 0, {}
+    for flow_class, key in user_keys.items():
+        value = cached.get(key)
+        if value is None:
+            if user.is_superuser:
+                granted = _flow_permissions(flow_class)
+            else:
+                granted = _flow_permissions(flow_class) & set(
+                    permissions.get_all_permissions(user)
+                )
+            value = (_count_queue(flow_class, user, per_user=True), sorted(granted))
+            cache.add(key, value, _settings().TASK_COUNTERS_TIMEOUT)
+        count, granted = value
+        total += max(count, 0)
+        for audience in ["", *granted]:
+            audience_keys[flow_class, audience] = _audience_key(
+                version, flow_class, audience
+            )
+
+    cached = cache.get_many(list(audience_keys.values()))
+    for (flow_class, audience), key in audience_keys.items():
+        value = cached.get(key)
+        if value is None:
+            value = _count_audience(flow_class, audience)
+            cache.add(key, value, _settings().TASK_COUNTERS_TIMEOUT)
+        total += max(value, 0)
+    return total
+
+
+def menu_counts(flow_classes, user, inbox, queue):
+    """
+    Template context with the ``user_inbox_count`` and ``user_queue_count``
+    callables, evaluated only when rendered.
+
+    The cached counters are used when enabled, the ``inbox`` and ``queue``
+    querysets are counted otherwise.
+    """
+    if not _settings().TASK_COUNTERS:
+        return {"user_inbox_count": inbox.count, "user_queue_count": queue.count}
+    return {
+        "user_inbox_count": partial(inbox_count, flow_classes, user),
+        "user_queue_count": partial(queue_count, flow_classes, user),
+    }
+
+
+def _update_inbox(flow_class, user_pk, delta):
+    try:
+        cache.incr(_inbox_key(_version(), flow_class, user_pk), delta)
+    except ValueError:
+        pass  # not cached, counted on the next read
+
+
+def _update_audience(flow_class, audience, delta):
+    try:
+        cache.incr(_audience_key(_version(), flow_class, audience), delta)
+    except ValueError:
+        pass  # not cached, counted on the next read
+
+
+def _next_generation(flow_class):
+    cache.set(_generation_key(flow_class), uuid.uuid4().hex, None)
+
+
+# the audience of a task out of the queue
+_NOT_QUEUED = object()
+
+
+def _in_queue(task, status):
+    return status == STATUS.NEW and task.flow_task_type == "HUMAN"
+
+
+def task_saved(task, created, loaded_state):
+    """Update the counters of the task changed by ``Task.save()``."""
+    if not _settings().TASK_COUNTERS or task.flow_task is None:
+        return
+
+    if created:
+        loaded_state = {}
+    elif loaded_state is None or not {"status", "owner"} <= loaded_state.keys():
+        return
+    flow_class = task.flow_task.flow_class
+
+    was_assigned_to = None
+    if loaded_state.get("status") == STATUS.ASSIGNED:
+        was_assigned_to = loaded_state.get("owner")
+    assigned_to = task.owner_id if task.status == STATUS.ASSIGNED else None
+    if was_assigned_to != assigned_to:
+        if was_assigned_to is not None:
+            transaction.on_commit(
+                lambda: _update_inbox(flow_class, was_assigned_to, -1)
+            )
+        if assigned_to is not None:
+            transaction.on_commit(lambda: _update_inbox(flow_class, assigned_to, 1))
+
+    was_queued = _in_queue(task, loaded_state.get("status"))
+    queued = _in_queue(task, task.status)
+    audience_changed = any(
+        name in loaded_state and loaded_state[name] != getattr(task, attname)
+        for name, attname in QUEUE_AUDIENCE_FIELDS.items()
+    )
+    if was_queued == queued and not (queued and audience_changed):
+        return
+
+    was_audience = audience = _NOT_QUEUED
+    if was_queued:
+        was_audience = _audience(
+            flow_class,
+            loaded_state.get("owner"),
+            loaded_state.get("owner_permission"),
+            loaded_state.get("owner_permission_obj_pk"),
+        )
+    if queued:
+        audience = _audience(
+            flow_class,
+            task.owner_id,
+            task.owner_permission,
+            task.owner_permission_obj_pk,
+        )
+
+    if was_audience is None or audience is None:
+        transaction.on_commit(lambda: _next_generation(flow_class))
+    if was_audience != audience:
+        if was_audience not in (None, _NOT_QUEUED):
+            transaction.on_commit(
+                lambda: _update_audience(flow_class, was_audience, -1)
+            )
+        if audience not in (None, _NOT_QUEUED):
+            transaction.on_commit(lambda: _update_audience(flow_class, audience, 1))
+
+
+def reconcile_counters():
+    """
+    Recount the inbox counters of every user, and drop the queue counters.
+
+    Counters are written under a new version, so the ones of users with no
+    assigned tasks left are counted again on the next read. Return the
+    number of counters written.
+    """
+    from .models import AbstractTask
+
+    version = uuid.uuid4().hex
+    counters = {}
+    for task_class in apps.get_models():
+        if not issubclass(task_class, AbstractTask):
+            continue
+        if task_class._meta.get_field("status").model is not task_class:
+            continue  # the rows are counted in the parent table
+
+        assigned = (
+            task_class._default_manager.filter(
+                status=STATUS.ASSIGNED, owner__isnull=False
+            )
+            .order_by()
+            .values_list("process__flow_class", "owner")
+            .annotate(count=Count("pk"))
+        )
+        for flow_class, owner_pk, count in assigned:
+            if flow_class is None:
+                continue
+            key = _inbox_key(version, flow_class, owner_pk)
+            counters[key] = counters.get(key, 0) + count
+
+    cache.set_many(counters, _settings().TASK_COUNTERS_TIMEOUT)
+    cache.set(VERSION_KEY, version, None)
+    return len(counters)
@@ -0,0 +1,89 @@
+"""Cron expressions for ``flow.StartTimer`` schedules."""
+
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+# a schedule never matching within this many days, like "0 0 30 2 *",
+# is rejected
+MAX_LOOKAHEAD_DAYS = 366 * 8
+
+
+def _parse_field(value, low, high):
+    values = set()
+    for part in value.split(","):
+        part, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = [int(bound) for bound in part.split("-", 1)]
+        else:
+            start = int(part)
+            end = high if step != 1 else start
+        if step < 1 or not low <= start <= end <= high:
+            raise ValueError(f"Invalid cron field {value!r}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+class CronSchedule(object):
+    """
+    Standard five fields cron expression::
+
+        minute hour day-of-month month day-of-week
+
+    Fields accept ``*``, numbers, ``a-b`` ranges, ``/step`` and comma
+    separated lists. Day of week is ``0-7``, both 0 and 7 are Sunday;
+    month and weekday names are not supported. As in cron, when both day
+    fields are restricted, a day matching either of them is due.
+
+    Moments are matched in the current timezone.
+    """
+
+    def __init__(self, expression):  # noqa D102
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression {expression!r} should have five fields")
+        self.expression = expression
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = set(_parse_field(fields[2], 1, 31))
+        self.months = set(_parse_field(fields[3], 1, 12))
+        self.weekdays = {day % 7 for day in _parse_field(fields[4], 0, 7)}
+        self._days_restricted = fields[2] != "*"
+        self._weekdays_restricted = fields[4] != "*"
+        self.next_after(datetime(2000, 1, 1))
+
+    def __str__(self):
+        return self.expression
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        day_matches = day.day in self.days
+        weekday_matches = day.isoweekday() % 7 in self.weekdays
+        if self._days_restricted and self._weekdays_restricted:
+            return day_matches or weekday_matches
+        return day_matches and weekday_matches
+
+    def next_after(self, moment):
+        """First moment matching the expression, strictly after ``moment``."""
+        aware = timezone.is_aware(moment)
+        if aware:
+            tzinfo = timezone.get_current_timezone()
+            moment = timezone.make_naive(moment, tzinfo)
+        start = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+        day = start.date()
+        for _ in range(MAX_LOOKAHEAD_DAYS):
+            if self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = datetime(day.year, day.month, day.day, hour, minute)
+                        if candidate >= start:
+                            if aware:
+                                return timezone.make_aware(candidate, tzinfo)
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
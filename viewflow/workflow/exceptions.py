@@ -4,3 +4,7 @@ class FlowRuntimeError(Exception):
 
 class FlowLockFailed(Exception):
     """Flow lock failed."""
+
+
+class FlowLockConflict(FlowLockFailed):
+    """Flow process was updated concurrently, the lock scope is rolled back."""
@@ -161,3 +161,27 @@ class TokenField(models.CharField):
 
     def get_prep_value(self, value):
         return value.token
+
+
+class TokenKeyField(models.CharField):
+    """Sortable :attr:`Token.key` of the model token, updated on save."""
+
+    def __init__(self, *args, token_field="token", **kwargs):
+        kwargs.setdefault("max_length", 255)
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("null", True)
+        kwargs.setdefault("editable", False)
+        self.token_field = token_field
+        super(TokenKeyField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):  # noqa D102
+        name, path, args, kwargs = super(TokenKeyField, self).deconstruct()
+        if self.token_field != "token":
+            kwargs["token_field"] = self.token_field
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):  # noqa D102
+        token = getattr(model_instance, self.token_field)
+        value = token.key if token is not None else None
+        setattr(model_instance, self.attname, value)
+        return value
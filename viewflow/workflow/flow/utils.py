@@ -5,6 +5,7 @@ from django.db import transaction
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from viewflow.fsm import TransitionNotAllowed
+from viewflow.workflow.lock import run_locked
 
 
 def wrap_task_view(self, origin_view, permission=None):
@@ -34,8 +35,12 @@ def wrap_task_view(self, origin_view, permission=None):
 
         try:
             if request.method == "POST":
-                with self.flow_class.lock(process_pk), transaction.atomic():
-                    return call_with_activation()
+                return run_locked(
+                    self.flow_class,
+                    process_pk,
+                    transaction.atomic()(call_with_activation),
+                    node=self,
+                )
             else:
                 return call_with_activation()
         except TransitionNotAllowed as e:
@@ -88,8 +93,12 @@ def wrap_view(flow_task, origin_view):
 
         try:
             if request.method == "POST":
-                with flow_task.flow_class.lock(process_pk), transaction.atomic():
-                    return call_with_activation()
+                return run_locked(
+                    flow_task.flow_class,
+                    process_pk,
+                    transaction.atomic()(call_with_activation),
+                    node=flow_task,
+                )
             else:
                 return call_with_activation()
         except TransitionNotAllowed as e:
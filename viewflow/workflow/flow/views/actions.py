@@ -1,3 +1,5 @@
+from collections import defaultdict
+
 from django import forms
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
@@ -230,61 +232,109 @@ class CancelProcessView(mixins.ProcessViewTemplateNames, generic.DetailView):
             return self.get(request, *args, **kwargs)
 
 
-class BulkUnassignTasksActionView(BaseBulkActionView):
+def _bulk_task_activations(tasks, action):
+    """Call ``action(activation)`` for each of the tasks.
+
+    The processes of each flow are locked at once with ``Flow.lock_many``.
+    Returns the number of tasks skipped, because their process is locked
+    by somebody else."""
+    tasks_by_flow = defaultdict(list)
+    for task in tasks:
+        tasks_by_flow[task.flow_task.flow_class].append(task)
+
+    skipped = 0
+    for flow_class in sorted(
+        tasks_by_flow, key=lambda flow_class: flow_class.instance.flow_label
+    ):
+        flow_tasks = tasks_by_flow[flow_class]
+        with flow_class.lock_many([task.process_id for task in flow_tasks]) as locked:
+            locked = set(locked)
+            for task in flow_tasks:
+                if task.process_id not in locked:
+                    skipped += 1
+                    continue
+                with task.activation() as activation:
+                    action(activation)
+    return skipped
+
+
+class BaseBulkTasksActionView(BaseBulkActionView):
+    def message_skipped(self, skipped):
+        if skipped:
+            messages.add_message(
+                self.request,
+                messages.WARNING,
+                _("%(count)s task(s) skipped, their processes are busy.")
+                % {"count": skipped},
+                fail_silently=True,
+            )
+
+
+class BulkUnassignTasksActionView(BaseBulkTasksActionView):
     model = Task
     template_name = "viewflow/workflow/tasks_unassign.html"
     template_name_suffix = "s_unassign"
 
     def form_valid(self, form):
         user = self.request.user
+
+        def unassign(activation):
+            # The queryset is the unscoped Task table filtered by the
+            # submitted pks, and activation.unassign() does not enforce
+            # its declared permission. Re-check per task against the
+            # task's own flow node, exactly as the single-task view does.
+            can_unassign = getattr(activation.flow_task, "can_unassign", None)
+            if not callable(can_unassign) or not can_unassign(user, activation.task):
+                raise PermissionDenied
+            activation.unassign()
+
+        tasks = list(self.get_queryset())
         with transaction.atomic():
-            for task in self.get_queryset():
-                with task.activation() as activation:
-                    # The queryset is the unscoped Task table filtered by the
-                    # submitted pks, and activation.unassign() does not enforce
-                    # its declared permission. Re-check per task against the
-                    # task's own flow node, exactly as the single-task view does.
-                    can_unassign = getattr(task.flow_task, "can_unassign", None)
-                    if not callable(can_unassign) or not can_unassign(
-                        user, activation.task
-                    ):
-                        raise PermissionDenied
-                    activation.unassign()
-        self.message_user()
+            skipped = _bulk_task_activations(tasks, unassign)
+        self.message_user(len(tasks) - skipped)
+        self.message_skipped(skipped)
         return HttpResponseRedirect(self.get_success_url())
 
-    def message_user(self):
-        message = "Tasks was unassigned"
-        messages.add_message(
-            self.request, messages.SUCCESS, message, fail_silently=True
-        )
+    def message_user(self, count):
+        if count:
+            messages.add_message(
+                self.request,
+                messages.SUCCESS,
+                _("%(count)s task(s) unassigned.") % {"count": count},
+                fail_silently=True,
+            )
 
 
-class BulkAssignTasksActionView(BaseBulkActionView):
+class BulkAssignTasksActionView(BaseBulkTasksActionView):
     model = Task
     template_name = "viewflow/workflow/tasks_assign.html"
     template_name_suffix = "s_assign"
 
     def form_valid(self, form):
         user = self.request.user
+
+        def assign(activation):
+            # The queryset is the unscoped Task table filtered by the
+            # submitted pks, and activation.assign() does not enforce
+            # its declared permission. Re-check per task against the
+            # task's own flow node, exactly as the single-task view does.
+            can_assign = getattr(activation.flow_task, "can_assign", None)
+            if not callable(can_assign) or not can_assign(user, activation.task):
+                raise PermissionDenied
+            activation.assign(user)
+
+        tasks = list(self.get_queryset())
         with transaction.atomic():
-            for task in self.get_queryset():
-                with task.activation() as activation:
-                    # The queryset is the unscoped Task table filtered by the
-                    # submitted pks, and activation.assign() does not enforce
-                    # its declared permission. Re-check per task against the
-                    # task's own flow node, exactly as the single-task view does.
-                    can_assign = getattr(task.flow_task, "can_assign", None)
-                    if not callable(can_assign) or not can_assign(
-                        user, activation.task
-                    ):
-                        raise PermissionDenied
-                    activation.assign(user)
-        self.message_user()
+            skipped = _bulk_task_activations(tasks, assign)
+        self.message_user(len(tasks) - skipped)
+        self.message_skipped(skipped)
         return HttpResponseRedirect(self.get_success_url())
 
-    def message_user(self):
-        message = "Tasks was assigned"
-        messages.add_message(
-            self.request, messages.SUCCESS, message, fail_silently=True
-        )
+    def message_user(self, count):
+        if count:
+            messages.add_message(
+                self.request,
+                messages.SUCCESS,
+                _("%(count)s task(s) assigned.") % {"count": count},
+                fail_silently=True,
+            )
@@ -1,12 +1,13 @@
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Q
+from django.db.models import Count, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils.decorators import method_decorator
 from django.utils.safestring import mark_safe
 from django.utils.translation import gettext_lazy as _
 from django.views import generic
 
-from viewflow.views import ListModelView
+from viewflow.views import KeysetPaginator, ListModelView
 from viewflow.utils import viewprop, has_object_perm
 from viewflow.workflow import chart, STATUS
 from viewflow.workflow.fields import get_task_ref
@@ -104,6 +105,7 @@ class DashboardTaskListView(
 
     columns = ("task_id", "flow_task", "process_summary", "created", "owner")
     filterset_class = filters.DashboardTaskListViewFilter
+    paginator_class = KeysetPaginator
 
     def task_id(self, task):
         task_url = task.flow_task.reverse("index", args=[task.process_id, task.pk])
@@ -139,6 +141,7 @@ class DashboardProcessListView(
     columns = ("process_id", "brief", "created", "finished", "active_tasks")
     object_link_columns = ("pk", "brief")
     filterset_class = filters.DashboardProcessListViewFilter
+    paginator_class = KeysetPaginator
 
     def process_id(self, process):
         process_url = self.request.resolver_match.flow_viewset.reverse(
@@ -156,6 +159,18 @@ class DashboardProcessListView(
     def get_queryset(self):
         """Filtered process list."""
         queryset = super().get_queryset()
+        # counted only for processes started before the counter existed
+        counted_active_tasks = (
+            self.flow_class.task_class._default_manager.filter(
+                process=OuterRef("pk"), finished__isnull=True
+            )
+            .order_by()
+            .values("process")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
         return queryset.filter(flow_class=self.flow_class).annotate(
-            active_tasks_count=Count("task", filter=Q(task__finished__isnull=True))
+            active_tasks_count=Coalesce(
+                "active_tasks", Subquery(counted_active_tasks), Value(0)
+            )
         )
@@ -2,7 +2,7 @@ from django.utils.safestring import mark_safe
 from django.utils.timesince import timesince
 from django.utils.translation import gettext_lazy as _
 
-from viewflow.views import ListModelView, Action
+from viewflow.views import Action, KeysetPaginator, ListModelView
 from viewflow.utils import viewprop
 from viewflow.workflow.status import STATUS
 from viewflow.workflow.models import Task
@@ -22,6 +22,7 @@ class FlowInboxListView(
 
     columns = ("task_id", "task_title", "brief", "created")
     filterset_class = filters.FlowUserTaskListFilter
+    paginator_class = KeysetPaginator
 
     def task_id(self, task):
         task_url = task.flow_task.reverse("index", args=[task.process_id, task.pk])
@@ -59,6 +60,7 @@ class FlowQueueListView(
 
     columns = ("task_id", "task_title", "brief", "created")
     filterset_class = filters.FlowUserTaskListFilter
+    paginator_class = KeysetPaginator
     flow_class = None
     template_filename = "process_tasks_list.html"
     title = _("Queue")
@@ -99,6 +101,7 @@ class FlowArchiveListView(
 
     columns = ("task_id", "brief", "created", "finished", "process_summary")
     filterset_class = filters.FlowArchiveListFilter
+    paginator_class = KeysetPaginator
     flow_class = None
     template_filename = "process_tasks_list.html"
     title = _("Archive")
@@ -132,6 +135,7 @@ class FlowArchiveListView(
 class WorkflowTaskListView(mixins.StoreRequestPathMixin, ListModelView):
     flow_classes = None
     model = Task
+    paginator_class = KeysetPaginator
     template_name = "viewflow/workflow/workflow_tasks_list.html"
 
     def task_id(self, task):
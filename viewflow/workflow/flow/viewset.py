@@ -6,6 +6,7 @@ from django.utils.translation import gettext_lazy as _
 from viewflow import viewprop
 from viewflow.utils import DEFAULT
 from viewflow.urls import Application, AppMenuMixin, Viewset, ViewsetMeta
+from .. import counters
 from ..status import STATUS
 from ..models import Task
 from . import views
@@ -376,6 +377,7 @@ class FlowAppViewset(BaseFlowViewsMixin, BulkActionsViewsMixin, Application):
         return {
             "user_inbox": inbox,
             "user_queue": queue,
+            **counters.menu_counts([self._flow_class], request.user, inbox, queue),
         }
 
 
@@ -537,4 +539,5 @@ class WorkflowAppViewset(BulkActionsViewsMixin, Application):
         return {
             "user_inbox": inbox,
             "user_queue": queue,
+            **counters.menu_counts(self.flow_classes, request.user, inbox, queue),
         }
@@ -2,17 +2,23 @@
 
 from __future__ import unicode_literals
 
+import copy
+import hashlib
+import math
 import threading
 import time
 import random
 import uuid
-from contextlib import contextmanager
+from contextlib import ExitStack, contextmanager
+from functools import partial
 
 from django.core.cache import cache as default_cache
-from django.db import transaction, DatabaseError
-
-from .exceptions import FlowLockFailed
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router, transaction, DatabaseError
+from django.db.models import F
 
+from .exceptions import FlowLockConflict, FlowLockFailed
+from .metrics import lock_metrics
 
 _deferred = threading.local()
 
@@ -35,16 +41,328 @@ def after_lock_released(callback):
         queue.append(callback)
 
 
+class UnitOfWork(object):
+    """
+    Identity map of the Process and Task rows touched within a lock scope.
+
+    Saves of the instances loaded or written within the scope are deferred,
+    and each instance is written once, with only the fields changed since,
+    see :class:`viewflow.workflow.models.TrackedFieldsMixin`. Pending saves
+    are flushed before any other statement except an ``INSERT`` or a
+    savepoint runs on the flow database connection, so queries always see
+    them, and when a lock scope exits.
+
+    Savepoints don't flush, the pending values are kept aside instead. A
+    rollback to a savepoint writes the values the instances had when it
+    was created, and drops the saves made after it.
+    """
+
+    def __init__(self, using):  # noqa D102
+        self.using = using
+        self.instances = {}
+        self.tracked = {}
+        self.dirty = {}
+        self.savepoints = []
+        self.flushing = False
+
+    @staticmethod
+    def _key(model, pk):
+        return model._meta.concrete_model, pk
+
+    def get(self, model, pk):
+        """Shared instance of the row, if any."""
+        return self.instances.get(self._key(model, pk))
+
+    def register(self, instance):
+        """Return the shared instance of the row, registering ``instance``
+        if the row was not seen within the scope yet."""
+        if instance.pk is None:
+            return instance
+        shared = self.instances.setdefault(self._key(instance, instance.pk), instance)
+        if shared is instance and getattr(instance, "_loaded_state", None) is not None:
+            # loaded or saved before the scope, in sync with the row
+            self.tracked.setdefault(id(instance), instance)
+        return shared
+
+    def track(self, instance):
+        """Accept deferred saves of an instance just loaded or written."""
+        self.register(instance)
+        self.tracked[id(instance)] = instance
+        self.dirty.pop(id(instance), None)
+
+    def defer_save(self, instance):
+        """Mark a tracked instance dirty instead of saving it right away."""
+        if self.flushing or id(instance) not in self.tracked:
+            return False
+        self.dirty[id(instance)] = instance
+        return True
+
+    def flush(self):
+        """Save every dirty instance."""
+        if self.flushing:
+            return
+        self.flushing = True
+        try:
+            while self.dirty:
+                instance = self.dirty.pop(next(iter(self.dirty)))
+                instance.save()
+        finally:
+            self.flushing = False
+
+    @staticmethod
+    def _values(instance):
+        return {
+            field.attname: copy.deepcopy(instance.__dict__[field.attname])
+            for field in instance._meta.concrete_fields
+            if field.attname in instance.__dict__
+        }
+
+    def _savepoint(self, name):
+        self.savepoints.append(
+            (
+                name,
+                {
+                    key: (instance, self._values(instance))
+                    for key, instance in self.dirty.items()
+                },
+            )
+        )
+
+    def _release_savepoint(self, name):
+        for index, (savepoint, _) in enumerate(self.savepoints):
+            if savepoint == name:
+                del self.savepoints[index:]
+                return
+
+    def _rollback_savepoint(self, name):
+        for index, (savepoint, dirty) in enumerate(self.savepoints):
+            if savepoint == name:
+                del self.savepoints[index + 1 :]
+                break
+        else:
+            return
+
+        # the rows are left as they were at the savepoint, and the
+        # instances keep their values, as after a save rolled back
+        rolled_back, self.dirty = self.dirty, {}
+        for key, instance in rolled_back.items():
+            if key in dirty:
+                values = instance.__dict__.copy()
+                instance.__dict__.update(dirty[key][1])
+                self.dirty[key] = instance
+                self.flush()
+                instance.__dict__.update(values)
+            instance._track_fields()
+
+    def _autoflush(self, execute, sql, params, many, context):
+        statement = sql.lstrip()[:20].upper()
+        if statement.startswith(("SAVEPOINT", "RELEASE", "ROLLBACK TO")):
+            result = execute(sql, params, many, context)
+            name = sql.split()[-1]
+            if statement.startswith("SAVEPOINT"):
+                self._savepoint(name)
+            elif statement.startswith("RELEASE"):
+                self._release_savepoint(name)
+            else:
+                self._rollback_savepoint(name)
+            return result
+        if self.dirty and not self.flushing and not statement.startswith("INSERT"):
+            self.flush()
+        return execute(sql, params, many, context)
+
+
+def current_unit_of_work():
+    """The :class:`UnitOfWork` of the lock scope held by this thread, if any."""
+    return getattr(_deferred, "unit_of_work", None)
+
+
+def defer_save(instance):
+    """Defer ``instance.save()`` to the current unit of work, if any."""
+    unit_of_work = current_unit_of_work()
+    return unit_of_work is not None and unit_of_work.defer_save(instance)
+
+
+def track(instance):
+    """Let the current unit of work know ``instance`` was loaded or written."""
+    unit_of_work = current_unit_of_work()
+    if unit_of_work is not None:
+        unit_of_work.track(instance)
+
+
+@contextmanager
+def _unit_of_work_scope(flow_class):
+    unit_of_work = UnitOfWork(router.db_for_write(flow_class.process_class))
+    _deferred.unit_of_work = unit_of_work
+    try:
+        with connections[unit_of_work.using].execute_wrapper(unit_of_work._autoflush):
+            yield
+            unit_of_work.flush()
+    finally:
+        _deferred.unit_of_work = None
+
+
+def defer_active_tasks(process_class, process_pk, delta):
+    """Add ``delta`` to the ``active_tasks`` change of the process, written
+    when the outermost lock scope exits. False outside of a lock scope."""
+    pending = getattr(_deferred, "active_tasks", None)
+    if pending is None:
+        return False
+    key = (process_class._meta.concrete_model, process_pk)
+    pending[key] = pending.get(key, 0) + delta
+    return True
+
+
+def pending_active_tasks(process_class, process_pk):
+    """The ``active_tasks`` change of the process not written yet."""
+    pending = getattr(_deferred, "active_tasks", None) or {}
+    return pending.get((process_class._meta.concrete_model, process_pk), 0)
+
+
+@contextmanager
+def _active_tasks_scope(outermost):
+    """Net the ``active_tasks`` changes of each process within the scope,
+    a task created and finished in it is never written, and write the
+    rest with one ``UPDATE`` per process before the lock is released."""
+    if not outermost:
+        yield
+        return
+    _deferred.active_tasks = {}
+    try:
+        yield
+        pending, _deferred.active_tasks = _deferred.active_tasks, None
+        for (process_class, process_pk), delta in pending.items():
+            if delta:
+                process_class._default_manager.filter(
+                    pk=process_pk, active_tasks__isnull=False
+                ).update(active_tasks=F("active_tasks") + delta)
+    finally:
+        _deferred.active_tasks = None
+
+
+def record_lock_attempt():
+    """Count a try to take a lock, for the lock metrics of the current scope.
+
+    Called by lock implementations each time they try to take the lock."""
+    if getattr(_deferred, "lock_attempts", None) is not None:
+        _deferred.lock_attempts += 1
+
+
+@contextmanager
+def _measured_lock(lock_impl, flow_class, process_pk, node):
+    if not lock_metrics.enabled:
+        with lock_impl(flow_class, process_pk):
+            yield
+        return
+
+    _deferred.lock_attempts = 0
+    started = time.perf_counter()
+    acquired = None
+    try:
+        with lock_impl(flow_class, process_pk):
+            acquired = time.perf_counter()
+            lock_metrics.record_acquired(
+                flow_class,
+                node,
+                wait=acquired - started,
+                attempts=max(_deferred.lock_attempts, 1),
+            )
+            _deferred.lock_attempts = None
+            yield
+    except FlowLockFailed:
+        if acquired is None:
+            lock_metrics.record_failed(
+                flow_class,
+                node,
+                wait=time.perf_counter() - started,
+                attempts=max(_deferred.lock_attempts, 1),
+            )
+        raise
+    finally:
+        _deferred.lock_attempts = None
+        if acquired is not None:
+            lock_metrics.record_released(
+                flow_class, node, hold=time.perf_counter() - acquired
+            )
+
+
+# process-local locks in front of the flow lock, see lock_scope
+_stripes = []
+_stripes_lock = threading.Lock()
+
+
+def _lock_stripe(flow_class, process_pk):
+    from viewflow import conf
+
+    count = conf.settings.LOCK_STRIPES
+    if not count:
+        return None
+    if len(_stripes) != count:
+        with _stripes_lock:
+            if len(_stripes) != count:
+                _stripes[:] = [threading.Lock() for _ in range(count)]
+    return _stripes[hash((flow_class.instance.flow_label, process_pk)) % count]
+
+
+def _striped_lock(lock_impl, stripe):
+    @contextmanager
+    def acquire(flow_class, process_pk):
+        from viewflow import conf
+
+        if not stripe.acquire(timeout=conf.settings.LOCK_STRIPE_TIMEOUT):
+            raise FlowLockFailed("Lock failed for {}".format(flow_class))
+        try:
+            with lock_impl(flow_class, process_pk):
+                yield
+        finally:
+            stripe.release()
+
+    return acquire
+
+
 @contextmanager
-def lock_scope(lock_impl, flow_class, process_pk):
+def lock_scope(lock_impl, flow_class, process_pk, unit_of_work=False, node=None):
     """Acquire ``lock_impl`` and, once the outermost lock in this thread is
-    released, run the callbacks queued via :func:`after_lock_released`."""
+    released, run the callbacks queued via :func:`after_lock_released`.
+
+    With ``unit_of_work`` the outermost scope collects the Process and Task
+    saves into a :class:`UnitOfWork`. Pending rows are flushed before each
+    nested scope exits and before the outermost lock is released.
+
+    With the ``LOCK_METRICS`` setting enabled, the lock wait, attempts,
+    hold time and failures are recorded for the flow and ``node``, see
+    :mod:`viewflow.workflow.metrics`.
+
+    With the ``LOCK_STRIPES`` setting, the outermost scope also holds one
+    of that many process-local locks, picked by the flow and process pk.
+    Threads of a worker contending for the same process queue there for
+    up to ``LOCK_STRIPE_TIMEOUT`` seconds, instead of retrying against
+    the database or the cache. Nested scopes take no local lock, so a
+    thread waits for one only while holding no other lock."""
     outermost = getattr(_deferred, "queue", None) is None
     if outermost:
         _deferred.queue = []
+        stripe = _lock_stripe(flow_class, process_pk)
+        if stripe is not None:
+            lock_impl = _striped_lock(lock_impl, stripe)
+    elif (flow_class.instance.flow_label, process_pk) in _held_by_lock_many():
+        lock_impl = _held_lock
+    queued = len(_deferred.queue)
     try:
-        with lock_impl(flow_class, process_pk):
-            yield
+        with _measured_lock(
+            lock_impl, flow_class, process_pk, node
+        ), _active_tasks_scope(outermost):
+            if outermost and unit_of_work:
+                with _unit_of_work_scope(flow_class):
+                    yield
+            else:
+                yield
+                if current_unit_of_work() is not None:
+                    current_unit_of_work().flush()
+    except FlowLockConflict:
+        # the scope is rolled back and run again by run_locked, that
+        # queues its callbacks anew
+        del _deferred.queue[queued:]
+        raise
     finally:
         if outermost:
             callbacks = _deferred.queue
@@ -56,6 +374,132 @@ def lock_scope(lock_impl, flow_class, process_pk):
                 callback()
 
 
+def run_locked(flow_class, process_pk, func, node=None):
+    """Call ``func`` under ``flow_class.lock(process_pk)``.
+
+    When the lock implementation reports a concurrent update of the process
+    with :class:`FlowLockConflict`, like :class:`OptimisticLock` does,
+    the rolled back ``func`` is called again, up to ``lock_impl.retries``
+    times. ``func`` should load the rows it works on by itself."""
+    retries = getattr(flow_class.lock_impl, "retries", 0)
+    for attempt in range(retries + 1):
+        try:
+            with flow_class.lock(process_pk, node=node):
+                return func()
+        except FlowLockConflict:
+            if attempt == retries:
+                raise
+
+
+def _held_by_lock_many():
+    held = getattr(_deferred, "held", None)
+    if held is None:
+        held = _deferred.held = set()
+    return held
+
+
+@contextmanager
+def _held_lock(flow_class, process_pk):
+    """Process locked by an enclosing :func:`lock_many_scope`."""
+    with transaction.atomic(using=router.db_for_write(flow_class.process_class)):
+        yield
+
+
+@contextmanager
+def _lock_each(lock_impl, flow_class, process_pks):
+    """Take the locks one by one, for lock implementations without
+    ``lock_many``. Taken processes are skipped."""
+    with ExitStack() as stack:
+        acquired = []
+        for process_pk in process_pks:
+            try:
+                stack.enter_context(lock_impl(flow_class, process_pk))
+            except FlowLockFailed:
+                continue
+            acquired.append(process_pk)
+        yield acquired
+
+
+@contextmanager
+def lock_many_scope(lock_impl, flow_class, process_pks, unit_of_work=False):
+    """Lock a batch of processes at once, skipping the taken ones.
+
+    Yields the sorted list of locked process pks. ``Flow.lock()`` scopes
+    nested inside, like ``task.activation()``, reuse these locks. Lock
+    implementations may provide a ``lock_many(flow_class, process_pks)``
+    context manager taking the locks in a single statement, otherwise the
+    locks are taken one by one, in the pk order."""
+    process_pks = sorted(set(process_pks))
+    outermost = getattr(_deferred, "queue", None) is None
+    if outermost:
+        _deferred.queue = []
+    lock_many = getattr(lock_impl, "lock_many", None)
+    if lock_many is None:
+        lock_many = partial(_lock_each, lock_impl)
+    held = _held_by_lock_many()
+    keys = []
+    try:
+        with lock_many(flow_class, process_pks) as acquired, _active_tasks_scope(
+            outermost
+        ):
+            keys = [
+                (flow_class.instance.flow_label, process_pk)
+                for process_pk in acquired
+                if (flow_class.instance.flow_label, process_pk) not in held
+            ]
+            held.update(keys)
+            if outermost and unit_of_work:
+                with _unit_of_work_scope(flow_class):
+                    yield acquired
+            else:
+                yield acquired
+                if current_unit_of_work() is not None:
+                    current_unit_of_work().flush()
+    finally:
+        held.difference_update(keys)
+        if outermost:
+            callbacks = _deferred.queue
+            _deferred.queue = None
+            for callback in callbacks:
+                callback()
+
+
+@contextmanager
+def database_lock_timeout(using, timeout):
+    """Bound the time statements wait for row and advisory locks to
+    ``timeout`` seconds, on PostgreSQL (``lock_timeout``) and MySQL
+    (``innodb_lock_wait_timeout``, rounded up to whole seconds).
+
+    Yields False on other databases, where lock waits are left unbounded.
+    Runs inside a transaction; wrap the waiting statement in a savepoint,
+    so the setting could be restored after it fails.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT current_setting('lock_timeout'),"
+                " set_config('lock_timeout', %s, true)",
+                ["{}ms".format(max(int(timeout * 1000), 1))],
+            )
+            restore = "SELECT set_config('lock_timeout', %s, true)"
+        elif connection.vendor == "mysql":
+            cursor.execute("SELECT @@SESSION.innodb_lock_wait_timeout")
+            restore = "SET SESSION innodb_lock_wait_timeout = %s"
+        else:
+            yield False
+            return
+        previous = cursor.fetchone()[0]
+        if connection.vendor == "mysql":
+            cursor.execute(restore, [max(math.ceil(timeout), 1)])
+
+    try:
+        yield True
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(restore, [previous])
+
+
 class NoLock(object):
     """
     No pessimistic locking, just execute flow task in transaction.
@@ -68,21 +512,46 @@ class NoLock(object):
         with transaction.atomic():
             yield
 
+    @contextmanager
+    def lock_many(self, flow_class, process_pks):  # noqa D102
+        with transaction.atomic():
+            yield list(process_pks)
+
 
 class SelectForUpdateLock(object):
     """
     Database lock uses `select ... for update` on the process instance row.
 
     Recommended to use with PostgreSQL.
+
+    By default, a taken lock is retried ``attempts`` times with growing
+    sleeps in between. With a ``timeout``, the wait is bounded by that many
+    seconds in total instead: PostgreSQL and MySQL block in the database
+    until the row is released or the timeout expires, see
+    :func:`database_lock_timeout`; other databases retry with short sleeps
+    until the timeout expires.
+
+    Example::
+
+        class MyFlow(Flow):
+            lock_impl = SelectForUpdateLock(timeout=5)
+
     """
 
-    def __init__(self, nowait=True, attempts=5):
+    def __init__(self, nowait=True, attempts=5, timeout=None):
         self.nowait = nowait
         self.attempts = attempts
+        self.timeout = timeout
 
     @contextmanager
     def __call__(self, flow_class, process_pk):
+        if self.timeout is not None:
+            with self._wait(flow_class, process_pk):
+                yield
+            return
+
         for i in range(self.attempts):
+            record_lock_attempt()
             with transaction.atomic():
                 try:
                     process = flow_class.process_class._default_manager.filter(
@@ -99,6 +568,301 @@ class SelectForUpdateLock(object):
                     yield
                     break
 
+    @contextmanager
+    def lock_many(self, flow_class, process_pks):
+        """Lock the process rows with a single ``SELECT ... ORDER BY pk FOR
+        UPDATE SKIP LOCKED``, or wait for them in the pk order where
+        ``SKIP LOCKED`` is not supported."""
+        using = router.db_for_write(flow_class.process_class)
+        features = connections[using].features
+        processes = (
+            flow_class.process_class._default_manager.using(using)
+            .filter(pk__in=process_pks)
+            .order_by("pk")
+        )
+        with transaction.atomic(using=using):
+            record_lock_attempt()
+            if features.has_select_for_update_skip_locked:
+                processes = processes.select_for_update(skip_locked=True)
+            elif features.has_select_for_update:
+                processes = processes.select_for_update()
+            yield list(processes.values_list("pk", flat=True))
+
+    def _select_for_update(self, using, process, nowait):
+        record_lock_attempt()
+        try:
+            with transaction.atomic(using=using):
+                process.select_for_update(nowait=nowait).exists()
+        except DatabaseError:
+            return False
+        return True
+
+    @contextmanager
+    def _wait(self, flow_class, process_pk):
+        using = router.db_for_write(flow_class.process_class)
+        process = flow_class.process_class._default_manager.using(using).filter(
+            pk=process_pk
+        )
+        deadline = time.monotonic() + self.timeout
+
+        with transaction.atomic(using=using):
+            with database_lock_timeout(using, self.timeout) as blocking:
+                if blocking:
+                    acquired = self._select_for_update(using, process, False)
+                else:
+                    acquired = self._select_for_update(using, process, True)
+                    delay = 0.05
+                    while not acquired and time.monotonic() < deadline:
+                        time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+                        delay = min(delay * 2, 1)
+                        acquired = self._select_for_update(using, process, True)
+            if not acquired:
+                raise FlowLockFailed("Lock failed for {}".format(flow_class))
+            yield
+
+
+def advisory_lock_key(flow_class, process_pk):
+    """Signed 64-bit key of the process lock, for PostgreSQL advisory locks."""
+    digest = hashlib.blake2b(
+        "{}/{}".format(flow_class.instance.flow_label, process_pk).encode(),
+        digest_size=8,
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class AdvisoryLock(object):
+    """
+    PostgreSQL transaction-level advisory lock on the process.
+
+    Locks a 64-bit hash of the flow label and the process pk with
+    ``pg_advisory_xact_lock``, so the process row itself is left unlocked
+    and ordinary updates of it never conflict with the flow lock. The lock
+    is released when the transaction ends.
+
+    Waits for the lock inside the database up to ``timeout`` seconds,
+    through the ``lock_timeout`` setting, instead of retrying with sleeps.
+    With ``timeout=0``, ``pg_try_advisory_xact_lock`` fails right away
+    when the lock is taken.
+
+    Example::
+
+        class MyFlow(Flow):
+            lock_impl = AdvisoryLock(timeout=5)
+
+    """
+
+    def __init__(self, timeout=10, using=None):  # noqa D102
+        self.timeout = timeout
+        self.using = using
+
+    def _acquire(self, using, key):
+        record_lock_attempt()
+        if not self.timeout:
+            with connections[using].cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [key])
+                return cursor.fetchone()[0]
+
+        with database_lock_timeout(using, self.timeout):
+            try:
+                with transaction.atomic(using=using):
+                    with connections[using].cursor() as cursor:
+                        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [key])
+            except DatabaseError:
+                return False
+        return True
+
+    @contextmanager
+    def __call__(self, flow_class, process_pk):  # noqa D102
+        using = self.using or router.db_for_write(flow_class.process_class)
+        if connections[using].vendor != "postgresql":
+            raise ImproperlyConfigured("AdvisoryLock requires PostgreSQL")
+
+        with transaction.atomic(using=using):
+            if not self._acquire(using, advisory_lock_key(flow_class, process_pk)):
+                raise FlowLockFailed("Lock failed for {}".format(flow_class))
+            yield
+
+    @contextmanager
+    def lock_many(self, flow_class, process_pks):
+        """Try the locks with a single ``pg_try_advisory_xact_lock``
+        statement, in the key order, without waiting for the taken ones."""
+        using = self.using or router.db_for_write(flow_class.process_class)
+        if connections[using].vendor != "postgresql":
+            raise ImproperlyConfigured("AdvisoryLock requires PostgreSQL")
+
+        keys = {
+            advisory_lock_key(flow_class, process_pk): process_pk
+            for process_pk in process_pks
+        }
+        with transaction.atomic(using=using):
+            record_lock_attempt()
+            with connections[using].cursor() as cursor:
+                cursor.execute(
+                    "SELECT key FROM unnest(%s::bigint[]) AS key"
+                    " WHERE pg_try_advisory_xact_lock(key)",
+                    [sorted(keys)],
+                )
+                yield sorted(keys[key] for (key,) in cursor.fetchall())
+
+
+class OptimisticLock(object):
+    """
+    Optimistic lock on the ``version`` column of the process.
+
+    The flow runs without taking a lock. Before commit, the process version
+    read at the scope start is checked and incremented with a single
+    ``UPDATE ... WHERE version = ...``. When another activation of the
+    same process committed first, the transaction is rolled back and
+    :class:`FlowLockConflict` is raised.
+
+    Task views and ``Handle`` nodes run the scope again, up to ``retries``
+    times, see :func:`run_locked`. Callers of ``task.activation()`` and
+    ``Flow.lock()`` get the exception, like any lock failure.
+
+    Suits flows whose parallel branches rarely complete at the same time:
+    no activation waits for another, but a conflict costs a re-run.
+
+    Example::
+
+        class MyFlow(Flow):
+            lock_impl = OptimisticLock(retries=5)
+
+    """
+
+    def __init__(self, retries=5):  # noqa D102
+        self.retries = retries
+
+    @contextmanager
+    def __call__(self, flow_class, process_pk):  # noqa D102
+        using = router.db_for_write(flow_class.process_class)
+        processes = flow_class.process_class._default_manager.using(using).filter(
+            pk=process_pk
+        )
+        key = (flow_class.instance.flow_label, process_pk)
+        held = getattr(_deferred, "optimistic_versions", None)
+        if held is None:
+            held = _deferred.optimistic_versions = set()
+
+        with transaction.atomic(using=using):
+            if key in held:
+                # the version is checked by the enclosing scope
+                yield
+                return
+
+            record_lock_attempt()
+            version = processes.values_list("version", flat=True).first()
+            held.add(key)
+            try:
+                yield
+            finally:
+                held.discard(key)
+
+            if version is not None:
+                updated = processes.filter(version=version).update(
+                    version=F("version") + 1
+                )
+                if not updated:
+                    raise FlowLockConflict(
+                        "Concurrent update of {} #{}".format(flow_class, process_pk)
+                    )
+
+
+@contextmanager
+def sqlite_busy_timeout(connection, timeout):
+    """Wait up to ``timeout`` seconds for a locked SQLite database."""
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA busy_timeout")
+        previous = cursor.fetchone()[0]
+        cursor.execute("PRAGMA busy_timeout = {:d}".format(int(timeout * 1000)))
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout = {:d}".format(previous))
+
+
+def _has_transaction_mode(connection):
+    # the SQLite transaction mode is configurable on Django 5.1+
+    return hasattr(connection, "transaction_mode")
+
+
+class SQLiteImmediateLock(object):
+    """
+    SQLite database write lock, for single server installations.
+
+    SQLite has no row locks, and ``select_for_update`` is a no-op there.
+    This lock starts the transaction with ``BEGIN IMMEDIATE``, that takes
+    the database write lock right away, so activations of all processes
+    are serialized. A taken lock is waited for up to ``timeout`` seconds
+    (``busy_timeout``). When the scope is entered within a transaction
+    already started, the write lock is taken by a no-op update of the
+    process row instead, as well as on Django before 5.1, that always
+    starts a deferred transaction.
+
+    Enable the WAL journal mode, so readers are not blocked by the writer::
+
+        DATABASES = {
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "OPTIONS": {"init_command": "PRAGMA journal_mode=WAL;"},
+                ...
+            }
+        }
+
+    Example::
+
+        class MyFlow(Flow):
+            lock_impl = SQLiteImmediateLock(timeout=30)
+
+    """
+
+    def __init__(self, timeout=30, using=None):  # noqa D102
+        self.timeout = timeout
+        self.using = using
+
+    @contextmanager
+    def __call__(self, flow_class, process_pk):  # noqa D102
+        using = self.using or router.db_for_write(flow_class.process_class)
+        connection = connections[using]
+        if connection.vendor != "sqlite":
+            raise ImproperlyConfigured("SQLiteImmediateLock requires SQLite")
+
+        record_lock_attempt()
+        with ExitStack() as stack:
+            try:
+                with sqlite_busy_timeout(connection, self.timeout):
+                    if connection.in_atomic_block or not _has_transaction_mode(
+                        connection
+                    ):
+                        stack.enter_context(transaction.atomic(using=using))
+                        flow_class.process_class._default_manager.using(using).filter(
+                            pk=process_pk
+                        ).update(version=F("version"))
+                    else:
+                        transaction_mode = connection.transaction_mode
+                        connection.transaction_mode = "IMMEDIATE"
+                        try:
+                            stack.enter_context(transaction.atomic(using=using))
+                        finally:
+                            connection.transaction_mode = transaction_mode
+            except DatabaseError:
+                raise FlowLockFailed("Lock failed for {}".format(flow_class))
+            yield
+
+    @contextmanager
+    def lock_many(self, flow_class, process_pks):
+        """The database write lock covers every process."""
+        if not process_pks:
+            yield []
+            return
+        with self(flow_class, process_pks[0]):
+            yield list(process_pks)
+
+
+# wakes up the threads of this process waiting for a CacheLock
+_cache_lock_released = threading.Condition()
+
 
 class CacheLock(object):
     """
@@ -119,41 +883,103 @@ class CacheLock(object):
 
     The example uses a different cache. The default cache
     is Django ``default`` cache configuration.
+
+    By default, a taken lock is retried ``attempts`` times with growing
+    sleeps in between. With a ``timeout``, the wait is bounded by that many
+    seconds in total instead. Threads of the same process waiting for a
+    lock are woken up as soon as it is released; locks released by other
+    processes are noticed within ``poll_interval`` seconds.
     """
 
-    def __init__(self, cache=default_cache, attempts=5, expires=120):  # noqa D102
+    def __init__(
+        self,
+        cache=default_cache,
+        attempts=5,
+        expires=120,
+        timeout=None,
+        poll_interval=0.1,
+    ):  # noqa D102
         self.cache = cache
         self.attempts = attempts
         self.expires = expires
-
-    @contextmanager
-    def __call__(self, flow_class, process_pk):  # noqa D102
-        key = "django-viewflow-lock-{}/{}".format(
-            flow_class.instance.flow_label, process_pk
-        )
-        token = str(uuid.uuid4())
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+    def _add(self, key, token):
+        record_lock_attempt()
+        return self.cache.add(key, token, self.expires)
+
+    def _acquire(self, key, token):
+        if self.timeout is not None:
+            deadline = time.monotonic() + self.timeout
+            while not self._add(key, token):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                with _cache_lock_released:
+                    _cache_lock_released.wait(min(self.poll_interval, remaining))
+            return True
 
         for i in range(self.attempts):
-            if self.cache.add(key, token, self.expires):
-                break
+            if self._add(key, token):
+                return True
             if i != self.attempts - 1:
                 sleep_time = (((i + 1) * random.random()) + 2**i) / 2.5
                 time.sleep(sleep_time)
-        else:
+        return False
+
+    def _key(self, flow_class, process_pk):
+        return "django-viewflow-lock-{}/{}".format(
+            flow_class.instance.flow_label, process_pk
+        )
+
+    def _release(self, keys, token):
+        # After `expires`, the key may already belong to another worker;
+        # deleting it unconditionally would destroy *their* lock and
+        # cascade the mutual-exclusion loss. Ownership-guarded release
+        # (best-effort -- the plain cache API has no compare-and-delete).
+        owned = [
+            key for key, value in self.cache.get_many(keys).items() if value == token
+        ]
+        if owned:
+            self.cache.delete_many(owned)
+        with _cache_lock_released:
+            _cache_lock_released.notify_all()
+
+    @contextmanager
+    def lock_many(self, flow_class, process_pks):
+        """Add the keys of the processes once each, in the pk order,
+        skipping the taken ones."""
+        token = str(uuid.uuid4())
+        keys = {}
+        try:
+            for process_pk in process_pks:
+                key = self._key(flow_class, process_pk)
+                if self._add(key, token):
+                    keys[process_pk] = key
+            with transaction.atomic():
+                yield list(keys)
+        finally:
+            self._release(list(keys.values()), token)
+
+    @contextmanager
+    def __call__(self, flow_class, process_pk):  # noqa D102
+        key = self._key(flow_class, process_pk)
+        token = str(uuid.uuid4())
+
+        if not self._acquire(key, token):
             raise FlowLockFailed("Lock failed for {}".format(flow_class))
 
         try:
             with transaction.atomic():
                 yield
         finally:
-            # After `expires`, the key may already belong to another worker;
-            # deleting it unconditionally would destroy *their* lock and
-            # cascade the mutual-exclusion loss. Ownership-guarded release
-            # (best-effort -- the plain cache API has no compare-and-delete).
-            if self.cache.get(key) == token:
-                self.cache.delete(key)
+            self._release([key], token)
 
 
 no_lock = NoLock()
 cache_lock = CacheLock()
 select_for_update_lock = SelectForUpdateLock()
+advisory_lock = AdvisoryLock()
+optimistic_lock = OptimisticLock()
+sqlite_immediate_lock = SQLiteImmediateLock()
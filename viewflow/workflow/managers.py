@@ -1,5 +1,10 @@
+import operator
+from collections import defaultdict
+from functools import lru_cache, reduce
+from itertools import islice
+
 from django.db import models
-from django.db.models import Q, F, Value
+from django.db.models import Case, Exists, F, OuterRef, Q, Subquery, Value, When
 from django.db.models.functions import Concat
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
@@ -7,8 +12,9 @@ from django.db.models.query import QuerySet
 from django.db.models.constants import LOOKUP_SEP
 from django.db.models.query import ModelIterable
 
+from viewflow import permissions
+
 from .status import STATUS
-from .utils import get_next_process_task
 
 
 def _available_flows(flow_classes, user):
@@ -19,6 +25,7 @@ def _available_flows(flow_classes, user):
     return result
 
 
+@lru_cache(maxsize=None)
 def _get_related_path(model, base_model):
     """Return path suitable for select related for subclass."""
     ancestry = []
@@ -56,6 +63,23 @@ def _get_sub_obj(obj, query):
         return node
 
 
+def _get_cached_sub_obj(obj, query):
+    """
+    Follow the path through the instances loaded by ``select_related``.
+
+    Return a ``(found, sub_obj)`` pair, ``found`` is False when a relation
+    on the path was not loaded.
+    """
+    for rel in query.split(LOOKUP_SEP):
+        related = getattr(type(obj), rel).related
+        if not related.is_cached(obj):
+            return False, None
+        obj = related.get_cached_value(obj)
+        if obj is None:
+            return True, None
+    return True, obj
+
+
 def coerce_to_related_instance(instance, target_model):
     """Return subclass of the base object."""
     related = _get_related_path(target_model, instance.__class__)
@@ -67,16 +91,72 @@ def coerce_to_related_instance(instance, target_model):
     return instance
 
 
+def coerce_to_related_instances(instances, get_target_model):
+    """
+    Return subclasses of the base objects, ``get_target_model(instance)``
+    gives the class of each, or None to keep the instance as is.
+
+    Subclass rows not loaded by ``select_related`` are fetched with one
+    query per class, instead of a query per instance.
+    """
+    result, targets, missing = [], [], defaultdict(list)
+
+    for instance in instances:
+        target_model = get_target_model(instance)
+        if target_model is not None:
+            related = _get_related_path(target_model, instance.__class__)
+            if related:
+                found, sub_obj = _get_cached_sub_obj(instance, related)
+                if not found:
+                    missing[target_model._meta.concrete_model].append(
+                        (len(result), instance)
+                    )
+                instance = sub_obj
+        result.append(instance)
+        targets.append(target_model)
+
+    for concrete_model, rows in missing.items():
+        sub_objs = concrete_model._base_manager.using(rows[0][1]._state.db).in_bulk(
+            [instance.pk for _, instance in rows]
+        )
+        for index, instance in rows:
+            sub_obj = sub_objs.get(instance.pk)
+            if sub_obj is not None:
+                # keep the relations loaded with the base object
+                for name, value in instance._state.fields_cache.items():
+                    sub_obj._state.fields_cache.setdefault(name, value)
+            result[index] = sub_obj
+
+    for index, target_model in enumerate(targets):
+        instance = result[index]
+        if instance and target_model and not isinstance(instance, target_model):
+            # Coerce proxy classes
+            instance.__class__ = target_model
+    return result
+
+
+def _coerce_chunks(iterator, get_target_model, chunk_size):
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield from coerce_to_related_instances(chunk, get_target_model)
+
+
 class ProcessIterable(ModelIterable):
     def __iter__(self):
         base_iterator = super().__iter__()
         if getattr(self.queryset, "_coerced", False):
-            for process in base_iterator:
-                if isinstance(process, self.queryset.model):
-                    process = coerce_to_related_instance(
-                        process, process.flow_class.process_class
-                    )
-                yield process
+            model = self.queryset.model
+            yield from _coerce_chunks(
+                base_iterator,
+                lambda process: (
+                    process.flow_class.process_class
+                    if isinstance(process, model)
+                    else None
+                ),
+                self.chunk_size,
+            )
         else:
             for process in base_iterator:
                 yield process
@@ -122,17 +202,97 @@ class TaskIterable(ModelIterable):
     def __iter__(self):
         base_iterator = super().__iter__()
         if getattr(self.queryset, "_coerced", False):
-            for task in base_iterator:
-                if isinstance(task, self.queryset.model):
-                    task = coerce_to_related_instance(
-                        task, task.flow_task.flow_class.task_class
-                    )
-                yield task
+            model = self.queryset.model
+            yield from _coerce_chunks(
+                base_iterator,
+                lambda task: (
+                    task.flow_task.flow_class.task_class
+                    if isinstance(task, model)
+                    else None
+                ),
+                self.chunk_size,
+            )
         else:
             for task in base_iterator:
                 yield task
 
 
+def _object_permission_content_type():
+    """Content type of the task's ``owner_permission_obj`` as guardian has it.
+
+    The task keeps the proxy model content type of the object, guardian the
+    one of ``GUARDIAN_GET_CONTENT_TYPE``, the concrete model content type
+    by default.
+    """
+    from django.apps import apps
+    from django.contrib.contenttypes.models import ContentType
+    from django.db.models.lookups import In
+    from guardian.ctypes import get_content_type
+
+    task_content_type = OuterRef("owner_permission_content_type")
+    proxy_types = defaultdict(list)
+    for model in apps.get_models():
+        if model._meta.proxy:
+            proxy_type = ContentType.objects.get_for_model(
+                model, for_concrete_model=False
+            )
+            content_type = get_content_type(model)
+            if proxy_type != content_type:
+                proxy_types[content_type.pk].append(proxy_type.pk)
+
+    if not proxy_types:
+        return task_content_type
+    return Case(
+        *[
+            When(In(task_content_type, proxy_type_pks), then=Value(content_type_pk))
+            for content_type_pk, proxy_type_pks in proxy_types.items()
+        ],
+        default=task_content_type,
+        output_field=models.IntegerField(),
+    )
+
+
+def _object_permission_exists(user):
+    """Task owner permission granted to the user, or one of the user's
+    groups, for the task's ``owner_permission_obj`` by django-guardian."""
+    from guardian.models import GroupObjectPermission, UserObjectPermission
+
+    content_type = _object_permission_content_type()
+
+    def permission_exists(queryset):
+        return Exists(
+            queryset.filter(
+                content_type=content_type,
+                object_pk=OuterRef("owner_permission_obj_pk"),
+            )
+            .annotate(
+                permission_name=Concat(
+                    "permission__content_type__app_label",
+                    Value("."),
+                    "permission__codename",
+                    output_field=models.CharField(),
+                )
+            )
+            .filter(permission_name=OuterRef("owner_permission"))
+        )
+
+    return permission_exists(
+        UserObjectPermission.objects.filter(user=user)
+    ) | permission_exists(GroupObjectPermission.objects.filter(group__user=user))
+
+
+def _queue_permission(user):
+    """Tasks in the queue permitted for a non-superuser."""
+    has_permission = (
+        Q(owner_permission__isnull=True)
+        | Q(owner=user)
+        | Q(owner_permission__in=permissions.get_all_permissions(user))
+    )
+    if "guardian" in settings.INSTALLED_APPS:
+        has_permission |= _object_permission_exists(user)
+    return has_permission
+
+
 class TaskQuerySet(QuerySet):
     """Base manager for the Task."""
 
@@ -165,56 +325,7 @@ class TaskQuerySet(QuerySet):
             queryset = queryset.filter(process__flow_class=flow_class)
 
         if not user.is_superuser:
-            has_permission = Q(owner_permission__isnull=True) | Q(owner=user)
-
-            if "guardian" in settings.INSTALLED_APPS:
-                from guardian.models import UserObjectPermission, GroupObjectPermission
-
-                queryset = queryset.annotate(
-                    owner_permission_obj_check=Concat(
-                        F("owner_permission"),
-                        Value("_"),
-                        F("owner_permission_obj_pk"),
-                        output_field=models.CharField(),
-                    )
-                )
-
-                all_user_perms = user.get_all_permissions()
-                if hasattr(user, "_viewflow_per_object_perm_cache"):
-                    per_object_perms = user._viewflow_per_object_perm_cache
-                else:
-                    per_object_perms = {
-                        "{}.{}_{}".format(
-                            userperm.content_type.app_label,
-                            userperm.permission.codename,
-                            userperm.object_pk,
-                        )
-                        for userperm in UserObjectPermission.objects.filter(user=user)
-                    }
-
-                    per_object_perms = per_object_perms | {
-                        "{}.{}_{}".format(
-                            groupperm.content_type.app_label,
-                            groupperm.permission.codename,
-                            groupperm.object_pk,
-                        )
-                        for groupperm in GroupObjectPermission.objects.filter(
-                            group__in=user.groups.all()
-                        )
-                    }
-                    user._viewflow_per_object_perm_cache = per_object_perms
-
-                has_permission = (
-                    has_permission
-                    | Q(owner_permission__in=all_user_perms)
-                    | Q(owner_permission_obj_check__in=per_object_perms)
-                )
-            else:
-                has_permission = (
-                    Q(owner_permission__in=user.get_all_permissions()) | has_permission
-                )
-
-            queryset = queryset.filter(has_permission)
+            queryset = queryset.filter(_queue_permission(user))
 
         return queryset
 
@@ -251,37 +362,77 @@ class TaskQuerySet(QuerySet):
             owner=user, finished__isnull=False
         )
 
+    def next_tasks(self, user):
+        """
+        Tasks the user could continue with, the preferred first: assigned
+        to the user, in the user queue, jobs in progress, and failed tasks.
+        """
+        in_queue = Q(flow_task_type="HUMAN", status=STATUS.NEW)
+        if not user.is_superuser:
+            in_queue &= _queue_permission(user)
+
+        priority = Case(
+            When(owner=user, status=STATUS.ASSIGNED, then=0),
+            When(in_queue, then=1),
+            When(
+                flow_task_type="JOB",
+                status__in=[STATUS.NEW, STATUS.SCHEDULED, STATUS.STARTED],
+                then=2,
+            ),
+            When(status=STATUS.ERROR, then=3),
+            output_field=models.IntegerField(),
+        )
+        ordering = self.query.order_by or self.model._meta.ordering or ["pk"]
+        return (
+            self.alias(next_task_priority=priority)
+            .filter(next_task_priority__isnull=False)
+            .order_by("next_task_priority", *ordering)
+        )
+
     def next_user_task(self, process, user):
         """
         Lookup for the next task for a user execution.
 
-        Prefer assigned tasks first, if not, return first task from user queue
+        Prefer tasks of the process, then of its subprocesses, of the
+        parent process, and of the other subprocesses of the parent.
+        Within them, prefer assigned tasks first, then tasks from the user
+        queue, jobs and failed tasks. All in a single query.
         """
-
-        # task inside a same process
-        task = get_next_process_task(self, process, user)
-
-        # task inside subprocess
-        if task is None:
-            subprocess_task = self.filter(process__parent_task__process=process).first()
-            if subprocess_task:
-                task = get_next_process_task(self, subprocess_task.process, user)
-
-        # task inside parent process
-        if task is None and process.parent_task_id:
-            task = get_next_process_task(self, process.parent_task.process, user)
-
-        # task inside other subprocesses of parent task
-        if task is None and process.parent_task_id:
-            processes = process.__class__._default_manager.filter(
-                parent_task__process=process.parent_task.process
-            ).exclude(pk=process.pk)
-            for sub_process in processes:
-                task = get_next_process_task(self, sub_process, user)
-                if task:
-                    break
-
-        return task
+        family = [Q(process=process.pk), Q(process__parent_task__process=process.pk)]
+
+        if process.parent_task_id:
+            parent_task_model = process._meta.get_field("parent_task").related_model
+            parent_process = Subquery(
+                parent_task_model._base_manager.filter(pk=process.parent_task_id)
+                .order_by()
+                .values("process")[:1]
+            )
+            family.append(Q(process=parent_process))
+            family.append(Q(process__parent_task__process=parent_process))
+
+        ordering = self.query.order_by or self.model._meta.ordering or ["pk"]
+        return (
+            self.filter(reduce(operator.or_, family))
+            .next_tasks(user)
+            .alias(
+                process_family=Case(
+                    *[
+                        When(condition, then=rank)
+                        for rank, condition in enumerate(family)
+                    ],
+                    output_field=models.IntegerField(),
+                )
+            )
+            .order_by(
+                "process_family",
+                # subprocesses are looked up one after another
+                F("process__created").desc(),
+                "process_id",
+                "next_task_priority",
+                *ordering,
+            )
+            .first()
+        )
 
     def _chain(self, **kwargs):
         chained = super()._chain(**kwargs)
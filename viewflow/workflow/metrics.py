@@ -0,0 +1,225 @@
+"""Flow lock contention metrics.
+
+Enabled by the ``VIEWFLOW = {"LOCK_METRICS": True}`` setting. Each
+``Flow.lock()`` scope records the time spent waiting for the lock, the
+acquire attempts, the time the lock was held, and failures, per flow and
+node, into the in-process ``lock_metrics`` registry.
+
+Every ``LOCK_METRICS_EXPORT_INTERVAL`` seconds, a snapshot of the registry
+is passed to the ``LOCK_METRICS_EXPORTER`` callable. The default
+``CacheExporter`` keeps the snapshot of each process in the default cache,
+where ``./manage.py workflow_lock_metrics`` collects them.
+"""
+
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from copy import deepcopy
+
+from django.core.cache import cache as default_cache
+from django.utils.module_loading import import_string
+
+# upper bounds of histogram buckets, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60)
+
+
+class Histogram(object):
+    """Counts of observed durations per bucket."""
+
+    def __init__(self, buckets=BUCKETS):  # noqa D102
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+        }
+
+
+class LockStats(object):
+    """Lock statistics of a flow or a flow node."""
+
+    def __init__(self):  # noqa D102
+        self.acquired = 0
+        self.failed = 0
+        self.attempts = 0
+        self.wait = Histogram()
+        self.hold = Histogram()
+
+    def snapshot(self):
+        return {
+            "acquired": self.acquired,
+            "failed": self.failed,
+            "attempts": self.attempts,
+            "wait": self.wait.snapshot(),
+            "hold": self.hold.snapshot(),
+        }
+
+
+class LockMetrics(object):
+    """Thread-safe registry of lock statistics per flow label and node."""
+
+    def __init__(self):  # noqa D102
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._exported = time.monotonic()
+
+    @property
+    def enabled(self):
+        from viewflow import conf
+
+        return conf.settings.LOCK_METRICS
+
+    def _get(self, flow_class, node):
+        key = (flow_class.instance.flow_label, node.name if node is not None else "")
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = LockStats()
+        return stats
+
+    def record_acquired(self, flow_class, node, wait, attempts):
+        with self._lock:
+            stats = self._get(flow_class, node)
+            stats.acquired += 1
+            stats.attempts += attempts
+            stats.wait.observe(wait)
+
+    def record_failed(self, flow_class, node, wait, attempts):
+        with self._lock:
+            stats = self._get(flow_class, node)
+            stats.failed += 1
+            stats.attempts += attempts
+            stats.wait.observe(wait)
+        self._export_due()
+
+    def record_released(self, flow_class, node, hold):
+        with self._lock:
+            self._get(flow_class, node).hold.observe(hold)
+        self._export_due()
+
+    def snapshot(self):
+        """Statistics as ``{"<flow label>": {"<node name>": {...}}}``, with
+        an empty node name for locks taken outside of a node."""
+        with self._lock:
+            snapshot = {}
+            for (flow_label, node_name), stats in self._stats.items():
+                snapshot.setdefault(flow_label, {})[node_name] = stats.snapshot()
+            return snapshot
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def export(self):
+        """Pass a snapshot to the configured ``LOCK_METRICS_EXPORTER``."""
+        from viewflow import conf
+
+        self._exported = time.monotonic()
+        exporter = conf.settings.LOCK_METRICS_EXPORTER
+        if isinstance(exporter, str):
+            exporter = import_string(exporter)
+        exporter(self.snapshot())
+
+    def _export_due(self):
+        from viewflow import conf
+
+        interval = conf.settings.LOCK_METRICS_EXPORT_INTERVAL
+        if time.monotonic() - self._exported >= interval:
+            self.export()
+
+
+lock_metrics = LockMetrics()
+
+
+def merge_snapshots(snapshots):
+    """Sum lock statistics snapshots of several processes."""
+    merged = {}
+    for snapshot in snapshots:
+        for flow_label, nodes in snapshot.items():
+            for node_name, stats in nodes.items():
+                total = merged.setdefault(flow_label, {}).get(node_name)
+                if total is None:
+                    merged[flow_label][node_name] = deepcopy(stats)
+                    continue
+                for key in ["acquired", "failed", "attempts"]:
+                    total[key] += stats[key]
+                for key in ["wait", "hold"]:
+                    histogram = total[key]
+                    histogram["count"] += stats[key]["count"]
+                    histogram["sum"] += stats[key]["sum"]
+                    histogram["max"] = max(histogram["max"], stats[key]["max"])
+                    histogram["counts"] = [
+                        count + other
+                        for count, other in zip(
+                            histogram["counts"], stats[key]["counts"]
+                        )
+                    ]
+    return merged
+
+
+def histogram_quantile(histogram, quantile):
+    """Upper bound of the bucket holding the ``quantile`` of a histogram
+    snapshot, or the observed maximum for the overflow bucket."""
+    if not histogram["count"]:
+        return 0.0
+    rank, seen = quantile * histogram["count"], 0
+    for bound, count in zip(histogram["buckets"], histogram["counts"]):
+        seen += count
+        if seen >= rank:
+            return min(bound, histogram["max"])
+    return histogram["max"]
+
+
+class CacheExporter(object):
+    """
+    Keep the lock metrics snapshot of each process in a cache.
+
+    Use a cache shared by all workers, like memcached or Redis, to collect
+    the metrics of the whole site.
+    """
+
+    index_key = "viewflow-lock-metrics"
+
+    def __init__(self, cache=default_cache, timeout=24 * 60 * 60):  # noqa D102
+        self.cache = cache
+        self.timeout = timeout
+
+    def __call__(self, snapshot):
+        process_key = "{}/{}-{}".format(
+            self.index_key, socket.gethostname(), os.getpid()
+        )
+        self.cache.set(process_key, snapshot, self.timeout)
+        # best-effort: a concurrent update may drop a key, that is added
+        # back on the next export of its process
+        keys = set(self.cache.get(self.index_key, []))
+        if process_key not in keys:
+            keys.add(process_key)
+            self.cache.set(self.index_key, sorted(keys), self.timeout)
+
+    def collect(self):
+        """Merged snapshots of every process."""
+        keys = self.cache.get(self.index_key, [])
+        snapshots = self.cache.get_many(keys)
+        return merge_snapshots(snapshots.values())
+
+    def clear(self):
+        self.cache.delete_many(self.cache.get(self.index_key, []))
+        self.cache.delete(self.index_key)
+
+
+cache_exporter = CacheExporter()
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewflow", "0015_task_scheduled"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="pending_branches",
+            field=models.IntegerField(
+                blank=True, null=True, verbose_name="Pending branches"
+            ),
+        ),
+    ]
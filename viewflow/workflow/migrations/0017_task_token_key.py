@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:21
+
+from django.db import migrations, models
+
+import viewflow.workflow.fields
+from viewflow.workflow.token import Token
+
+
+def fill_token_key(apps, schema_editor):
+    Task = apps.get_model("viewflow", "Task")
+    db_alias = schema_editor.connection.alias
+
+    Task.objects.using(db_alias).exclude(token__contains="/").update(token_key="")
+
+    batch = []
+    split_tasks = (
+        Task.objects.using(db_alias)
+        .filter(token__contains="/")
+        .only("pk", "token")
+        .iterator(chunk_size=1000)
+    )
+    for task in split_tasks:
+        task.token_key = Token(str(task.token)).key
+        batch.append(task)
+        if len(batch) == 1000:
+            Task.objects.using(db_alias).bulk_update(batch, ["token_key"])
+            batch = []
+    if batch:
+        Task.objects.using(db_alias).bulk_update(batch, ["token_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewflow", "0016_task_pending_branches"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="token_key",
+            field=viewflow.workflow.fields.TokenKeyField(
+                blank=True,
+                editable=False,
+                max_length=255,
+                null=True,
+                verbose_name="Token key",
+            ),
+        ),
+        migrations.RunPython(fill_token_key, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["process", "token_key"], name="viewflow_ta_process_9875bf_idx"
+            ),
+        ),
+    ]
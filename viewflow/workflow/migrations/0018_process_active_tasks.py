@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewflow", "0017_task_token_key"),
+    ]
+
+    operations = [
+        # existing processes are left NULL, until recomputed with the
+        # `workflow_active_tasks` management command
+        migrations.AddField(
+            model_name="process",
+            name="active_tasks",
+            field=models.IntegerField(
+                blank=True, editable=False, null=True, verbose_name="Active tasks"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="process",
+            name="active_tasks",
+            field=models.IntegerField(
+                blank=True,
+                default=0,
+                editable=False,
+                null=True,
+                verbose_name="Active tasks",
+            ),
+        ),
+    ]
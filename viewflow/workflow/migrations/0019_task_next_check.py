@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewflow", "0018_process_active_tasks"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="next_check",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Next check"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["flow_task_type", "status", "next_check"],
+                name="viewflow_ta_flow_ta_28c27e_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+def fill_signal_name(apps, schema_editor):
+    Task = apps.get_model("viewflow", "Task")
+    db_alias = schema_editor.connection.alias
+
+    armed_tasks = (
+        Task.objects.using(db_alias)
+        .filter(flow_task_type="EVENT", status="NEW")
+        .only("pk", "flow_task")
+        .iterator(chunk_size=1000)
+    )
+    for task in armed_tasks:
+        signal_name = getattr(task.flow_task, "_signal_name", None)
+        if signal_name is not None:
+            Task.objects.using(db_alias).filter(pk=task.pk).update(
+                signal_name=signal_name
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewflow", "0019_task_next_check"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="signal_name",
+            field=models.CharField(
+                blank=True, max_length=255, null=True, verbose_name="Signal"
+            ),
+        ),
+        migrations.RunPython(fill_signal_name, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["signal_name", "status"], name="viewflow_ta_signal__625d72_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:52
+
+import viewflow.workflow.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewflow", "0020_task_signal_name"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StartTimerSchedule",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "flow_task",
+                    viewflow.workflow.fields.TaskReferenceField(
+                        max_length=255, unique=True, verbose_name="Task"
+                    ),
+                ),
+                (
+                    "next_run",
+                    models.DateTimeField(db_index=True, verbose_name="Next run"),
+                ),
+                (
+                    "last_run",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Last run"
+                    ),
+                ),
+                (
+                    "locked_until",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Locked until"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Start timer schedule",
+                "verbose_name_plural": "Start timer schedules",
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewflow", "0021_starttimerschedule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="process",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Version"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("viewflow", "0022_process_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="locked_until",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Locked until"
+            ),
+        ),
+    ]
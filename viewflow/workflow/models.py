@@ -1,22 +1,191 @@
+import copy
+import json
 from contextlib import contextmanager
-from typing import Any, List
+from typing import Any, List, Optional
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+from django.db.models.signals import class_prepared
 from django.template import Template, Context
 from django.utils import timezone
 from django.utils.encoding import force_str
 from django.utils.translation import gettext_lazy as _
 
-from .fields import FlowReferenceField, TaskReferenceField, TokenField
+from .fields import (
+    FlowReferenceField,
+    TaskReferenceField,
+    TokenField,
+    TokenKeyField,
+)
 from .managers import ProcessQuerySet, TaskQuerySet, coerce_to_related_instance
 from .token import Token
-from . import status
+from . import counters, lock, status
 
 
-class AbstractProcess(models.Model):
+def update_active_tasks(process_class, process_pk, delta):
+    """Adjust the ``active_tasks`` counter of a process, unless not computed.
+
+    Within a flow lock scope the changes are summed up, and written once
+    the scope exits, see :func:`viewflow.workflow.lock.defer_active_tasks`.
+    """
+    if lock.defer_active_tasks(process_class, process_pk, delta):
+        return
+    process_class._default_manager.filter(
+        pk=process_pk, active_tasks__isnull=False
+    ).update(active_tasks=models.F("active_tasks") + delta)
+
+
+def _json_state(field, value):
+    # compared serialized, cheaper to keep than a deep copy of the value
+    try:
+        return json.dumps(value, cls=field.encoder, sort_keys=True)
+    except (TypeError, ValueError):
+        return copy.deepcopy(value)
+
+
+# the state of a JSON value assigned before its first access
+_ASSIGNED = object()
+
+
+class _TrackedJSONAttribute(DeferredAttribute):
+    """A JSON field attribute, snapshot for the dirty check on first access."""
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        pending = instance.__dict__.get("_pending_json")
+        if pending and self.field.name in pending:
+            pending.discard(self.field.name)
+            instance._loaded_state[self.field.name] = _json_state(self.field, value)
+        return value
+
+    def __set__(self, instance, value):
+        pending = instance.__dict__.get("_pending_json")
+        if pending and self.field.name in pending:
+            pending.discard(self.field.name)
+            instance._loaded_state[self.field.name] = _ASSIGNED
+        instance.__dict__[self.field.attname] = value
+
+
+class TrackedFieldsMixin(object):
+    """
+    Track the model fields changed since the instance was loaded or saved.
+
+    A plain ``save()`` of a persisted instance writes only the changed
+    columns, or the whole row when nothing has changed. JSON values are
+    serialized on their first access after the load, so in-place changes
+    of ``data`` are noticed too, and instances that never read it skip the
+    serialization.
+    """
+
+    def _tracked_fields(self, field_names=None):
+        deferred = self.get_deferred_fields()
+        pending = self.__dict__.get("_pending_json", ())
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname in deferred:
+                continue
+            if field.name in pending:
+                continue  # not accessed since loaded, unchanged
+            if field_names is not None and not (
+                field.name in field_names or field.attname in field_names
+            ):
+                continue
+            yield field
+
+    def _get_field_state(self, field_names=None):
+        state = {}
+        for field in self._tracked_fields(field_names):
+            value = self.__dict__[field.attname]
+            if isinstance(field, models.JSONField):
+                value = _json_state(field, value)
+            elif isinstance(value, (dict, list)):
+                value = copy.deepcopy(value)
+            state[field.name] = value
+        return state
+
+    def _track_fields(self, field_names=None, loaded=False):
+        if loaded:
+            # snapshot on the first access, see _TrackedJSONAttribute
+            json_fields = [
+                field.name
+                for field in self._tracked_fields(field_names)
+                if isinstance(field, models.JSONField)
+            ]
+            self.__dict__.setdefault("_pending_json", set()).update(json_fields)
+            for name in json_fields:
+                getattr(self, "_loaded_state", {}).pop(name, None)
+
+        if field_names is None or not hasattr(self, "_loaded_state"):
+            self._loaded_state = self._get_field_state()
+        else:
+            self._loaded_state.update(self._get_field_state(field_names))
+
+    def get_dirty_fields(self) -> Optional[List[str]]:
+        """
+        Names of the fields changed since the instance was loaded or saved.
+
+        None, if the instance was not loaded from the database.
+        """
+        loaded_state = getattr(self, "_loaded_state", None)
+        if self._state.adding or loaded_state is None:
+            return None
+
+        dirty_fields = [
+            name
+            for name, value in self._get_field_state().items()
+            if name not in loaded_state or loaded_state[name] != value
+        ]
+        if dirty_fields:
+            # values set on save
+            dirty_fields += [
+                field.name
+                for field in self._meta.concrete_fields
+                if getattr(field, "auto_now", False) and field.name not in dirty_fields
+            ]
+        return dirty_fields
+
+    @classmethod
+    def from_db(cls, db, field_names, values):  # noqa D102
+        instance = super().from_db(db, field_names, values)
+        instance._track_fields(loaded=True)
+        lock.track(instance)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):  # noqa D102
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._track_fields(fields, loaded=True)
+
+    def save(self, *args, **kwargs):  # noqa D102
+        if not args and not kwargs:
+            if lock.defer_save(self):
+                return
+            # an unchanged instance is saved in full, and sends post_save
+            kwargs["update_fields"] = self.get_dirty_fields() or None
+        created = self._state.adding
+        super().save(*args, **kwargs)
+        self._fields_saved(created, getattr(self, "_loaded_state", None))
+        self._track_fields(kwargs.get("update_fields"))
+        lock.track(self)
+
+    def _fields_saved(self, created, loaded_state):
+        """Hook called after the row is written, with the state it had."""
+
+
+def _track_json_attributes(sender, **kwargs):
+    if issubclass(sender, TrackedFieldsMixin):
+        for field in sender._meta.local_concrete_fields:
+            if isinstance(field, models.JSONField):
+                setattr(sender, field.attname, _TrackedJSONAttribute(field))
+
+
+class_prepared.connect(_track_json_attributes)
+
+
+class AbstractProcess(TrackedFieldsMixin, models.Model):
     """Base class for Process data object."""
 
     flow_class = FlowReferenceField(_("Flow"))
@@ -30,6 +199,14 @@ class AbstractProcess(models.Model):
     created = models.DateTimeField(_("Created"), default=timezone.now)
     finished = models.DateTimeField(_("Finished"), blank=True, null=True)
 
+    # not finished tasks, maintained on task saves; NULL until recomputed
+    # by the `workflow_active_tasks` command for processes started before
+    active_tasks = models.IntegerField(
+        _("Active tasks"), blank=True, null=True, default=0, editable=False
+    )
+    # incremented on each activation under the OptimisticLock
+    version = models.PositiveIntegerField(_("Version"), default=0, editable=False)
+
     objects = ProcessQuerySet.as_manager()
 
     class Meta:
@@ -74,7 +251,7 @@ class AbstractProcess(models.Model):
         return self
 
 
-class AbstractTask(models.Model):
+class AbstractTask(TrackedFieldsMixin, models.Model):
     """
     Base class for Task state objects.
 
@@ -104,10 +281,25 @@ class AbstractTask(models.Model):
         _("Scheduled"), blank=True, null=True, db_index=True
     )
 
+    # a timer dispatcher firing the due Timer task holds it until then
+    locked_until = models.DateTimeField(_("Locked until"), blank=True, null=True)
+
+    # the moment a ConditionalCatch task is evaluated next, NULL for every
+    # dispatcher sweep
+    next_check = models.DateTimeField(_("Next check"), blank=True, null=True)
+
     previous = models.ManyToManyField(
         "self", symmetrical=False, related_name="leading", verbose_name=_("Previous")
     )
     token = TokenField(_("Token"), default=Token("start"))
+    token_key = TokenKeyField(_("Token key"))
+
+    # split branches not yet arrived to a `Join(count_arrivals=True)`
+    pending_branches = models.IntegerField(_("Pending branches"), blank=True, null=True)
+
+    # the signal name an armed SignalCatch task waits for; queried by
+    # `broadcast_signal`
+    signal_name = models.CharField(_("Signal"), max_length=255, blank=True, null=True)
 
     external_task_id = models.CharField(
         blank=True,
@@ -161,12 +353,36 @@ class AbstractTask(models.Model):
             return f"<{flow_label}.{self.flow_task}/{self.pk}> - {self.status}"
         return f"<Task {self.pk}> - {self.status}"
 
+    def get_dirty_fields(self) -> Optional[List[str]]:  # noqa D102
+        dirty_fields = super(AbstractTask, self).get_dirty_fields()
+        if dirty_fields and "token" in dirty_fields:
+            dirty_fields.append("token_key")
+        return dirty_fields
+
     def save(self, *args, **kwargs):  # noqa D102
         if self.flow_task and not self.flow_task_type:
             self.flow_task_type = self.flow_task.task_type
 
         super(AbstractTask, self).save(*args, **kwargs)
 
+    def _fields_saved(self, created, loaded_state):
+        counters.task_saved(self, created, loaded_state)
+
+        if created:
+            was_active = False
+        elif loaded_state is None or "finished" not in loaded_state:
+            return
+        else:
+            was_active = loaded_state["finished"] is None
+
+        is_active = self.finished is None
+        if is_active != was_active:
+            update_active_tasks(
+                self._meta.get_field("process").related_model,
+                self.process_id,
+                1 if is_active else -1,
+            )
+
     @property
     def coerced(self):
         """Return task instance of flow_class type."""
@@ -236,7 +452,7 @@ class AbstractTask(models.Model):
         """
         assert self.pk
 
-        with self.flow_task.flow_class.lock(self.process_id):
+        with self.flow_task.flow_class.lock(self.process_id, node=self.flow_task):
             self.refresh_from_db()
             yield self.flow_task.activation_class(self)
 
@@ -327,6 +543,29 @@ class Task(AbstractTask):
         verbose_name = _("Task")
         verbose_name_plural = _("Tasks")
         ordering = ["-created"]
+        indexes = [
+            models.Index(fields=["process", "token_key"]),
+            models.Index(fields=["flow_task_type", "status", "next_check"]),
+            models.Index(fields=["signal_name", "status"]),
+        ]
 
     def reverse(self, view_name: str, *args: List[Any]) -> str:
         return self.flow_task.reverse(view_name, args=[self.process_id, self.pk, *args])
+
+
+class StartTimerSchedule(models.Model):
+    """Next run of a ``flow.StartTimer`` node, claimed by timer dispatchers."""
+
+    flow_task = TaskReferenceField(_("Task"), unique=True)
+    next_run = models.DateTimeField(_("Next run"), db_index=True)
+    last_run = models.DateTimeField(_("Last run"), blank=True, null=True)
+
+    # a dispatcher starting the due process holds the schedule until then
+    locked_until = models.DateTimeField(_("Locked until"), blank=True, null=True)
+
+    class Meta:  # noqa D101
+        verbose_name = _("Start timer schedule")
+        verbose_name_plural = _("Start timer schedules")
+
+    def __str__(self):
+        return str(self.flow_task)
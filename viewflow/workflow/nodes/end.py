@@ -40,11 +40,7 @@ class EndActivation(Activation):
                 sender=self.flow_class, process=self.process, task=self.task
             )
 
-            active_tasks_count = (
-                self.flow_class.task_class._default_manager.filter(
-                    process=self.process, finished__isnull=True
-                ).exclude(pk=self.task.pk)
-            ).count()
+            active_tasks_count = self._other_active_tasks_count()
 
             if active_tasks_count == 0:
                 self.process.status = STATUS.DONE
@@ -59,6 +55,26 @@ class EndActivation(Activation):
                     sender=self.flow_class, process=self.process, task=self.task
                 )
 
+    def _other_active_tasks_count(self):
+        """Not finished tasks of the process, except this one."""
+        active_tasks = (
+            self.flow_class.process_class._default_manager.filter(pk=self.process.pk)
+            .values_list("active_tasks", flat=True)
+            .first()
+        )
+        if active_tasks is None:
+            # counter not computed for a process started before it existed
+            return (
+                self.flow_class.task_class._default_manager.filter(
+                    process=self.process, finished__isnull=True
+                ).exclude(pk=self.task.pk)
+            ).count()
+        # the changes made within the lock scope are written on its exit
+        active_tasks += lock.pending_active_tasks(
+            self.flow_class.process_class, self.process.pk
+        )
+        return active_tasks - (1 if self.task.finished is None else 0)
+
     @Activation.status.super()
     def create_next(self):
         """Do nothing"""
@@ -5,8 +5,14 @@ no collaboration diagrams are drawn.
 """
 
 import logging
-
-from django.db import transaction
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+
+from django.apps import apps
+from django.db import connections, transaction
+from django.db.models import Q
 from django.utils.timezone import now
 
 from viewflow import this
@@ -58,52 +64,142 @@ class MessageCatch(Handle):
         return "<bpmn:messageEventDefinition/>"
 
 
-def broadcast_signal(name, flows=None):
+def broadcast_signal(name, flows=None, batch_size=100, workers=1, executor=None):
     """Fire every armed ``flow.SignalCatch`` with a matching signal name.
 
-    Returns the number of catch tasks delivered to. By default discovers
-    flows by importing every installed app's ``flows`` module; pass ``flows``
-    to restrict the broadcast. Each catch task is fired under its own flow
-    lock, so a task locked by another worker is skipped until the next throw.
+    Returns the number of catch tasks delivered to. Armed catch tasks are
+    looked up by the indexed ``Task.signal_name`` column, with one query
+    per task table, streamed in chunks of ``batch_size``; pass ``flows`` to
+    restrict the broadcast to their catch nodes. Each catch task is fired
+    under its own flow lock, so a task locked by another worker is skipped
+    until the next throw.
+
+    Tasks are delivered in batches of ``batch_size``. Spread each batch
+    over a thread pool of ``workers`` size, or any ``concurrent.futures``
+    ``executor``; tasks of the same process are delivered by one worker,
+    one after another. Pool workers use their own db connections, so only
+    broadcast in parallel outside of a transaction.
     """
-    from ..base import Flow
-    from ..checks import _all_flow_subclasses
-
     if flows is None:
-        from django.utils.module_loading import autodiscover_modules
-
-        autodiscover_modules("flows")
-        flows = _all_flow_subclasses(Flow)
-
+        armed = {task_class: Q() for task_class in _task_tables()}
+    else:
+        armed = defaultdict(Q)
+        for flow_class in flows:
+            nodes = [
+                node
+                for node in flow_class.instance.nodes()
+                if isinstance(node, SignalCatch) and node._signal_name == name
+            ]
+            if nodes:
+                task_class = _task_table(flow_class.task_class)
+                armed[task_class] |= Q(flow_task__in=nodes)
+
+    own_executor = None
+    if executor is None and workers > 1:
+        executor = own_executor = ThreadPoolExecutor(max_workers=workers)
+
+    # catch tasks armed while the signal is delivered wait for the next one
+    created = now()
     delivered = 0
-    for flow_class in flows:
-        catch_nodes = [
-            node
-            for node in flow_class.instance.nodes()
-            if isinstance(node, SignalCatch) and node._signal_name == name
-        ]
-        for node in catch_nodes:
-            armed = flow_class.task_class._default_manager.filter(
-                flow_task=node, status=STATUS.NEW
+    try:
+        for task_class, nodes in armed.items():
+            tasks = (
+                task_class._default_manager.filter(
+                    nodes, signal_name=name, status=STATUS.NEW, created__lte=created
+                )
+                .order_by()
+                .values_list("flow_task", "process_id", "pk")
+                .iterator(chunk_size=batch_size)
             )
-            for task in armed:
-                try:
-                    with task.activation() as activation:
-                        if activation.start.can_proceed():
-                            activation.start()
-                            activation.execute()
-                            delivered += 1
-                except FlowLockFailed:
-                    logger.info("Signal catch task %s is locked, skipped", task.pk)
-                except Exception:  # one broken flow must not stop delivery
-                    logger.exception("Signal catch task %s failed to fire", task.pk)
+            for batch in _batches(tasks, batch_size):
+                by_process = defaultdict(list)
+                for flow_task, process_pk, task_pk in batch:
+                    if flow_task is not None:
+                        # the flow task class, a subclass of the table model
+                        by_process[flow_task.flow_class.task_class, process_pk].append(
+                            task_pk
+                        )
+                task_classes = [task_class for task_class, _ in by_process]
+                if executor is None:
+                    results = map(_deliver_signal, task_classes, by_process.values())
+                else:
+                    results = executor.map(
+                        _deliver_pooled_signal, task_classes, by_process.values()
+                    )
+                delivered += sum(results)
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown(wait=True)
+
+    return delivered
+
+
+@lru_cache(maxsize=None)
+def _task_tables():
+    """Task models with a table of their own, the subclasses of a task
+    model are looked up in the parent table."""
+    from ..models import AbstractTask
+
+    return [
+        task_class
+        for task_class in apps.get_models()
+        if issubclass(task_class, AbstractTask)
+        and task_class._meta.get_field("status").model is task_class
+    ]
+
+
+def _task_table(task_class):
+    return task_class._meta.get_field("status").model
+
+
+def _batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
 
+
+def _deliver_signal(task_class, task_pks):
+    delivered = 0
+    for task in task_class._default_manager.filter(pk__in=task_pks):
+        try:
+            with task.activation() as activation:
+                if activation.start.can_proceed():
+                    activation.start()
+                    activation.execute()
+                    delivered += 1
+        except FlowLockFailed:
+            logger.info("Signal catch task %s is locked, skipped", task.pk)
+        except Exception:  # one broken flow must not stop delivery
+            logger.exception("Signal catch task %s failed to fire", task.pk)
     return delivered
 
 
+def _deliver_pooled_signal(task_class, task_pks):
+    try:
+        return _deliver_signal(task_class, task_pks)
+    finally:
+        # don't leave connections open in the pool threads
+        connections.close_all()
+
+
 class SignalCatchActivation(mixins.NextNodeActivationMixin, Activation):
     """Stays armed at NEW until a matching signal is broadcast."""
 
+    @classmethod
+    def build(cls, flow_task, prev_activation, token, data=None, seed=None):
+        """Instantiate new flow task subscribed to the signal name."""
+        activation = super().build(
+            flow_task, prev_activation, token, data=data, seed=seed
+        )
+        activation.task.signal_name = flow_task._signal_name
+        return activation
+
+    def prepare_revived_task(self, task):
+        task.signal_name = self.flow_task._signal_name
+
     @Activation.status.super()
     def activate(self):
         """Do nothing -- wait for the signal."""
@@ -228,6 +324,14 @@ class ConditionalCatchActivation(mixins.NextNodeActivationMixin, Activation):
     def condition_met(self):
         return bool(self.flow_task._condition(self))
 
+    def schedule_next_check(self):
+        """Postpone the next evaluation of the unmet condition, if the node
+        has a ``poll_interval``."""
+        interval = self.flow_task.next_check_interval(self.task)
+        if interval is not None:
+            self.task.next_check = now() + interval
+            self.task.save()
+
     @Activation.status.transition(source=STATUS.NEW, target=STATUS.STARTED)
     def start(self):
         self.task.started = now()
@@ -263,7 +367,23 @@ class ConditionalCatch(mixins.NextNodeMixin, Node):
             lambda activation: activation.process.approved
         ).Next(this.proceed)
 
+    By default the condition is evaluated on every sweep. With a
+    ``poll_interval``, an unmet condition is skipped by the sweeps within
+    the interval; with a ``backoff`` factor, the interval grows with the
+    time the task has been waiting, up to ``max_poll_interval``::
+
+        wait = flow.ConditionalCatch(
+            this.is_paid,
+            poll_interval=timedelta(minutes=1),
+            backoff=2,
+            max_poll_interval=timedelta(hours=1),
+        ).Next(this.ship)
+
     :param condition: a callable ``activation -> bool``.
+    :param poll_interval: ``timedelta`` between evaluations.
+    :param backoff: the interval after a check is at least ``backoff - 1``
+        times the task age, so checks happen at geometrically growing ages.
+    :param max_poll_interval: ``timedelta`` capping the backed off interval.
     """
 
     task_type = "CONDITION"
@@ -281,14 +401,40 @@ class ConditionalCatch(mixins.NextNodeMixin, Node):
         """,
     }
 
-    def __init__(self, condition, **kwargs):
+    def __init__(
+        self,
+        condition,
+        poll_interval=None,
+        backoff=1,
+        max_poll_interval=None,
+        **kwargs,
+    ):
+        if backoff < 1:
+            raise ValueError("ConditionalCatch backoff must be at least 1")
+        if backoff != 1 and poll_interval is None:
+            raise ValueError("ConditionalCatch backoff requires a poll_interval")
         super().__init__(**kwargs)
         self._condition = condition
+        self._poll_interval = poll_interval
+        self._backoff = backoff
+        self._max_poll_interval = max_poll_interval
 
     def _resolve(self, instance):
         super()._resolve(instance)
         self._condition = this.resolve(instance, self._condition)
 
+    def next_check_interval(self, task):
+        """Delay before the next evaluation of the ``task`` condition, or
+        None to evaluate it on every sweep."""
+        if self._poll_interval is None:
+            return None
+        interval = max(
+            self._poll_interval, (now() - task.created) * (self._backoff - 1)
+        )
+        if self._max_poll_interval is not None:
+            interval = min(interval, self._max_poll_interval)
+        return interval
+
     def bpmn_content(self):
         # the executable condition lives in Python; the export carries an
         # empty formal expression as the BPMN placeholder
@@ -1,5 +1,8 @@
+from functools import partial
+
 from django.utils.timezone import now
 from viewflow import this
+from .. import lock
 from ..activation import Activation, leading_tasks_canceled
 from ..base import Node
 from ..status import STATUS
@@ -70,13 +73,20 @@ class Handle(mixins.NextNodeMixin, Node):
         self._undo_func = undo_func
 
     def _create_wrapper_function(self, origin_func, task):
+        def run_activation(**kwargs):
+            task.refresh_from_db()
+            activation = self.activation_class(task)
+            result = activation.run(origin_func, **kwargs)
+            activation.execute()
+            return result
+
         def func(**kwargs):
-            with self.flow_class.lock(task.process.pk):
-                task.refresh_from_db()
-                activation = self.activation_class(task)
-                result = activation.run(origin_func, **kwargs)
-                activation.execute()
-                return result
+            return lock.run_locked(
+                self.flow_class,
+                task.process_id,
+                partial(run_activation, **kwargs),
+                node=self,
+            )
 
         return func
 
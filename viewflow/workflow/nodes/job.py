@@ -15,20 +15,13 @@ from . import mixins
 
 class AbstractJobActivation(mixins.NextNodeActivationMixin, Activation):
     @classmethod
-    def create(cls, flow_task, prev_activation, token, data=None, seed=None):
-        """Instantiate and persist new flow task."""
-        flow_class = flow_task.flow_class
-        task = flow_class.task_class(
-            process=prev_activation.process,
-            flow_task=flow_task,
-            token=token,
-            external_task_id=str(uuid.uuid4()),
+    def build(cls, flow_task, prev_activation, token, data=None, seed=None):
+        """Instantiate new flow task with an unique external task id."""
+        activation = super().build(
+            flow_task, prev_activation, token, data=data, seed=seed
         )
-        task.data = data if data is not None else {}
-        task.seed = seed
-        task.save()
-        task.previous.add(prev_activation.task)
-        return cls(task)
+        activation.task.external_task_id = str(uuid.uuid4())
+        return activation
 
     def prepare_revived_task(self, task):
         # create() assigns every job task its own external_task_id; the
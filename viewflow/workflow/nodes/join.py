@@ -1,10 +1,12 @@
 from django.db import transaction
+from django.db.models import F, Q
 from django.utils.timezone import now
 from viewflow.this_object import this
 from ..activation import Activation, _can_cancel
 from ..base import Node
 from ..exceptions import FlowRuntimeError
 from ..status import STATUS
+from ..token import Token
 from . import mixins
 
 
@@ -15,6 +17,7 @@ class JoinActivation(mixins.NextNodeActivationMixin, Activation):
 
     def __init__(self, *args, **kwargs):  # noqa D102
         self.next_task = None
+        self._arrival = None
         super().__init__(*args, **kwargs)
 
     @classmethod
@@ -60,8 +63,40 @@ class JoinActivation(mixins.NextNodeActivationMixin, Activation):
         task.previous.add(prev_activation.task)
         activation = cls(task)
 
+        if flow_task._count_arrivals:
+            activation._arrival = prev_activation.task
+            activation._count_arrival(prev_activation.task)
+
         return activation
 
+    def _split_task_pk(self, task):
+        """The split that started the incoming ``task``, the task itself
+        for a direct edge from the split to the join."""
+        if task.token == self.task.token:
+            return task.pk
+        return task.token.get_split_task_pk()
+
+    def _count_arrival(self, task):
+        """Count down pending branches of the split that started ``task``."""
+        split_task_pk = self._split_task_pk(task)
+        if split_task_pk is not None:
+            self.flow_class.task_class._default_manager.filter(
+                pk=split_task_pk, pending_branches__isnull=False
+            ).update(pending_branches=F("pending_branches") - 1)
+
+    def _pending_branches(self, task):
+        """Branches of the split that started ``task`` yet to arrive, or
+        None when the split keeps no counter (not a ``Split``, or created
+        before the counter was introduced)."""
+        split_task_pk = self._split_task_pk(task)
+        if split_task_pk is None:
+            return None
+        return (
+            self.flow_class.task_class._default_manager.filter(pk=split_task_pk)
+            .values_list("pending_branches", flat=True)
+            .first()
+        )
+
     @Activation.status.transition(source=STATUS.NEW, target=STATUS.STARTED)
     @Activation.status.transition(source=STATUS.STARTED)
     def activate(self):
@@ -118,35 +153,63 @@ class JoinActivation(mixins.NextNodeActivationMixin, Activation):
         for activation in activations:
             activation.cancel()
 
+    def _arrivals(self):
+        """Non-cancelled incoming tasks to check the join tokens against."""
+        previous = self.task.previous.exclude(
+            status__in=[STATUS.CANCELED, STATUS.REVIVED]
+        )
+        if not self.flow_task._count_arrivals:
+            return previous.all()
+
+        # every arrival is checked as it comes, so the first and the
+        # latest one are enough to catch a foreign token
+        first = previous.order_by("pk").first()
+        if first is None:
+            return []
+        latest = self._arrival or previous.order_by("pk").last()
+        return [first] if latest == first else [first, latest]
+
     def _join_token_prefixes(self):
         """Common split-token prefixes of the non-cancelled incoming tasks."""
         return set(
             prev.token.get_common_split_prefix(self.task.token, prev.pk)
-            for prev in self.task.previous.exclude(
-                status__in=[STATUS.CANCELED, STATUS.REVIVED]
-            ).all()
+            for prev in self._arrivals()
         )
 
     def _active_join_tasks(self, join_token_prefix):
         """Still-running tasks sharing the join's token prefix."""
-        return self.flow_class.task_class._default_manager.filter(
-            process=self.process, token__startswith=join_token_prefix
-        ).exclude(status__in=[STATUS.DONE, STATUS.CANCELED, STATUS.REVIVED])
+        tasks = self.flow_class.task_class._default_manager.filter(process=self.process)
+        key_range = Token.get_split_key_range(join_token_prefix)
+        if key_range is not None:
+            # rows saved before the key was introduced have it unset
+            tasks = tasks.filter(
+                Q(token_key__gte=key_range[0], token_key__lt=key_range[1])
+                | Q(token_key__isnull=True, token__startswith=join_token_prefix)
+            )
+        else:
+            tasks = tasks.filter(token__startswith=join_token_prefix)
+        return tasks.exclude(status__in=[STATUS.DONE, STATUS.CANCELED, STATUS.REVIVED])
 
     def is_done(self):
         """
         Check that process can be continued further.
 
-        Join checks all task states in db with the common token prefix. It
+        Join checks all task states in db within the common token key range. It
         continues execution if all incoming tasks are DONE or CANCELED, or if
-        the ``continue_on_condition`` predicate allows it.
+        the ``continue_on_condition`` predicate allows it. With
+        ``count_arrivals`` enabled, the split's pending branches counter is
+        read instead.
 
         This is a pure, side-effect-free predicate: it neither cancels tasks nor
         raises. An ambiguous multi-token state is reported as "done" so that
         ``complete()`` runs and surfaces the error under the exception guard,
         rather than crashing the condition check.
         """
-        join_prefixes = self._join_token_prefixes()
+        arrivals = self._arrivals()
+        join_prefixes = set(
+            prev.token.get_common_split_prefix(self.task.token, prev.pk)
+            for prev in arrivals
+        )
         if len(join_prefixes) != 1:
             # >1 is a flow-integrity error, handled in complete(); 0 means
             # nothing has arrived to join yet.
@@ -158,6 +221,11 @@ class JoinActivation(mixins.NextNodeActivationMixin, Activation):
             if self.flow_task._continue_on_condition(self, active_tasks):
                 return True
 
+        if self.flow_task._count_arrivals:
+            pending_branches = self._pending_branches(arrivals[-1])
+            if pending_branches is not None:
+                return pending_branches <= 0
+
         return not active_tasks.exists()
 
     @Activation.status.transition(
@@ -172,7 +240,23 @@ class Join(
     mixins.NextNodeMixin,
     Node,
 ):
-    """Wait for one or all incoming links and activates next path."""
+    """
+    Wait for one or all incoming links and activates next path.
+
+    By default, each arrival scans the process tasks sharing the split
+    token prefix to find out whether any branch is still running.
+
+    With ``count_arrivals=True`` the join counts down the number of
+    branches recorded by the ``Split`` instead, so the completion check is
+    a single row read regardless of the split width::
+
+        join = flow.Join(count_arrivals=True).Next(this.end)
+
+    The counter expects every branch of the split to arrive at this join.
+    Keep the default mode when a branch could end elsewhere or be
+    cancelled on its own. Joins of splits created before the counter was
+    introduced fall back to the scan.
+    """
 
     activation_class = JoinActivation
 
@@ -203,11 +287,16 @@ class Join(
         }
 
     def __init__(
-        self, continue_on_condition=None, cancel_active=True, **kwargs
+        self,
+        continue_on_condition=None,
+        cancel_active=True,
+        count_arrivals=False,
+        **kwargs,
     ):  # noqa D102
         super().__init__(**kwargs)
         self._cancel_active: bool = cancel_active
         self._continue_on_condition = continue_on_condition
+        self._count_arrivals: bool = count_arrivals
 
     def _resolve(self, cls):
         super()._resolve(cls)
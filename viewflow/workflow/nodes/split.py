@@ -2,7 +2,7 @@ from django.db import connection
 from django.utils.timezone import now
 from viewflow import this
 
-from ..activation import Activation
+from ..activation import Activation, bulk_create
 from ..exceptions import FlowRuntimeError
 from ..signals import task_finished
 from ..status import STATUS
@@ -33,12 +33,16 @@ class SplitActivation(Activation):
                 "No next task available for {}".format(self.flow_task.name)
             )
 
+        # saved with the task on complete, counted down by the Join
+        self.task.pending_branches = len(self.next_tasks)
+
     @Activation.status.super()
     def create_next(self):
         """Activate next tasks for parallel execution.
 
         Each task would have a new execution token attached,
-        the Split task token as a common prefix.
+        the Split task token as a common prefix. Outgoing tasks are
+        inserted in a batch, see :func:`viewflow.workflow.activation.bulk_create`.
         """
         token_source = Token.split_token_source(self.task.token, self.task.pk)
 
@@ -46,10 +50,13 @@ class SplitActivation(Activation):
             (task, data) for task, data in self.next_tasks if not isinstance(task, Join)
         ] + [(task, data) for task, data in self.next_tasks if isinstance(task, Join)]
 
-        for n, (next_task, data) in enumerate(next_tasks, 1):
-            yield next_task._create(
-                prev_activation=self, token=next(token_source), data=data
-            )
+        yield from bulk_create(
+            self,
+            [
+                (next_task, next(token_source), data, None)
+                for next_task, data in next_tasks
+            ],
+        )
 
 
 class Split(
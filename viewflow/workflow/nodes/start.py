@@ -1,7 +1,7 @@
 from django.db import transaction
 from django.utils.timezone import now
 
-from viewflow import this
+from viewflow import permissions, this
 from viewflow.utils import is_owner
 from ..base import Node
 from ..activation import Activation, leading_tasks_canceled, has_manage_permission
@@ -32,7 +32,7 @@ class StartActivation(mixins.NextNodeActivationMixin, Activation):
         task_started.send(sender=self.flow_class, process=self.process, task=self.task)
         with transaction.atomic():
             self.process.save()
-            with self.flow_class.lock(self.process.pk):
+            with self.flow_class.lock(self.process.pk, node=self.flow_task):
                 self.complete()
                 flow_started.send(
                     sender=self.flow_class,
@@ -168,9 +168,9 @@ class Start(
                 else:
                     obj = self._owner_permission_obj
 
-            return user.has_perm(self._owner_permission, obj=obj) or user.has_perm(
-                self._owner_permission
-            )
+            return permissions.has_perm(
+                user, self._owner_permission, obj=obj
+            ) or permissions.has_perm(user, self._owner_permission)
 
         else:
             """
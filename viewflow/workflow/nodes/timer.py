@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 
 from django.db import transaction
+from django.utils.html import escape
 from django.utils.timezone import now
 
 from viewflow import this
@@ -8,6 +9,7 @@ from viewflow import this
 from ..activation import Activation, has_manage_permission
 from ..base import Node
 from ..context import Context
+from ..cron import CronSchedule
 from ..status import STATUS
 from . import mixins
 from .start import StartHandle
@@ -32,10 +34,15 @@ class TimerActivation(mixins.NextNodeActivationMixin, Activation):
             self.task.scheduled = delay
             self.task.save()
 
+            from ..timers import notify_timers_changed
+
+            transaction.on_commit(notify_timers_changed)
+
     @Activation.status.transition(source=STATUS.SCHEDULED, target=STATUS.STARTED)
     def start(self):
-        """Claim the due timer; called by the timer dispatcher."""
+        """Start the due timer; called by the timer dispatcher under the flow lock."""
         self.task.started = now()
+        self.task.locked_until = None
         self.task.save()
 
     @Activation.status.transition(source=STATUS.STARTED, target=STATUS.DONE)
@@ -125,13 +132,16 @@ class StartTimer(StartHandle):
     """
     Start a new process on a schedule.
 
-    Due start timers are fired by the periodic ``workflow_timers``
-    dispatcher. The first process starts on the first dispatcher run,
-    subsequent ones an ``interval`` after the previous start. Run a single
-    dispatcher instance to avoid duplicate starts.
+    Due start timers are fired by the ``workflow_timers`` dispatcher. The
+    next run of each node is kept in the ``StartTimerSchedule`` table, so
+    several dispatcher instances could run side by side, and a dispatcher
+    sweep costs a single query.
 
-    For cron-style schedules, point celery beat or OS cron directly at
-    ``MyFlow.start.run()`` instead.
+    With an ``interval``, the first process starts on the first dispatcher
+    run, subsequent ones an ``interval`` after the previous start. With a
+    ``cron`` expression (see ``viewflow.workflow.cron.CronSchedule``),
+    processes start at the matching moments. Runs missed while no
+    dispatcher was running are not caught up.
 
     Example::
 
@@ -139,14 +149,20 @@ class StartTimer(StartHandle):
             start = flow.StartTimer(interval=timedelta(days=1)).Next(this.report)
             ...
 
+        class DigestFlow(flow.Flow):
+            start = flow.StartTimer(cron="0 9 * * 1-5").Next(this.send)
+            ...
+
     :param interval: ``timedelta`` between process starts.
+    :param cron: cron expression of the process starts.
     """
 
-    def __init__(self, interval=None, **kwargs):
-        if interval is None:
-            raise ValueError("StartTimer requires an interval")
+    def __init__(self, interval=None, cron=None, **kwargs):
+        if (interval is None) == (cron is None):
+            raise ValueError("StartTimer requires either an interval or a cron")
         super().__init__(**kwargs)
         self._interval = interval
+        self._cron = CronSchedule(cron) if cron is not None else None
 
     def last_run(self):
         """Creation moment of the latest start task for this node, if any."""
@@ -157,14 +173,41 @@ class StartTimer(StartHandle):
         )
         return task.created if task is not None else None
 
-    def is_due(self, at):
+    def next_run_after(self, moment):
+        """Moment of the run following one at ``moment``."""
+        if self._cron is not None:
+            return self._cron.next_after(moment)
+        return moment + self._interval
+
+    def first_run(self, at):
+        """Moment of the first run scheduled at ``at``, following the latest
+        start of the node, if any."""
         last_run = self.last_run()
-        return last_run is None or last_run + self._interval <= at
+        if last_run is not None:
+            return max(self.next_run_after(last_run), at)
+        if self._cron is not None:
+            return self._cron.next_after(at)
+        return at
+
+    def next_run(self):
+        """Moment the next process is due."""
+        from ..models import StartTimerSchedule
+
+        schedule = StartTimerSchedule._default_manager.filter(flow_task=self).first()
+        if schedule is not None:
+            return schedule.next_run
+        return self.first_run(now())
+
+    def is_due(self, at):
+        return self.next_run() <= at
 
     def bpmn_content(self):
-        seconds = int(self._interval.total_seconds())
+        if self._cron is not None:
+            cycle = escape(self._cron.expression)
+        else:
+            cycle = f"R/PT{int(self._interval.total_seconds())}S"
         return (
             "<bpmn:timerEventDefinition><bpmn:timeCycle>"
-            f"R/PT{seconds}S"
+            f"{cycle}"
             "</bpmn:timeCycle></bpmn:timerEventDefinition>"
         )
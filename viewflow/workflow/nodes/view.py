@@ -1,6 +1,6 @@
 from django.utils.timezone import now
 
-from viewflow import this
+from viewflow import permissions, this
 from viewflow.utils import is_owner
 from ..base import Node
 from ..activation import Activation, has_manage_permission
@@ -13,18 +13,12 @@ class ViewActivation(mixins.NextNodeActivationMixin, Activation):
     """View node activation."""
 
     @classmethod
-    def create(cls, flow_task, prev_activation, token, data=None, seed=None):
-        """Instantiate and persist new flow task."""
-        flow_class = flow_task.flow_class
-        task = flow_class.task_class(
-            process=prev_activation.process,
-            flow_task=flow_task,
-            token=token,
+    def build(cls, flow_task, prev_activation, token, data=None, seed=None):
+        """Instantiate new flow task with calculated owner and permissions."""
+        activation = super().build(
+            flow_task, prev_activation, token, data=data, seed=seed
         )
-        task.data = data if data is not None else {}
-        task.seed = seed
-
-        activation = cls(task)
+        task = activation.task
 
         # Try to assign permission
         owner_permission = flow_task.calc_owner_permission(activation)
@@ -38,14 +32,12 @@ class ViewActivation(mixins.NextNodeActivationMixin, Activation):
             task.owner = owner
             task.status = STATUS.ASSIGNED
 
-        task.save()
-        task.previous.add(prev_activation.task)
-
-        if flow_task._on_create is not None:
-            flow_task._on_create(activation)
-
         return activation
 
+    def post_create(self):
+        if self.flow_task._on_create is not None:
+            self.flow_task._on_create(self)
+
     @Activation.status.transition(
         source=STATUS.NEW,
         target=STATUS.ASSIGNED,
@@ -252,9 +244,9 @@ class View(
             else:
                 obj = self._owner_permission_obj
 
-        return user.has_perm(task.owner_permission, obj=obj) or user.has_perm(
-            task.owner_permission
-        )
+        return permissions.has_perm(
+            user, task.owner_permission, obj=obj
+        ) or permissions.has_perm(user, task.owner_permission)
 
     def can_unassign(self, user, task):
         """Check if user can unassign the task."""
@@ -2,60 +2,175 @@
 
 Run periodically -- via the ``workflow_timers`` management command from
 cron, or a celery beat schedule calling
-``viewflow.workflow.tasks.workflow_fire_timers``.
+``viewflow.workflow.tasks.workflow_fire_timers`` -- or as a long-running
+process, ``workflow_timers --loop``, see ``run_timers_loop``.
 """
 
 import logging
+import select
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
+from django.core.cache import cache as default_cache
+from django.db import close_old_connections, connections, router, transaction
+from django.db.models import Min, Q
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
 
 from .exceptions import FlowLockFailed
-from .models import Task
+from .models import StartTimerSchedule, Task
 from .status import STATUS
 
 logger = logging.getLogger(__name__)
 
+# a claimed timer not fired within this period is claimed again, so a
+# dispatcher crashed in between does not leave it hanging
+CLAIM_TIMEOUT = timedelta(minutes=10)
 
-def fire_due_timers():
-    """Fire every due ``flow.Timer`` task and return the number fired.
+# PostgreSQL notification channel, and the cache key used elsewhere, to wake
+# up dispatchers sleeping in ``run_timers_loop`` when a timer is scheduled
+WAKEUP_CHANNEL = "viewflow_timers"
+WAKEUP_CACHE_KEY = "viewflow.workflow.timers.wakeup"
 
-    Safe to run from several dispatchers concurrently: each task is
-    re-checked under its flow lock, and a task locked by another dispatcher
-    is skipped until the next run.
+# flows are discovered and their start timers scheduled once per process
+_start_timers_registered = False
 
-    Flows with a custom task model that is not a proxy of
-    ``viewflow.workflow.models.Task`` are not covered.
+
+def claim_due_timers(batch_size=100, claim_timeout=CLAIM_TIMEOUT, using=None):
+    """Claim up to ``batch_size`` due ``flow.Timer`` tasks, earliest first.
+
+    A task is claimed by its ``locked_until`` lease, so concurrent
+    dispatchers never pick the same task. The task stays ``SCHEDULED``
+    until fired, and can still be canceled meanwhile. On databases
+    supporting it, the batch is selected with ``SELECT ... FOR UPDATE SKIP
+    LOCKED``, so dispatchers don't wait on each other's rows either.
+    Elsewhere (SQLite) each task is claimed by a conditional ``UPDATE``. A
+    lease not released within ``claim_timeout`` expires.
+
+    Returns the list of claimed task pks.
     """
-    fired = 0
-    due_tasks = Task._default_manager.filter(
+    using = using or router.db_for_write(Task)
+    at = timezone.now()
+    manager = Task._default_manager.db_manager(using)
+    not_locked = Q(locked_until__isnull=True) | Q(locked_until__lte=at)
+    due_tasks = manager.filter(
+        not_locked,
         flow_task_type="TIMER",
         status=STATUS.SCHEDULED,
-        scheduled__lte=timezone.now(),
+        scheduled__lte=at,
     ).order_by("scheduled")
 
-    for task in due_tasks:
-        try:
-            with task.activation() as activation:
-                start = getattr(activation, "start", None)
-                if start is None:
-                    # the timer node was renamed or removed since this task
-                    # was scheduled; the orphaned row can never fire
-                    logger.warning(
-                        "Timer task %s references a missing node %r, skipped",
-                        task.pk,
-                        task.flow_task,
-                    )
-                    continue
-                if start.can_proceed():
-                    activation.start()
-                    activation.execute()
-                    fired += 1
-        except FlowLockFailed:
-            logger.info(
-                "Timer task %s is locked by another dispatcher, skipped", task.pk
+    if connections[using].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=using):
+            task_pks = list(
+                due_tasks.select_for_update(skip_locked=True).values_list(
+                    "pk", flat=True
+                )[:batch_size]
             )
-        except Exception:  # one broken flow must not block the whole sweep
-            logger.exception("Timer task %s failed to fire", task.pk)
+            manager.filter(pk__in=task_pks).update(locked_until=at + claim_timeout)
+        return task_pks
+
+    claimed = []
+    for task_pk in due_tasks.values_list("pk", flat=True)[:batch_size]:
+        if (
+            manager.filter(not_locked, pk=task_pk, status=STATUS.SCHEDULED)
+            .filter(scheduled__lte=at)
+            .update(locked_until=at + claim_timeout)
+        ):
+            claimed.append(task_pk)
+    return claimed
+
+
+def fire_claimed_timer(task_pk):
+    """Continue the process of a timer task claimed by ``claim_due_timers``.
+
+    The task status is checked again under the flow lock, so a timer
+    canceled after the claim, like a boundary timer of a finished task,
+    does not fire. Returns True if the timer fired.
+    """
+    try:
+        task = Task._default_manager.get(pk=task_pk)
+        with task.activation() as activation:
+            start = getattr(activation, "start", None)
+            if start is None:
+                # the timer node was renamed or removed since this task
+                # was scheduled; the orphaned row can never fire
+                logger.warning(
+                    "Timer task %s references a missing node %r, skipped",
+                    task.pk,
+                    task.flow_task,
+                )
+                return False
+            if start.can_proceed():
+                activation.start()
+                activation.execute()
+                return True
+    except FlowLockFailed:
+        release_timers([task_pk])
+        logger.info("Timer task %s is locked by another dispatcher, skipped", task_pk)
+    except Exception:  # one broken flow must not block the whole sweep
+        # stays claimed, and is retried once the claim times out
+        logger.exception("Timer task %s failed to fire", task_pk)
+    return False
+
+
+def release_timers(task_pks):
+    """Give claimed timer tasks back, to be fired on the next run."""
+    Task._default_manager.filter(pk__in=task_pks, status=STATUS.SCHEDULED).update(
+        locked_until=None
+    )
+
+
+def _fire_pooled_timer(task_pk):
+    try:
+        return fire_claimed_timer(task_pk)
+    finally:
+        # don't leave connections open in the pool threads or processes
+        connections.close_all()
+
+
+def fire_due_timers(batch_size=100, workers=1, executor=None):
+    """Fire every due ``flow.Timer`` task and return the number fired.
+
+    Due tasks are claimed in batches of ``batch_size`` (see
+    ``claim_due_timers``) until none is left, so several dispatchers could
+    run concurrently, each firing its own share of the tasks. A batch is
+    fired in the current thread, or spread over a thread pool of
+    ``workers`` size. Pass any ``concurrent.futures`` ``executor`` to use
+    it instead; a ``ProcessPoolExecutor`` needs
+    ``initializer=django.db.connections.close_all``, so forked workers don't
+    share the parent db connection. On SQLite, writes are serialized
+    anyway, so keep a single worker there.
+
+    Flows with a custom task model that is not a proxy of
+    ``viewflow.workflow.models.Task`` are not covered.
+    """
+    fired = 0
+    attempted = set()
+    own_executor = None
+    if executor is None and workers > 1:
+        executor = own_executor = ThreadPoolExecutor(max_workers=workers)
+
+    try:
+        while True:
+            claimed = claim_due_timers(batch_size=batch_size)
+            # a timer given back within this run waits for the next one
+            task_pks = [task_pk for task_pk in claimed if task_pk not in attempted]
+            release_timers(attempted.intersection(claimed))
+            if not task_pks:
+                break
+            attempted.update(task_pks)
+            if executor is None:
+                results = map(fire_claimed_timer, task_pks)
+            else:
+                results = executor.map(_fire_pooled_timer, task_pks)
+            fired += sum(results)
+            if len(claimed) < batch_size:
+                break
+    finally:
+        if own_executor is not None:
+            own_executor.shutdown(wait=True)
 
     return fired
 
@@ -63,17 +178,30 @@ def fire_due_timers():
 def fire_due_conditions(flows=None):
     """Fire every armed ``flow.ConditionalCatch`` whose condition now holds.
 
-    Evaluated on the same sweep as ``fire_due_timers``. Each task's condition
-    is checked under its flow lock, so a task locked by another dispatcher is
-    skipped until the next run. Pass ``flows`` to restrict evaluation to
-    specific flow classes.
+    Evaluated on the same sweep as ``fire_due_timers``. Only tasks due for a
+    check, see the ``poll_interval`` of ``flow.ConditionalCatch``, are
+    loaded. Each task's condition is checked under its flow lock, so a task
+    locked by another dispatcher is skipped until the next run. Pass
+    ``flows`` to restrict evaluation to specific flow classes.
     """
     fired = 0
-    armed = Task._default_manager.filter(flow_task_type="CONDITION", status=STATUS.NEW)
+    armed = Task._default_manager.filter(
+        Q(next_check__isnull=True) | Q(next_check__lte=timezone.now()),
+        flow_task_type="CONDITION",
+        status=STATUS.NEW,
+    )
+    if flows is not None:
+        armed = armed.filter(
+            flow_task__in=[
+                node
+                for flow_class in flows
+                for node in flow_class.instance.nodes()
+                if node.task_type == "CONDITION"
+            ]
+        )
 
-    for task in armed:
-        if flows is not None and task.flow_task.flow_class not in flows:
-            continue
+    # fetched before the tasks are updated
+    for task in list(armed):
         try:
             with task.activation() as activation:
                 start = getattr(activation, "start", None)
@@ -84,10 +212,14 @@ def fire_due_conditions(flows=None):
                         task.flow_task,
                     )
                     continue
-                if start.can_proceed() and activation.condition_met():
+                if not start.can_proceed():
+                    continue
+                if activation.condition_met():
                     activation.start()
                     activation.execute()
                     fired += 1
+                else:
+                    activation.schedule_next_check()
         except FlowLockFailed:
             logger.info(
                 "Conditional task %s is locked by another dispatcher, skipped",
@@ -99,29 +231,275 @@ def fire_due_conditions(flows=None):
     return fired
 
 
-def fire_due_start_timers(flows=None):
-    """Start a process for every due ``flow.StartTimer`` and return the count.
+def register_start_timers(flows=None):
+    """Schedule the ``flow.StartTimer`` nodes not scheduled yet.
 
     By default discovers flows by importing every installed app's ``flows``
-    module; pass ``flows`` to restrict dispatch to specific flow classes.
-    Unlike ``fire_due_timers``, there is no process row to lock before the
-    first start -- run a single dispatcher instance to avoid duplicates.
+    module. Returns the number of nodes scheduled.
     """
     from django.utils.module_loading import autodiscover_modules
 
     from .base import Flow
     from .checks import _all_flow_subclasses
-    from .nodes import StartTimer
+    from .fields import get_task_ref
 
     if flows is None:
         autodiscover_modules("flows")
         flows = _all_flow_subclasses(Flow)
 
-    started = 0
+    nodes = _start_timer_nodes(flows)
+    manager = StartTimerSchedule._default_manager
+    scheduled = {
+        get_task_ref(node)
+        for node in manager.filter(flow_task__in=nodes).values_list(
+            "flow_task", flat=True
+        )
+        if node is not None
+    }
+    at = timezone.now()
+    schedules = manager.bulk_create(
+        [
+            StartTimerSchedule(flow_task=node, next_run=node.first_run(at))
+            for node in nodes
+            if get_task_ref(node) not in scheduled
+        ],
+        ignore_conflicts=True,
+    )
+    return len(schedules)
+
+
+def _start_timer_nodes(flows):
+    from .nodes import StartTimer
+
+    return [
+        node
+        for flow_class in flows
+        for node in flow_class.instance.nodes()
+        if isinstance(node, StartTimer)
+    ]
+
+
+def _start_timer_schedules(flows=None):
+    schedules = StartTimerSchedule._default_manager.all()
+    if flows is not None:
+        schedules = schedules.filter(flow_task__in=_start_timer_nodes(flows))
+    return schedules
+
+
+def claim_due_start_timers(flows=None, claim_timeout=CLAIM_TIMEOUT):
+    """Claim the due ``flow.StartTimer`` schedules, and return their pks.
+
+    A schedule is claimed by a conditional ``UPDATE`` of its
+    ``locked_until`` lease, so concurrent dispatchers never start the same
+    run twice. A lease not released within ``claim_timeout`` expires.
+    """
     at = timezone.now()
-    for flow_class in flows:
-        for node in flow_class.instance.nodes():
-            if isinstance(node, StartTimer) and node.is_due(at):
+    manager = StartTimerSchedule._default_manager
+    not_locked = Q(locked_until__isnull=True) | Q(locked_until__lte=at)
+
+    claimed = []
+    due = _start_timer_schedules(flows).filter(not_locked, next_run__lte=at)
+    for schedule_pk in due.values_list("pk", flat=True):
+        if (
+            manager.filter(not_locked, pk=schedule_pk)
+            .filter(next_run__lte=at)
+            .update(locked_until=at + claim_timeout)
+        ):
+            claimed.append(schedule_pk)
+    return claimed
+
+
+def fire_due_start_timers(flows=None):
+    """Start a process for every due ``flow.StartTimer`` and return the count.
+
+    Due nodes are looked up in the ``StartTimerSchedule`` table, see
+    ``claim_due_start_timers``. Unscheduled nodes are scheduled first, see
+    ``register_start_timers`` -- on the first call within a process for all
+    flows, on each call for the given ``flows`` otherwise. Pass ``flows`` to
+    restrict dispatch to specific flow classes.
+    """
+    global _start_timers_registered
+
+    if flows is not None:
+        register_start_timers(flows)
+    elif not _start_timers_registered:
+        register_start_timers()
+        _start_timers_registered = True
+
+    started = 0
+    manager = StartTimerSchedule._default_manager
+    for schedule_pk in claim_due_start_timers(flows):
+        schedule = manager.get(pk=schedule_pk)
+        node = schedule.flow_task
+        if node is None:
+            # the node was renamed or removed; the lease postpones the
+            # orphaned schedule
+            logger.warning(
+                "Start timer schedule %s references a missing node, skipped",
+                schedule.pk,
+            )
+            continue
+        try:
+            with transaction.atomic():
                 node.run()
-                started += 1
+                at = timezone.now()
+                manager.filter(pk=schedule.pk).update(
+                    next_run=node.next_run_after(at), last_run=at, locked_until=None
+                )
+            started += 1
+        except Exception:  # one broken flow must not block the whole sweep
+            # stays claimed, and is retried once the claim times out
+            logger.exception("Start timer %s failed to start a process", node)
     return started
+
+
+def next_due_moment(flows=None):
+    """Earliest moment a timer task, a timed out timer claim, a
+    ``flow.ConditionalCatch`` check or a ``flow.StartTimer`` is due, or None
+    if nothing is scheduled.
+
+    Start timers are looked up in the ``StartTimerSchedule`` table.
+    """
+    moments = Task._default_manager.filter(
+        flow_task_type__in=["TIMER", "CONDITION"]
+    ).aggregate(
+        scheduled=Min(
+            Greatest("scheduled", Coalesce("locked_until", "scheduled")),
+            filter=Q(flow_task_type="TIMER", status=STATUS.SCHEDULED),
+        ),
+        next_check=Min(
+            "next_check", filter=Q(flow_task_type="CONDITION", status=STATUS.NEW)
+        ),
+    )
+    due = [moments["scheduled"], moments["next_check"]]
+    due.append(
+        _start_timer_schedules(flows).aggregate(
+            next_run=Min(Greatest("next_run", Coalesce("locked_until", "next_run")))
+        )["next_run"]
+    )
+
+    due = [moment for moment in due if moment is not None]
+    return min(due) if due else None
+
+
+def notify_timers_changed(using=None):
+    """Wake up dispatchers sleeping in ``run_timers_loop``.
+
+    Called once a new timer is scheduled. On PostgreSQL, sends a
+    ``NOTIFY`` on ``WAKEUP_CHANNEL``; on other databases, bumps the
+    ``WAKEUP_CACHE_KEY`` counter in the default cache.
+    """
+    using = using or router.db_for_write(Task)
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, '')", [WAKEUP_CHANNEL])
+        return
+
+    try:
+        default_cache.incr(WAKEUP_CACHE_KEY)
+    except ValueError:
+        default_cache.set(WAKEUP_CACHE_KEY, 1, timeout=None)
+
+
+def wait_timers_changed(timeout, using=None, cache_poll_interval=0.5):
+    """Sleep up to ``timeout`` seconds, until ``notify_timers_changed``.
+
+    Returns True when woken up by a notification. On PostgreSQL, listens on
+    ``WAKEUP_CHANNEL`` (psycopg 3.2+ or psycopg2). Elsewhere, the cache key
+    is checked every ``cache_poll_interval`` seconds -- no query hits the
+    database while waiting, but dispatchers on other hosts are only woken
+    up with a shared cache backend, such as redis or memcached.
+    """
+    using = using or router.db_for_write(Task)
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{WAKEUP_CHANNEL}"')
+        return _wait_pg_notify(connection.connection, timeout)
+
+    deadline = time.monotonic() + timeout
+    seen = default_cache.get(WAKEUP_CACHE_KEY)
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(cache_poll_interval, remaining))
+        if default_cache.get(WAKEUP_CACHE_KEY) != seen:
+            return True
+
+
+def _wait_pg_notify(pg_connection, timeout):
+    if callable(getattr(pg_connection, "notifies", None)):
+        # psycopg 3
+        notifies = pg_connection.notifies(timeout=timeout, stop_after=1)
+        return bool(list(notifies))
+
+    # psycopg2
+    woken = bool(pg_connection.notifies)
+    if not woken and select.select([pg_connection], [], [], timeout)[0]:
+        pg_connection.poll()
+        woken = bool(pg_connection.notifies)
+    del pg_connection.notifies[:]
+    return woken
+
+
+def run_timers_loop(
+    max_sleep=60,
+    batch_size=100,
+    workers=1,
+    flows=None,
+    stop=None,
+    callback=None,
+):
+    """Fire due timers, start timers and conditions until ``stop`` is set.
+
+    After each run, sleeps until the ``next_due_moment``, but not longer
+    than ``max_sleep`` seconds -- the poll interval of ``flow.ConditionalCatch``
+    conditions without their own ``poll_interval``, and the bound on missed
+    notifications. A timer scheduled
+    meanwhile wakes the loop up early, see ``wait_timers_changed``.
+
+    A failed run, such as on a lost database connection, is logged, and
+    retried after a backoff doubled on each failure in a row, up to
+    ``max_sleep``.
+
+    :param stop: a ``threading.Event`` to end the loop.
+    :param callback: called with the ``(fired, started, conditions)``
+        counts of each run.
+    """
+    failures = 0
+    while stop is None or not stop.is_set():
+        # drop the connections broken or older than CONN_MAX_AGE, as at
+        # the start of a request
+        close_old_connections()
+        try:
+            counts = (
+                fire_due_timers(batch_size=batch_size, workers=workers),
+                fire_due_start_timers(flows=flows),
+                fire_due_conditions(flows=flows),
+            )
+        except Exception:
+            failures += 1
+            backoff = min(max_sleep, 2 ** (failures - 1))
+            logger.exception("Timers run failed, retrying in %s seconds", backoff)
+            if stop is not None:
+                stop.wait(backoff)
+            else:
+                time.sleep(backoff)
+            continue
+        failures = 0
+
+        if callback is not None:
+            callback(*counts)
+        if stop is not None and stop.is_set():
+            break
+
+        timeout = max_sleep
+        due = next_due_moment(flows=flows)
+        if due is not None:
+            # a moment still due after the run belongs to a locked or a
+            # failing task, don't spin on it
+            seconds = (due - timezone.now()).total_seconds()
+            timeout = min(timeout, seconds if seconds > 0 else 1)
+        wait_timers_changed(timeout)
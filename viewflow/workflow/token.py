@@ -1,5 +1,5 @@
 from itertools import count
-from typing import Iterator, Any
+from typing import Iterator, Any, List, Optional, Tuple
 from django.utils.deconstruct import deconstructible
 
 
@@ -17,6 +17,10 @@ class Token:
 
     - each join removes corresponding split token addition, so 'start/3_4/7_4'
       becomes 'start/3_4'
+
+    The same path is available in a compact sortable form, see
+    :attr:`Token.key`, so split branches could be looked up with an index
+    range scan instead of a `LIKE 'prefix%'` query.
     """
 
     def __init__(self, token: str) -> None:
@@ -35,6 +39,65 @@ class Token:
         """Return token before last split happens."""
         return Token(self.token.rsplit("/", 1)[0])
 
+    def get_split_task_pk(self) -> Optional[int]:
+        """Pk of the split task that started the innermost parallel branch."""
+        if not self.is_split_token():
+            return None
+        return int(self.token.rsplit("/", 1)[1].split("_", 1)[0])
+
+    def get_split_path(self) -> Optional[List[Tuple[int, int]]]:
+        """List of (split_pk, branch) pairs, outermost split first.
+
+        None, if the token does not follow the split token format.
+        """
+        path = []
+        for segment in self.token.split("/")[1:]:
+            split_pk, _, branch = segment.partition("_")
+            try:
+                path.append((int(split_pk), int(branch)))
+            except ValueError:
+                return None
+        return path
+
+    @property
+    def depth(self) -> int:
+        """Number of nested splits the token went through."""
+        return self.token.count("/")
+
+    @property
+    def key(self) -> Optional[str]:
+        """
+        Sortable encoding of the split path.
+
+        Each split pk and branch number is written as a hex digits count
+        followed by the hex digits, so keys of all branches of a split fall
+        into a contiguous range, see :meth:`get_split_key_range`. Keys
+        contain only `[0-9a-f]` and sort the same under any db collation.
+        """
+        path = self.get_split_path()
+        if path is None:
+            return None
+        return "".join(
+            _encode_key_number(split_pk) + _encode_key_number(branch)
+            for split_pk, branch in path
+        )
+
+    @staticmethod
+    def get_split_key_range(split_prefix: str) -> Optional[Tuple[str, str]]:
+        """
+        `[start, stop)` key range of the tokens sharing the split prefix.
+
+        :param split_prefix: prefix returned by `get_common_split_prefix`
+        """
+        base_token, _, split_pk = split_prefix.rstrip("_").rpartition("/")
+        base_key = Token(base_token).key
+        if base_key is None or not split_pk.isdigit():
+            return None
+        return (
+            base_key + _encode_key_number(int(split_pk)),
+            base_key + _encode_key_number(int(split_pk) + 1),
+        )
+
     def get_common_split_prefix(self, join_token: "Token", task_pk: int) -> str:
         """Common prefix for tokens."""
         if self == join_token:
@@ -62,3 +125,8 @@ class Token:
         """Span a set of uniq tokens with common prefix."""
         for n in count(1):
             yield Token("{}/{}_{}".format(prev_token, task_pk, n))
+
+
+def _encode_key_number(value: int) -> str:
+    digits = "{:x}".format(value)
+    return "{:x}{}".format(len(digits), digits)
@@ -1,6 +1,3 @@
-from .status import STATUS
-
-
 class Act(object):
     """Shortcut to access activation data."""
 
@@ -29,24 +26,5 @@ act = Act()
 
 
 def get_next_process_task(manager, process, user):
-    task = manager.filter(process=process, owner=user, status=STATUS.ASSIGNED).first()
-
-    # lookup for a task in a queue
-    if task is None:
-        task = (
-            manager.user_queue(user).filter(process=process, status=STATUS.NEW).first()
-        )
-
-    # lookup for a job
-    if task is None:
-        task = manager.filter(
-            process=process,
-            flow_task_type="JOB",
-            status__in=[STATUS.NEW, STATUS.SCHEDULED, STATUS.STARTED],
-        ).first()
-
-    # a task in a ERROR state
-    if task is None:
-        task = manager.filter(process=process, status=STATUS.ERROR).first()
-
-    return task
+    """The task of the process the user could continue with."""
+    return manager.filter(process=process).next_tasks(user).first()